@@ -2,15 +2,18 @@
 Attendance Endpoints (API v1)
 Handles attendance file upload and record management
 """
-from fastapi import APIRouter, Depends, UploadFile, File, BackgroundTasks
+from fastapi import APIRouter, Depends, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
 from pydantic import BaseModel
 from typing import Optional
-import io
+from datetime import date
 
 from app.api.dependencies import get_db, get_current_user, check_admin
-from app.services.attendance_service import AttendanceService
+from app.services.attendance_service import AttendanceService, EXPORT_MEDIA_TYPES
+from app.services.ingestion_service import IngestionService
+from app.services.status_recompute_service import StatusRecomputeService
 from app.models.models import Employee
 
 router = APIRouter()
@@ -23,10 +26,15 @@ class AttendanceUpdate(BaseModel):
     out_duration: Optional[str] = None
     attendance_status: Optional[str] = None
 
+class StatusRecomputeRequest(BaseModel):
+    """Schema for status recompute requests"""
+    start_date: date
+    end_date: date
+
 @router.post("/upload/files")
-async def upload_files(
-    background_tasks: BackgroundTasks,
+def upload_files(
     files: List[UploadFile] = File(...),
+    force: bool = False,
     admin: Employee = Depends(check_admin),
     db: Session = Depends(get_db)
 ):
@@ -34,81 +42,120 @@ async def upload_files(
     Upload attendance files
     
     - Accepts Excel/CSV files
-    - Processes in BACKGROUND (non-blocking)
-    - Returns immediate "Processing started" message
+    - Streams each file to upload storage and queues an ingestion job (processed by worker.py)
+    - Rejects the upload with 413 if a file or the whole request is over the size limit
+    - Returns one job per file; poll /upload/jobs/{id} for progress
+    - Files identical to an earlier, still-current ingest are skipped unless force=true
     
     Requires: Admin/HR/CEO role
     """
-    # 1. Read all files into memory immediately (Async I/O)
-    # Be careful with huge files, but for attendance sheets (usually < 5MB), RAM is fine.
-    # We need to recreate UploadFile objects or pass bytes to the service.
-    # Since Service expects UploadFile, let's read bytes and mock/pass them.
-    # Actually, better pattern: Pass the db session? No, db session is scoped to request.
-    # We MUST create a new DB session for the background task or ensure the service handles it.
-    # Dependency injection db session closes after request.
-    
-    # PROBLEM: 'db' session will close when this function returns.
-    # SOLUTION: Background task must create its own DB session.
-    # We need a wrapper function for the background task.
-    
-    # Let's simplify: Read content now.
-    file_data_list = []
-    for file in files:
-        content = await file.read()
-        file_data_list.append({
-            "filename": file.filename,
-            "content": content,
-            "content_type": file.content_type
+    service = IngestionService(db)
+    results = []
+    for job in service.enqueue_uploads(files, admin, force=force):
+        results.append({
+            "job_id": job.id,
+            "filename": job.filename,
+            "status": job.status,
+            "message": "Queued for processing"
         })
     
-    # Add to background tasks
-    background_tasks.add_task(process_files_background, file_data_list, admin.email)
+    return {"message": "Upload accepted. Processing queued.", "results": results}
+
+@router.get("/upload/jobs/{job_id}")
+def get_upload_job(
+    job_id: int,
+    admin: Employee = Depends(check_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Get ingestion job progress
+    
+    - Returns state (QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED)
+    - Includes per-stage timings, saved/updated counts and the last checkpoint
     
-    return {"message": "Upload accepted. Processing started in background."}
+    Requires: Admin/HR/CEO role
+    """
+    service = IngestionService(db)
+    return service.get_job_status(job_id)
 
-from app.core.database import SessionLocal
-from app.models.models import Employee
+@router.post("/upload/jobs/{job_id}/cancel")
+def cancel_upload_job(
+    job_id: int,
+    admin: Employee = Depends(check_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Cancel a queued or running ingestion job
+    
+    - A running job stops after its current chunk; committed chunks are kept
+    
+    Requires: Admin/HR/CEO role
+    """
+    service = IngestionService(db)
+    return service.cancel_job(job_id)
 
-def process_files_background(file_data_list: List[dict], admin_email: str):
-    """Background task to process files"""
-    db = SessionLocal()
-    try:
-        # Re-fetch admin because object detaches
-        admin = db.query(Employee).filter(Employee.email == admin_email).first()
-        if not admin:
-            print(f"Admin {admin_email} not found during background processing")
-            return
-
-        service = AttendanceService(db)
-        
-        # We need to mock UploadFile-like objects for the service
-        # or refactor service to accept bytes.
-        # Let's mock it to minimize service refactoring.
-        class MockUploadFile:
-            def __init__(self, filename, content, content_type):
-                self.filename = filename
-                self.content_type = content_type
-                self.file = io.BytesIO(content) # Sync file-like object
-            
-            async def read(self): # Keep async interface if service still has await (we removed it though)
-                return self.file.getvalue()
-
-        mock_files = [
-            MockUploadFile(f["filename"], f["content"], f["content_type"]) 
-            for f in file_data_list
-        ]
-        
-        # Call the synchronous service method
-        service.process_uploaded_files(mock_files, admin)
-        
-    except Exception as e:
-        print(f"Background processing error: {e}")
-    finally:
-        db.close()
+@router.post("/upload/jobs/{job_id}/resume")
+def resume_upload_job(
+    job_id: int,
+    admin: Employee = Depends(check_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Queue a cancelled or failed ingestion job again
+    
+    - Continues after the job's last checkpoint
+    
+    Requires: Admin/HR/CEO role
+    """
+    service = IngestionService(db)
+    return service.resume_job(job_id)
 
+@router.post("/status/recompute")
+def recompute_status(
+    data: StatusRecomputeRequest,
+    admin: Employee = Depends(check_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Re-evaluate attendance status with the current status rules
+    
+    - Queues a job for the date range (processed by worker.py)
+    - Only days with a punch log are evaluated
+    - Manually corrected records and leave days are left untouched
+    - Poll /status/recompute/{id} for progress
+    
+    Requires: Admin/HR/CEO role
+    """
+    service = StatusRecomputeService(db)
+    return service.enqueue(data.start_date, data.end_date, admin)
+
+@router.get("/status/recompute/{job_id}")
+def get_status_recompute_job(
+    job_id: int,
+    admin: Employee = Depends(check_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Get status recompute job progress
+    
+    - Returns state (QUEUED, RUNNING, SUCCEEDED, FAILED)
+    - Includes rows checked and changed
+    
+    Requires: Admin/HR/CEO role
+    """
+    service = StatusRecomputeService(db)
+    return service.get_job_status(job_id)
 
 @router.get("/")
 def get_attendance(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    emp_id: Optional[str] = None,
+    status: Optional[str] = None,
+    name: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    all_records: bool = Query(False, alias="all"),
     user: Employee = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -117,10 +164,102 @@ def get_attendance(
     
     - Employees see only their own records
     - Admin/HR/CEO see all records
-    - Returns list of attendance records
+    - Filters: start_date, end_date, emp_id, status, name (part of the employee's name)
+    - Returns one page, newest first: {items, next_cursor, limit}; pass next_cursor
+      back as cursor for the following page (null on the last page)
+    - all=true returns the full, unfiltered list of records (previous behaviour)
+    """
+    service = AttendanceService(db)
+    if all_records:
+        return service.get_attendance_records(user)
+    return service.list_attendance_records(
+        user,
+        limit,
+        cursor=cursor,
+        start_date=start_date,
+        end_date=end_date,
+        emp_id=emp_id,
+        status=status,
+        name=name
+    )
+
+@router.get("/dashboard")
+def get_attendance_dashboard(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    emp_id: Optional[str] = None,
+    name: Optional[str] = None,
+    user: Employee = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get dashboard statistics
+    
+    - Employees see only their own statistics
+    - Admin/HR/CEO see all employees, or one with emp_id / name
+    - Returns per-date present, absent and on-leave counts with average hours
+      (days), the same over the whole range (summary), the last day (latest)
+      and the matched employee when the filters match exactly one
+    - Days that are not Present are left out on Sundays and holidays
+    """
+    service = AttendanceService(db)
+    return service.get_dashboard(user, start_date=start_date, end_date=end_date, emp_id=emp_id, name=name)
+
+@router.get("/export")
+def export_attendance(
+    export_format: str = Query("ndjson", alias="format"),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    emp_id: Optional[str] = None,
+    status: Optional[str] = None,
+    name: Optional[str] = None,
+    user: Employee = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Export attendance records
+    
+    - Employees export only their own records
+    - Admin/HR/CEO export all records
+    - Filters: start_date, end_date, emp_id, status, name (as in the listing)
+    - format=ndjson (default, one JSON object per line) or format=csv
+    - Streams rows oldest first as they are read, so any range can be exported
+    """
+    service = AttendanceService(db)
+    chunks = service.export_attendance(
+        user,
+        export_format,
+        start_date=start_date,
+        end_date=end_date,
+        emp_id=emp_id,
+        status=status,
+        name=name
+    )
+    filename = f"attendance_{start_date or 'start'}_{end_date or 'end'}.{export_format}"
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/monthly")
+def get_monthly_attendance(
+    emp_id: Optional[str] = None,
+    year: Optional[int] = Query(None, ge=2000, le=2100),
+    user: Employee = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get monthly attendance totals
+    
+    - Employees see only their own months
+    - Admin/HR/CEO can pass emp_id (default: their own)
+    - Returns present, absent and leave days, late arrivals and average
+      in-office minutes per month, precomputed at ingestion
+    - year limits the months to one calendar year
     """
     service = AttendanceService(db)
-    return service.get_attendance_records(user)
+    return service.get_monthly_rollups(user, emp_id=emp_id, year=year)
 
 @router.put("/{id}")
 def update_attendance(
@@ -140,7 +279,7 @@ def update_attendance(
     """
     service = AttendanceService(db)
     update_dict = data.dict(exclude_unset=True)
-    return service.update_attendance_record(id, update_dict)
+    return service.update_attendance_record(id, update_dict, corrected_by=admin.email)
 
 @router.delete("/{id}")
 def delete_attendance(
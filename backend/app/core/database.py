@@ -8,12 +8,16 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "mssql+pyodbc://localhost/RBIS_HRMS?driver=ODBC+Driver+17+for+SQL+Server&trusted_connection=yes&TrustServerCertificate=yes")
 
+# pyodbc sends executemany batches as a single round trip (bulk attendance writes)
+dialect_options = {"fast_executemany": True} if DATABASE_URL.startswith("mssql+pyodbc") else {}
+
 engine = create_engine(
     DATABASE_URL,
     pool_size=20,          # Maintain 20 open connections
     max_overflow=10,       # Allow 10 extra connections during spikes
     pool_pre_ping=True,    # Check connection health before use
-    pool_recycle=3600      # Recycle connections every hour
+    pool_recycle=3600,     # Recycle connections every hour
+    **dialect_options
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -0,0 +1,74 @@
+"""
+Parse Cache
+Keeps the cleaner output of every ingested file as Parquet, keyed by file
+hash and cleaner version. Reprocessing a file (force re-upload, retried job)
+loads the cached records instead of running the pandas parse again; bumping
+CLEANER_VERSION makes every entry miss so files are re-parsed once.
+"""
+import os
+import uuid
+import logging
+from typing import Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Config: cache directory (empty = cache disabled)
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR", "parse_cache")
+
+DETECTED_TYPE_KEY = b"detected_type"
+
+def _cache_path(file_hash: str, parser_version: str) -> str:
+    return os.path.join(PARSE_CACHE_DIR, f"{file_hash}_v{parser_version}.parquet")
+
+def load_parsed(file_hash: str, parser_version: str) -> Optional[Tuple[list, str]]:
+    """
+    Load cached cleaner output
+    
+    Args:
+        file_hash: SHA-256 of the file content
+        parser_version: Cleaner version the entry must have been written by
+    
+    Returns:
+        (cleaned_data, detected_type), or None on a cache miss
+    """
+    if not PARSE_CACHE_DIR:
+        return None
+    path = _cache_path(file_hash, parser_version)
+    if not os.path.exists(path):
+        return None
+    try:
+        table = pq.read_table(path)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable parse cache entry {path}: {e}")
+        return None
+    detected_type = (table.schema.metadata or {}).get(DETECTED_TYPE_KEY, b"").decode()
+    return table.to_pylist(), detected_type
+
+def store_parsed(file_hash: str, parser_version: str, cleaned_data: list, detected_type: str) -> None:
+    """
+    Cache cleaner output. Failures are logged and otherwise ignored.
+    
+    Args:
+        file_hash: SHA-256 of the file content
+        parser_version: Cleaner version that produced the records
+        cleaned_data: Cleaned attendance records
+        detected_type: Report type detected by the cleaner
+    """
+    if not PARSE_CACHE_DIR:
+        return
+    path = _cache_path(file_hash, parser_version)
+    # Write to a private temp file first so concurrent readers never see a partial entry
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.makedirs(PARSE_CACHE_DIR, exist_ok=True)
+        table = pa.Table.from_pylist(cleaned_data)
+        table = table.replace_schema_metadata({DETECTED_TYPE_KEY: detected_type.encode()})
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"Could not write parse cache entry {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
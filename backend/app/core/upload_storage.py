@@ -0,0 +1,73 @@
+"""
+Upload Storage
+Persists uploaded files so ingestion workers can pick them up after the
+request that received them has finished. The directory must be shared
+between the API and worker processes.
+
+Uploads are copied in fixed-size chunks and hashed on the way, so a file is
+never held in memory as a whole.
+"""
+import os
+import uuid
+import hashlib
+from typing import BinaryIO, NamedTuple, Optional
+
+from app.utils.file_utils import generate_safe_filename
+
+# Config
+UPLOAD_STORAGE_DIR = os.getenv("UPLOAD_STORAGE_DIR", "uploads")
+UPLOAD_MAX_FILE_MB = int(os.getenv("UPLOAD_MAX_FILE_MB", "50"))
+UPLOAD_MAX_REQUEST_MB = int(os.getenv("UPLOAD_MAX_REQUEST_MB", "200"))
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+class StoredUpload(NamedTuple):
+    path: str
+    file_hash: str  # SHA-256 of the content
+    size: int
+
+def store_upload_stream(stream: BinaryIO, filename: str, max_bytes: int) -> Optional[StoredUpload]:
+    """
+    Copy an upload into the storage directory chunk by chunk, hashing as it goes
+    
+    Args:
+        stream: Readable binary file object
+        filename: Original file name
+        max_bytes: Size limit for this file
+    
+    Returns:
+        StoredUpload, or None if the stream is larger than max_bytes
+        (nothing is kept in that case)
+    """
+    os.makedirs(UPLOAD_STORAGE_DIR, exist_ok=True)
+    part_path = os.path.join(UPLOAD_STORAGE_DIR, f".{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(part_path, "wb") as out:
+            while True:
+                chunk = stream.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+        if size > max_bytes:
+            discard_upload(part_path)
+            return None
+        
+        file_hash = digest.hexdigest()
+        # Unique per upload: jobs and failed requests never share or remove each other's file
+        safe_name = generate_safe_filename(f"{file_hash[:12]}_{uuid.uuid4().hex[:8]}_{os.path.basename(filename)}")
+        path = os.path.join(UPLOAD_STORAGE_DIR, safe_name)
+        os.replace(part_path, path)
+        return StoredUpload(path, file_hash, size)
+    except BaseException:
+        discard_upload(part_path)
+        raise
+
+def discard_upload(path: str) -> None:
+    """Remove a stored upload if it exists"""
+    if os.path.exists(path):
+        os.remove(path)
@@ -9,7 +9,7 @@ from app.models.base import Base, get_ist_now, IST
 from app.models.employee import Employee, UserRole, UserStatus
 
 # Import Attendance models
-from app.models.attendance import Attendance
+from app.models.attendance import Attendance, AttendancePunch, AttendanceDailySummary, AttendanceMonthlyRollup
 
 # Import File Upload models
 from app.models.file_upload import FileUploadLog
@@ -19,7 +19,8 @@ from app.models.leave import (
     LeaveType,
     LeaveBalance,
     LeaveRequest,
-    LeaveApprovalLog
+    LeaveApprovalLog,
+    Holiday
 )
 
 # Export all models and utilities
@@ -36,6 +37,9 @@ __all__ = [
     
     # Attendance
     "Attendance",
+    "AttendancePunch",
+    "AttendanceDailySummary",
+    "AttendanceMonthlyRollup",
     
     # File Upload
     "FileUploadLog",
@@ -45,4 +49,5 @@ __all__ = [
     "LeaveBalance",
     "LeaveRequest",
     "LeaveApprovalLog",
+    "Holiday",
 ]
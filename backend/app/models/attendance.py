@@ -1,24 +1,82 @@
 """
 Attendance Model
-Contains Attendance tracking model
+Contains Attendance tracking and punch models
 """
-from sqlalchemy import Column, Integer, String, Date, Boolean
-from app.models.base import Base
+from sqlalchemy import Column, Integer, SmallInteger, String, Date, Boolean, Index, DateTime, ForeignKey, Float
+from app.models.base import Base, get_ist_now
 
 class Attendance(Base):
     """Attendance model - tracks employee attendance records"""
     __tablename__ = "attendance"
-
+    __table_args__ = (
+        Index("uq_attendance_emp_date", "emp_id", "date", unique=True),
+        Index("ix_attendance_date_minutes", "date", "first_in_min", "total_duration_min"),
+        Index("ix_attendance_date_emp", "date", "emp_id"),
+        Index("ix_attendance_status_date", "attendance_status", "date", "emp_id"),
+    )
+    
     id = Column(Integer, primary_key=True, index=True)
-    emp_id = Column(String(50), index=True, nullable=False)
+    emp_id = Column(String(50), nullable=False)
     date = Column(Date, index=True, nullable=False)
     first_in = Column(String(50), nullable=True)
     last_out = Column(String(50), nullable=True)
     in_duration = Column(String(100), nullable=True)
     out_duration = Column(String(100), nullable=True)
     total_duration = Column(String(100), nullable=True)
+    first_in_min = Column(Integer, nullable=True)
+    last_out_min = Column(Integer, nullable=True)
+    in_duration_min = Column(Integer, nullable=True)
+    out_duration_min = Column(Integer, nullable=True)
+    total_duration_min = Column(Integer, nullable=True)
+    office_minutes = Column(Integer, nullable=True)
+    break_minutes = Column(Integer, nullable=True)
+    unmatched_punches = Column(Integer, nullable=True)
     punch_records = Column(String(2000), nullable=True)
     attendance_status = Column(String(50))
     source_file = Column(String(255))
     is_manually_corrected = Column(Boolean, default=False)
     corrected_by = Column(String(100), nullable=True)
+    updated_at = Column(DateTime, default=get_ist_now, nullable=True)
+    content_hash = Column(String(32), nullable=True)
+
+class AttendancePunch(Base):
+    """Attendance punch model - one punch of an attendance day"""
+    __tablename__ = "attendance_punches"
+    
+    id = Column(Integer, primary_key=True)
+    attendance_id = Column(Integer, ForeignKey("attendance.id", ondelete="CASCADE"), nullable=False, index=True)
+    seq = Column(SmallInteger, nullable=False)
+    minute = Column(SmallInteger, nullable=False)
+    direction = Column(String(3), nullable=True)
+
+class AttendanceDailySummary(Base):
+    """Attendance daily summary model - counts of one date across all employees"""
+    __tablename__ = "attendance_daily_summary"
+    
+    date = Column(Date, primary_key=True)
+    present = Column(Integer, nullable=False, default=0)
+    absent = Column(Integer, nullable=False, default=0)
+    on_leave = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)
+    present_minutes = Column(Integer, nullable=False, default=0)
+    avg_minutes = Column(Float, nullable=True)
+    updated_at = Column(DateTime, default=get_ist_now, nullable=True)
+
+class AttendanceMonthlyRollup(Base):
+    """Attendance monthly rollup model - totals of one employee for one month"""
+    __tablename__ = "attendance_monthly_rollup"
+    __table_args__ = (
+        Index("uq_rollup_emp_month", "emp_id", "month", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    emp_id = Column(String(50), nullable=False)
+    month = Column(Date, nullable=False)
+    present_days = Column(Integer, nullable=False, default=0)
+    absent_days = Column(Integer, nullable=False, default=0)
+    leave_days = Column(Integer, nullable=False, default=0)
+    late_arrivals = Column(Integer, nullable=False, default=0)
+    office_minutes = Column(Integer, nullable=False, default=0)
+    office_days = Column(Integer, nullable=False, default=0)
+    avg_office_minutes = Column(Float, nullable=True)
+    updated_at = Column(DateTime, default=get_ist_now, nullable=True)
@@ -2,7 +2,7 @@
 File Upload Model
 Contains file upload tracking model
 """
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Date
 from app.models.base import Base, get_ist_now
 
 class FileUploadLog(Base):
@@ -16,3 +16,13 @@ class FileUploadLog(Base):
     report_type = Column(String(100))
     file_hash = Column(String(64), unique=True, index=True)
     file_path = Column(String(500))
+    # Outcome of the last successful ingest, used to skip identical re-uploads
+    ingested_at = Column(DateTime, nullable=True)
+    parser_version = Column(String(20), nullable=True)
+    records_count = Column(Integer, nullable=True)
+    saved_count = Column(Integer, nullable=True)
+    updated_count = Column(Integer, nullable=True)
+    unchanged_count = Column(Integer, nullable=True)
+    first_date = Column(Date, nullable=True)
+    last_date = Column(Date, nullable=True)
+    span_row_count = Column(Integer, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Time, Enum, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, SmallInteger, String, Date, Time, Enum, ForeignKey, DateTime, Boolean, Index, Float
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import datetime
@@ -22,6 +22,13 @@ class UserStatus(str, enum.Enum):
     ACTIVE = "ACTIVE"
     INACTIVE = "INACTIVE"
 
+class JobStatus(str, enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
 class Employee(Base):
     __tablename__ = "employees"
 
@@ -67,21 +74,44 @@ class Employee(Base):
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (
+        # One row per employee per day; ingestion and leave sync upsert against it
+        Index("uq_attendance_emp_date", "emp_id", "date", unique=True),
+        # Covers date-range SUM/AVG over the minute columns (average hours, late arrivals)
+        Index("ix_attendance_date_minutes", "date", "first_in_min", "total_duration_min"),
+        # Keyset pagination of the attendance listing on (date, emp_id)
+        Index("ix_attendance_date_emp", "date", "emp_id"),
+        # Listing filtered by status
+        Index("ix_attendance_status_date", "attendance_status", "date", "emp_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    emp_id = Column(String(50), index=True, nullable=False)
+    emp_id = Column(String(50), nullable=False)
     date = Column(Date, index=True, nullable=False)
     first_in = Column(String(50), nullable=True)
     last_out = Column(String(50), nullable=True)
     in_duration = Column(String(100), nullable=True)
     out_duration = Column(String(100), nullable=True)
     total_duration = Column(String(100), nullable=True)
+    # Integer copies of the strings above, derived on every write (NULL = no time)
+    first_in_min = Column(Integer, nullable=True)  # Minutes since midnight
+    last_out_min = Column(Integer, nullable=True)  # Minutes since midnight
+    in_duration_min = Column(Integer, nullable=True)
+    out_duration_min = Column(Integer, nullable=True)
+    total_duration_min = Column(Integer, nullable=True)
+    # Paired from attendance_punches by the office time engine (NULL = no punch log)
+    office_minutes = Column(Integer, nullable=True)  # Sum of in -> out intervals
+    break_minutes = Column(Integer, nullable=True)  # Gaps between consecutive intervals
+    unmatched_punches = Column(Integer, nullable=True)  # Punches without a partner
     punch_records = Column(String(2000), nullable=True)
     attendance_status = Column(String(50))
     employee_name = Column(String(200), nullable=True)
     source_file = Column(String(255))
     is_manually_corrected = Column(Boolean, default=False)
     corrected_by = Column(String(100), nullable=True)
+    updated_at = Column(DateTime, default=get_ist_now, nullable=True)
+    # Fingerprint of the fields as last written by ingestion; NULL after any other write
+    content_hash = Column(String(32), nullable=True)
     
     owner = relationship(
         "Employee", 
@@ -89,6 +119,57 @@ class Attendance(Base):
         foreign_keys="Attendance.emp_id",
         back_populates="attendance_records"
     )
+    
+    punches = relationship(
+        "AttendancePunch",
+        order_by="AttendancePunch.seq",
+        cascade="all, delete-orphan"
+    )
+
+class AttendancePunch(Base):
+    """One punch of an attendance day, parsed from its punch_records log"""
+    __tablename__ = "attendance_punches"
+    
+    id = Column(Integer, primary_key=True)
+    attendance_id = Column(Integer, ForeignKey("attendance.id", ondelete="CASCADE"), nullable=False, index=True)
+    seq = Column(SmallInteger, nullable=False)  # Position in the day's log, from 0
+    minute = Column(SmallInteger, nullable=False)  # Minutes since midnight
+    direction = Column(String(3), nullable=True)  # 'in', 'out', or NULL if the log has no tag
+
+class AttendanceDailySummary(Base):
+    """Attendance counts of one date, refreshed for the dates every attendance write touches"""
+    __tablename__ = "attendance_daily_summary"
+    
+    date = Column(Date, primary_key=True)
+    present = Column(Integer, nullable=False, default=0)
+    absent = Column(Integer, nullable=False, default=0)
+    on_leave = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)  # Attendance rows of the date, any status
+    # Worked minutes (total duration, else in-duration) summed and averaged over Present rows
+    present_minutes = Column(Integer, nullable=False, default=0)
+    avg_minutes = Column(Float, nullable=True)  # NULL without Present rows
+    updated_at = Column(DateTime, default=get_ist_now, nullable=True)
+
+class AttendanceMonthlyRollup(Base):
+    """Attendance totals of one employee for one month, refreshed for the months every attendance write touches"""
+    __tablename__ = "attendance_monthly_rollup"
+    __table_args__ = (
+        # One row per employee per month; self-service views look up by emp_id
+        Index("uq_rollup_emp_month", "emp_id", "month", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    emp_id = Column(String(50), nullable=False)
+    month = Column(Date, nullable=False)  # First day of the month
+    present_days = Column(Integer, nullable=False, default=0)
+    absent_days = Column(Integer, nullable=False, default=0)
+    leave_days = Column(Integer, nullable=False, default=0)
+    # Attended (Present / Half Day) days only
+    late_arrivals = Column(Integer, nullable=False, default=0)  # First in-punch after ATTENDANCE_LATE_AFTER
+    office_minutes = Column(Integer, nullable=False, default=0)  # Summed over days with office time
+    office_days = Column(Integer, nullable=False, default=0)
+    avg_office_minutes = Column(Float, nullable=True)  # NULL without office time
+    updated_at = Column(DateTime, default=get_ist_now, nullable=True)
 
 class FileUploadLog(Base):
     __tablename__ = "file_uploads"
@@ -100,6 +181,64 @@ class FileUploadLog(Base):
     report_type = Column(String(100))
     file_hash = Column(String(64), unique=True, index=True)
     file_path = Column(String(500))
+    # Outcome of the last successful ingest, used to skip identical re-uploads
+    ingested_at = Column(DateTime, nullable=True)
+    parser_version = Column(String(20), nullable=True)
+    records_count = Column(Integer, nullable=True)
+    saved_count = Column(Integer, nullable=True)
+    updated_count = Column(Integer, nullable=True)
+    unchanged_count = Column(Integer, nullable=True)
+    first_date = Column(Date, nullable=True)
+    last_date = Column(Date, nullable=True)
+    span_row_count = Column(Integer, nullable=True)  # Attendance rows in first_date..last_date after the ingest
+
+class IngestionJob(Base):
+    __tablename__ = "ingestion_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String(255))
+    file_hash = Column(String(64), index=True)
+    storage_path = Column(String(500))  # Persisted upload the worker reads from
+    uploaded_by = Column(String(150))
+    status = Column(String(20), default="QUEUED", index=True)  # QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED
+    force = Column(Boolean, default=False)  # Reprocess even if this file was already ingested
+    skipped = Column(Boolean, default=False)  # Identical file already ingested; prior result reused
+    attempts = Column(Integer, default=0)
+    worker_id = Column(String(100), nullable=True)
+    detected_type = Column(String(100), nullable=True)
+    records_count = Column(Integer, nullable=True)
+    saved_count = Column(Integer, nullable=True)
+    updated_count = Column(Integer, nullable=True)
+    unchanged_count = Column(Integer, nullable=True)  # Existing rows whose content was already identical
+    # Last committed chunk: a retried or resumed job continues after this date
+    checkpoint_date = Column(Date, nullable=True)
+    checkpoint_rows = Column(Integer, nullable=True)
+    error = Column(String(2000), nullable=True)
+    # Per-stage timings in milliseconds
+    read_ms = Column(Integer, nullable=True)  # Receiving and storing the upload
+    parse_ms = Column(Integer, nullable=True)
+    write_ms = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=get_ist_now)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)  # Claim or last chunk commit; stale jobs are judged by this
+    finished_at = Column(DateTime, nullable=True)
+
+class StatusRecomputeJob(Base):
+    """Admin-requested re-evaluation of attendance_status over a date range"""
+    __tablename__ = "status_recompute_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    requested_by = Column(String(150))
+    status = Column(String(20), default="QUEUED", index=True)  # QUEUED, RUNNING, SUCCEEDED, FAILED
+    worker_id = Column(String(100), nullable=True)
+    rows_checked = Column(Integer, nullable=True)
+    rows_changed = Column(Integer, nullable=True)
+    error = Column(String(2000), nullable=True)
+    created_at = Column(DateTime, default=get_ist_now)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
 
 class LeaveType(Base):
     __tablename__ = "leave_types"
@@ -142,3 +281,11 @@ class LeaveApprovalLog(Base):
     action = Column(String(20)) # HR_APPROVED, CEO_APPROVED, REJECTED
     remarks = Column(String(500), nullable=True)
     action_at = Column(DateTime, default=get_ist_now)
+
+class Holiday(Base):
+    __tablename__ = "holidays"
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)
+    date = Column(Date, nullable=False, unique=True)
+    year = Column(Integer, nullable=False)
+    day = Column(String(20), nullable=True) # e.g. "Monday"
@@ -6,5 +6,6 @@ from app.repositories.employee_repository import EmployeeRepository
 from app.repositories.attendance_repository import AttendanceRepository
 from app.repositories.file_repository import FileRepository
 from app.repositories.leave_repository import LeaveRepository
+from app.repositories.ingestion_job_repository import IngestionJobRepository
 
-__all__ = ["EmployeeRepository", "AttendanceRepository", "FileRepository", "LeaveRepository"]
+__all__ = ["EmployeeRepository", "AttendanceRepository", "FileRepository", "LeaveRepository", "IngestionJobRepository"]
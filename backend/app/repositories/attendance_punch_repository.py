@@ -0,0 +1,102 @@
+"""
+Attendance Punch Repository
+Database access layer for AttendancePunch model
+"""
+from sqlalchemy.orm import Session
+from app.models.models import Attendance, AttendancePunch
+from typing import Dict, List, Optional, Tuple
+from datetime import date
+
+# Rows per executemany batch for bulk inserts
+BULK_BATCH_SIZE = 1000
+
+# Attendance IDs per IN (...) list; SQL Server allows at most 2100 parameters
+ID_BATCH_SIZE = 1000
+
+class AttendancePunchRepository:
+    """Handles all database operations for AttendancePunch model"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def replace_for_attendance(self, punches: Dict[int, List[Tuple[int, Optional[str]]]]) -> int:
+        """
+        Replace the stored punches of attendance rows in bulk
+        
+        Args:
+            punches: Attendance ID -> list of (minute, direction) in log order;
+                an empty list clears the row's punches
+        
+        Returns:
+            Number of punches inserted
+        """
+        attendance_ids = list(punches)
+        for i in range(0, len(attendance_ids), ID_BATCH_SIZE):
+            self.db.query(AttendancePunch).filter(
+                AttendancePunch.attendance_id.in_(attendance_ids[i:i + ID_BATCH_SIZE])
+            ).delete(synchronize_session=False)
+        
+        rows = [
+            {"attendance_id": attendance_id, "seq": seq, "minute": minute, "direction": direction}
+            for attendance_id, day_punches in punches.items()
+            for seq, (minute, direction) in enumerate(day_punches)
+        ]
+        for i in range(0, len(rows), BULK_BATCH_SIZE):
+            self.db.bulk_insert_mappings(AttendancePunch, rows[i:i + BULK_BATCH_SIZE])
+        return len(rows)
+    
+    def get_for_attendance_ids(self, attendance_ids: List[int]) -> List[Tuple[int, int, Optional[str]]]:
+        """
+        Get the punches of several attendance rows
+        
+        Args:
+            attendance_ids: Attendance IDs (queried in IN-list batches)
+        
+        Returns:
+            List of (attendance_id, minute, direction), ordered by attendance ID
+            and punch order
+        """
+        rows = []
+        for i in range(0, len(attendance_ids), ID_BATCH_SIZE):
+            rows.extend(self.db.query(
+                AttendancePunch.attendance_id,
+                AttendancePunch.minute,
+                AttendancePunch.direction
+            ).filter(
+                AttendancePunch.attendance_id.in_(attendance_ids[i:i + ID_BATCH_SIZE])
+            ).order_by(AttendancePunch.attendance_id, AttendancePunch.seq).all())
+        return [tuple(row) for row in rows]
+    
+    def get_in_date_range(
+        self,
+        start_date: date,
+        end_date: date,
+        emp_id: Optional[str] = None
+    ) -> List[Tuple[str, date, int, Optional[str]]]:
+        """
+        Get every punch within a date range in one query
+        
+        Args:
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            emp_id: Only this employee's punches (default: all employees)
+        
+        Returns:
+            List of (emp_id, date, minute, direction), ordered by employee,
+            date and punch order
+        """
+        query = self.db.query(
+            Attendance.emp_id,
+            Attendance.date,
+            AttendancePunch.minute,
+            AttendancePunch.direction
+        ).join(
+            AttendancePunch, AttendancePunch.attendance_id == Attendance.id
+        ).filter(
+            Attendance.date >= start_date,
+            Attendance.date <= end_date
+        )
+        if emp_id is not None:
+            query = query.filter(Attendance.emp_id == emp_id)
+        rows = query.order_by(Attendance.emp_id, Attendance.date, AttendancePunch.seq).all()
+        return [tuple(row) for row in rows]
@@ -2,10 +2,46 @@
 Attendance Repository
 Database access layer for Attendance model
 """
+from sqlalchemy import and_, case, extract, func, or_, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from app.models.models import Attendance
-from typing import List, Optional
-from datetime import date
+from app.models.models import Attendance, AttendancePunch, Employee, get_ist_now
+from app.utils.date_utils import to_minutes
+from typing import Iterator, List, Optional, Dict, Tuple
+from datetime import date, datetime
+
+# Rows per executemany batch for bulk inserts/updates
+BULK_BATCH_SIZE = 1000
+
+# Columns of the unique index uq_attendance_emp_date
+UPSERT_KEY = ("emp_id", "date")
+
+# Bound parameters per MERGE statement (SQL Server allows 2100 per request)
+MERGE_MAX_PARAMS = 2000
+
+# Integer minute columns and the time string each one is derived from
+MINUTE_COLUMNS = {
+    "first_in_min": "first_in",
+    "last_out_min": "last_out",
+    "in_duration_min": "in_duration",
+    "out_duration_min": "out_duration",
+    "total_duration_min": "total_duration",
+}
+
+# Fingerprint of the ingested fields; every write replaces it, NULL included
+CONTENT_HASH = "content_hash"
+
+def derive_minute_columns(data: dict) -> dict:
+    """
+    Minute columns for the time strings present in a record
+    
+    Args:
+        data: Attendance fields
+    
+    Returns:
+        Dictionary of minute column -> value, only for sources present in data
+    """
+    return {column: to_minutes(data[source]) for column, source in MINUTE_COLUMNS.items() if source in data}
 
 class AttendanceRepository:
     """Handles all database operations for Attendance model"""
@@ -24,7 +60,7 @@ class AttendanceRepository:
         Args:
             emp_id: Employee ID
             attendance_date: Attendance date
-            
+        
         Returns:
             Attendance record or None
         """
@@ -33,11 +69,353 @@ class AttendanceRepository:
             Attendance.date == attendance_date
         ).first()
     
+    def get_ids_in_date_range(self, start_date: date, end_date: date) -> Dict[Tuple[str, date], int]:
+        """
+        Get IDs of all attendance records within a date range in one query
+        
+        Args:
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+        
+        Returns:
+            Dictionary mapping (emp_id, date) to the record ID
+        """
+        rows = self.db.query(Attendance.id, Attendance.emp_id, Attendance.date).filter(
+            Attendance.date >= start_date,
+            Attendance.date <= end_date
+        ).order_by(Attendance.id.desc()).all()
+        # Descending order so the oldest record wins when a key is duplicated
+        return {(emp_id, record_date): record_id for record_id, emp_id, record_date in rows}
+    
+    def get_logged_ids_after(
+        self,
+        after_id: int,
+        limit: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[int]:
+        """
+        Get the next batch of IDs of attendance records that have a punch log
+        
+        Args:
+            after_id: Only IDs greater than this (keyset pagination)
+            limit: Maximum number of IDs
+            start_date: First date (inclusive, default: no limit)
+            end_date: Last date (inclusive, default: no limit)
+        
+        Returns:
+            Ascending list of record IDs
+        """
+        query = self.db.query(Attendance.id).filter(
+            Attendance.id > after_id,
+            Attendance.punch_records.isnot(None)
+        )
+        if start_date is not None:
+            query = query.filter(Attendance.date >= start_date)
+        if end_date is not None:
+            query = query.filter(Attendance.date <= end_date)
+        return [record_id for record_id, in query.order_by(Attendance.id).limit(limit).all()]
+    
+    def get_status_inputs_after(
+        self,
+        after_id: int,
+        limit: int,
+        start_date: date,
+        end_date: date,
+        exclude_statuses: List[str]
+    ) -> List[Tuple[int, str, date, Optional[str], Optional[int], Optional[int], int]]:
+        """
+        Get the next batch of status rule inputs for records with a punch log.
+        Manually corrected records and excluded statuses are left out.
+        
+        Args:
+            after_id: Only IDs greater than this (keyset pagination)
+            limit: Maximum number of records
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            exclude_statuses: Statuses to skip (e.g. 'On Leave')
+        
+        Returns:
+            List of (id, emp_id, date, attendance_status, in_duration_min, office_minutes, punch count), by ID
+        """
+        punch_count = self.db.query(func.count(AttendancePunch.id)).filter(
+            AttendancePunch.attendance_id == Attendance.id
+        ).scalar_subquery()
+        rows = self.db.query(
+            Attendance.id,
+            Attendance.emp_id,
+            Attendance.date,
+            Attendance.attendance_status,
+            Attendance.in_duration_min,
+            Attendance.office_minutes,
+            punch_count
+        ).filter(
+            Attendance.id > after_id,
+            Attendance.date >= start_date,
+            Attendance.date <= end_date,
+            Attendance.punch_records.isnot(None),
+            or_(Attendance.is_manually_corrected.is_(None), Attendance.is_manually_corrected == False),
+            or_(Attendance.attendance_status.is_(None), Attendance.attendance_status.notin_(exclude_statuses))
+        ).order_by(Attendance.id).limit(limit).all()
+        return [tuple(row) for row in rows]
+    
+    def get_fingerprints_in_date_range(self, start_date: date, end_date: date) -> Dict[Tuple[str, date], Tuple[int, Optional[str]]]:
+        """
+        Get ID and content fingerprint of all attendance records within a date range in one query
+        
+        Args:
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+        
+        Returns:
+            Dictionary mapping (emp_id, date) to (record ID, content_hash)
+        """
+        rows = self.db.query(Attendance.id, Attendance.emp_id, Attendance.date, Attendance.content_hash).filter(
+            Attendance.date >= start_date,
+            Attendance.date <= end_date
+        ).all()
+        return {(emp_id, record_date): (record_id, content_hash) for record_id, emp_id, record_date, content_hash in rows}
+    
+    def get_span_stats(self, start_date: date, end_date: date) -> Tuple[int, Optional[datetime]]:
+        """
+        Get row count and latest modification time for a date range
+        
+        Args:
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+        
+        Returns:
+            Tuple of (row count, latest updated_at or None)
+        """
+        count, last_updated = self.db.query(
+            func.count(Attendance.id),
+            func.max(Attendance.updated_at)
+        ).filter(
+            Attendance.date >= start_date,
+            Attendance.date <= end_date
+        ).one()
+        return count, last_updated
+    
     def get_by_emp_id(self, emp_id: str) -> List[Attendance]:
         """Get all attendance records for an employee"""
         from sqlalchemy.orm import joinedload
         return self.db.query(Attendance).options(joinedload(Attendance.owner)).filter(Attendance.emp_id == emp_id).all()
     
+    def get_page(
+        self,
+        limit: int,
+        after: Optional[Tuple[date, str]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        emp_id: Optional[str] = None,
+        status: Optional[str] = None,
+        name: Optional[str] = None
+    ) -> List[Tuple[Attendance, Optional[str]]]:
+        """
+        Get one page of attendance records, newest first, ordered by
+        (date, emp_id) descending. Pages continue from the last key of the
+        previous page (keyset), so every page costs the same.
+        
+        Args:
+            limit: Maximum number of records
+            after: (date, emp_id) of the previous page's last record
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            emp_id: Only this employee's records
+            status: Only records with this attendance status
+            name: Case-insensitive part of the employee's name
+        
+        Returns:
+            List of (Attendance, owner's full name or None)
+        """
+        query = self.db.query(Attendance, Employee.full_name).outerjoin(
+            Employee, Employee.emp_id == Attendance.emp_id
+        )
+        query = self._filter_listing(query, start_date, end_date, emp_id, status, name)
+        if after is not None:
+            after_date, after_emp_id = after
+            query = query.filter(or_(
+                Attendance.date < after_date,
+                and_(Attendance.date == after_date, Attendance.emp_id < after_emp_id)
+            ))
+        rows = query.order_by(Attendance.date.desc(), Attendance.emp_id.desc()).limit(limit).all()
+        return [tuple(row) for row in rows]
+    
+    def iter_export_rows(
+        self,
+        columns: List[str],
+        batch_size: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        emp_id: Optional[str] = None,
+        status: Optional[str] = None,
+        name: Optional[str] = None
+    ) -> Iterator[Tuple]:
+        """
+        Stream attendance rows for export, oldest first, ordered by
+        (date, emp_id). Rows are fetched batch_size at a time from an open
+        cursor (yield_per), so memory does not grow with the range.
+        
+        Args:
+            columns: Attendance columns to read, in output order
+            batch_size: Rows fetched per round trip
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            emp_id: Only this employee's records
+            status: Only records with this attendance status
+            name: Case-insensitive part of the employee's name
+        
+        Yields:
+            Tuples of the columns' values followed by the employee's name
+            (owner's full name, else the name from the report)
+        """
+        query = self.db.query(
+            *[getattr(Attendance, column) for column in columns],
+            func.coalesce(Employee.full_name, Attendance.employee_name)
+        ).outerjoin(Employee, Employee.emp_id == Attendance.emp_id)
+        query = self._filter_listing(query, start_date, end_date, emp_id, status, name)
+        for row in query.order_by(Attendance.date, Attendance.emp_id).yield_per(batch_size):
+            yield tuple(row)
+    
+    def get_daily_status_totals(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        emp_id: Optional[str] = None,
+        name: Optional[str] = None,
+        dates: Optional[List[date]] = None
+    ) -> List[Tuple[date, str, int, int]]:
+        """
+        Count attendance days and sum worked minutes per date and status in
+        one GROUP BY. Worked minutes are the total duration, or the in-duration
+        where there is none.
+        
+        Args:
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            emp_id: Only this employee's records
+            name: Case-insensitive part of the employee's name
+            dates: Only these dates (one bound parameter each; keep lists short)
+        
+        Returns:
+            List of (date, status, day count, worked minutes), ordered by date
+        """
+        worked = func.coalesce(Attendance.total_duration_min, Attendance.in_duration_min, 0)
+        query = self.db.query(
+            Attendance.date,
+            Attendance.attendance_status,
+            func.count(Attendance.id),
+            func.sum(worked)
+        )
+        if name:
+            query = query.outerjoin(Employee, Employee.emp_id == Attendance.emp_id)
+        query = self._filter_listing(query, start_date, end_date, emp_id, None, name)
+        if dates is not None:
+            query = query.filter(Attendance.date.in_(dates))
+        rows = query.group_by(Attendance.date, Attendance.attendance_status).order_by(Attendance.date).all()
+        return [(record_date, status, int(count), int(minutes or 0)) for record_date, status, count, minutes in rows]
+    
+    def get_monthly_status_totals(
+        self,
+        start_date: date,
+        end_date: date,
+        late_after: int,
+        emp_ids: Optional[List[str]] = None
+    ) -> List[Tuple[str, int, int, Optional[str], int, int, int, int]]:
+        """
+        Count attendance days per employee, month and status in one GROUP BY
+        
+        Args:
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            late_after: Days whose first in-punch is later than this (minutes
+                since midnight) count as late
+            emp_ids: Only these employees' records (one bound parameter each;
+                keep lists short)
+        
+        Returns:
+            List of (emp_id, year, month, status, day count, late days, summed
+            office minutes, days with office time)
+        """
+        year = extract("year", Attendance.date)
+        month = extract("month", Attendance.date)
+        query = self.db.query(
+            Attendance.emp_id,
+            year,
+            month,
+            Attendance.attendance_status,
+            func.count(Attendance.id),
+            func.sum(case((Attendance.first_in_min > late_after, 1), else_=0)),
+            func.sum(func.coalesce(Attendance.office_minutes, 0)),
+            func.count(Attendance.office_minutes)
+        ).filter(
+            Attendance.date >= start_date,
+            Attendance.date <= end_date
+        )
+        if emp_ids is not None:
+            query = query.filter(Attendance.emp_id.in_(emp_ids))
+        rows = query.group_by(Attendance.emp_id, year, month, Attendance.attendance_status).all()
+        return [
+            (row_emp_id, int(row_year), int(row_month), status, int(days), int(late or 0), int(minutes or 0), int(office_days))
+            for row_emp_id, row_year, row_month, status, days, late, minutes, office_days in rows
+        ]
+    
+    def get_matching_employees(
+        self,
+        limit: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        emp_id: Optional[str] = None,
+        name: Optional[str] = None
+    ) -> List[Tuple[str, Optional[str]]]:
+        """
+        Get the distinct employees with records matching the listing filters
+        
+        Args:
+            limit: Maximum number of employees
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            emp_id: Only this employee's records
+            name: Case-insensitive part of the employee's name
+        
+        Returns:
+            List of (emp_id, name), ordered by emp_id
+        """
+        query = self.db.query(
+            Attendance.emp_id,
+            func.max(func.coalesce(Employee.full_name, Attendance.employee_name))
+        ).outerjoin(Employee, Employee.emp_id == Attendance.emp_id)
+        query = self._filter_listing(query, start_date, end_date, emp_id, None, name)
+        rows = query.group_by(Attendance.emp_id).order_by(Attendance.emp_id).limit(limit).all()
+        return [tuple(row) for row in rows]
+    
+    @staticmethod
+    def _filter_listing(
+        query,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        emp_id: Optional[str],
+        status: Optional[str],
+        name: Optional[str]
+    ):
+        """Apply the listing filters to a query; the name filter needs Employee joined"""
+        if start_date is not None:
+            query = query.filter(Attendance.date >= start_date)
+        if end_date is not None:
+            query = query.filter(Attendance.date <= end_date)
+        if emp_id is not None:
+            query = query.filter(Attendance.emp_id == emp_id)
+        if status is not None:
+            query = query.filter(Attendance.attendance_status == status)
+        if name:
+            escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            pattern = f"%{escaped}%"
+            query = query.filter(or_(
+                Employee.full_name.ilike(pattern, escape="\\"),
+                Attendance.employee_name.ilike(pattern, escape="\\")
+            ))
+        return query
+    
     def get_all(self) -> List[Attendance]:
         """Get all attendance records"""
         from sqlalchemy.orm import joinedload
@@ -49,7 +427,7 @@ class AttendanceRepository:
         
         Args:
             attendance_data: Dictionary with attendance fields
-            
+        
         Returns:
             Created Attendance object
         """
@@ -64,15 +442,171 @@ class AttendanceRepository:
         Args:
             record: Attendance record to update
             update_data: Dictionary with fields to update
-            
+        
         Returns:
             Updated Attendance object
         """
         for key, value in update_data.items():
             if hasattr(record, key) and value is not None:
                 setattr(record, key, value)
+        for column, source in MINUTE_COLUMNS.items():
+            if update_data.get(source) is not None:
+                setattr(record, column, to_minutes(getattr(record, source)))
+        # No longer the content ingestion wrote; the next ingest must rewrite it
+        record.content_hash = None
+        record.updated_at = get_ist_now()
         return record
     
+    def bulk_create(self, records: List[dict]) -> None:
+        """
+        Insert many attendance records using batched executemany
+        
+        Args:
+            records: List of dictionaries with attendance fields
+        """
+        for i in range(0, len(records), BULK_BATCH_SIZE):
+            self.db.bulk_insert_mappings(Attendance, records[i:i + BULK_BATCH_SIZE])
+    
+    def bulk_update(self, records: List[dict]) -> None:
+        """
+        Update many attendance records by primary key using batched executemany
+        
+        Args:
+            records: List of dictionaries with 'id' and the fields to update
+        """
+        for i in range(0, len(records), BULK_BATCH_SIZE):
+            self.db.bulk_update_mappings(Attendance, records[i:i + BULK_BATCH_SIZE])
+    
+    def upsert(self, records: List[dict], update_fields: Optional[List[str]] = None) -> None:
+        """
+        Insert or update attendance records keyed on (emp_id, date)
+        
+        Relies on the uq_attendance_emp_date index so concurrent or repeated
+        ingests stay idempotent. On conflict, only update_fields are written
+        and None values keep the stored value. Minute columns are derived from
+        the time strings and follow them: they keep the stored value only when
+        their string does. content_hash is always replaced: records without
+        one clear it, so the next ingest of the row is not skipped.
+        
+        Args:
+            records: List of dictionaries with emp_id, date and the same set of
+                fields, at most one per (emp_id, date)
+            update_fields: Fields to overwrite on existing rows (default: all non-key fields)
+        """
+        if not records:
+            return
+        
+        now = get_ist_now()
+        records = [
+            {**record, **derive_minute_columns(record), CONTENT_HASH: record.get(CONTENT_HASH), "updated_at": now}
+            for record in records
+        ]
+        columns = list(records[0].keys())
+        if update_fields is None:
+            update_fields = [c for c in columns if c not in UPSERT_KEY]
+        else:
+            derived = [c for c, source in MINUTE_COLUMNS.items() if source in update_fields and c not in update_fields]
+            update_fields = [*update_fields, *derived]
+            for column in (CONTENT_HASH, "updated_at"):
+                if column not in update_fields:
+                    update_fields.append(column)
+        
+        dialect = self.db.get_bind().dialect.name
+        batch_size = BULK_BATCH_SIZE
+        if dialect == "mssql":
+            # Every value of a MERGE batch is a bound parameter of its one statement
+            batch_size = max(1, MERGE_MAX_PARAMS // len(columns))
+        for i in range(0, len(records), batch_size):
+            batch = records[i:i + batch_size]
+            if dialect == "mssql":
+                self._merge(batch, columns, update_fields)
+            elif dialect in ("postgresql", "sqlite"):
+                self._insert_on_conflict(dialect, batch, update_fields)
+            else:
+                self._upsert_read_then_write(batch, update_fields)
+    
+    def _insert_on_conflict(self, dialect: str, batch: List[dict], update_fields: List[str]) -> None:
+        """INSERT ... ON CONFLICT (emp_id, date) DO UPDATE for PostgreSQL/SQLite"""
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        table = Attendance.__table__
+        stmt = insert(table)
+        if update_fields:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(UPSERT_KEY),
+                set_={c: self._keep_if_null(stmt.excluded, table.c, c) for c in update_fields}
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(UPSERT_KEY))
+        self.db.execute(stmt, batch)
+    
+    @staticmethod
+    def _keep_if_null(source, target, column: str):
+        """SET expression that keeps the stored value when the incoming one is NULL"""
+        if column == CONTENT_HASH:
+            return source[column]
+        if column in MINUTE_COLUMNS:
+            # A time string that is set but unparseable ('--:--') clears its minutes
+            return case((source[MINUTE_COLUMNS[column]].is_(None), target[column]), else_=source[column])
+        return func.coalesce(source[column], target[column])
+    
+    def _merge(self, batch: List[dict], columns: List[str], update_fields: List[str]) -> None:
+        """MERGE ... WITH (HOLDLOCK) for SQL Server, one statement per batch with a VALUES source table"""
+        rows = ", ".join(
+            "(" + ", ".join(f":{c}_{i}" for c in columns) + ")"
+            for i in range(len(batch))
+        )
+        params = {f"{c}_{i}": record[c] for i, record in enumerate(batch) for c in columns}
+        # VALUES columns take their type from the bound values; cast them to the table's types
+        # so a column that is NULL in every row does not retype the COALESCE below
+        dialect = self.db.get_bind().dialect
+        table_columns = Attendance.__table__.c
+        typed = ", ".join(
+            f"CAST(v.[{c}] AS {table_columns[c].type.compile(dialect=dialect)}) AS [{c}]" for c in columns
+        )
+        on = " AND ".join(f"target.[{c}] = source.[{c}]" for c in UPSERT_KEY)
+        matched = ""
+        if update_fields:
+            assignments = ", ".join(self._merge_assignment(c) for c in update_fields)
+            matched = f"WHEN MATCHED THEN UPDATE SET {assignments} "
+        column_list = ", ".join(f"[{c}]" for c in columns)
+        values = ", ".join(f"source.[{c}]" for c in columns)
+        sql = (
+            f"MERGE {Attendance.__tablename__} WITH (HOLDLOCK) AS target "
+            f"USING (SELECT {typed} FROM (VALUES {rows}) AS v ({column_list})) AS source ON {on} "
+            f"{matched}"
+            f"WHEN NOT MATCHED THEN INSERT ({column_list}) VALUES ({values});"
+        )
+        self.db.execute(text(sql), params)
+    
+    @staticmethod
+    def _merge_assignment(column: str) -> str:
+        """MERGE counterpart of _keep_if_null"""
+        if column == CONTENT_HASH:
+            return f"target.[{column}] = source.[{column}]"
+        if column in MINUTE_COLUMNS:
+            source = MINUTE_COLUMNS[column]
+            return f"target.[{column}] = CASE WHEN source.[{source}] IS NULL THEN target.[{column}] ELSE source.[{column}] END"
+        return f"target.[{column}] = COALESCE(source.[{column}], target.[{column}])"
+    
+    def _upsert_read_then_write(self, batch: List[dict], update_fields: List[str]) -> None:
+        """Fallback for databases without a native upsert"""
+        dates = [r["date"] for r in batch]
+        existing_ids = self.get_ids_in_date_range(min(dates), max(dates))
+        inserts = []
+        updates = []
+        for record in batch:
+            record_id = existing_ids.get((record["emp_id"], record["date"]))
+            if record_id is None:
+                inserts.append(record)
+            else:
+                update_data = {
+                    c: record[c] for c in update_fields
+                    if c == CONTENT_HASH or record.get(MINUTE_COLUMNS.get(c, c)) is not None
+                }
+                updates.append({**update_data, "id": record_id})
+        self.bulk_create(inserts)
+        self.bulk_update(updates)
+    
     def delete(self, record: Attendance) -> None:
         """Delete attendance record"""
         self.db.delete(record)
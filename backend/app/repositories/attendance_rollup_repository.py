@@ -0,0 +1,73 @@
+"""
+Attendance Rollup Repository
+Database access layer for AttendanceMonthlyRollup model
+"""
+from sqlalchemy.orm import Session
+from app.models.models import AttendanceMonthlyRollup
+from typing import List, Optional
+from datetime import date
+
+# Rows per executemany batch for bulk inserts
+BULK_BATCH_SIZE = 1000
+
+class AttendanceRollupRepository:
+    """Handles all database operations for AttendanceMonthlyRollup model"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_by_emp_id(
+        self,
+        emp_id: str,
+        start_month: Optional[date] = None,
+        end_month: Optional[date] = None
+    ) -> List[AttendanceMonthlyRollup]:
+        """
+        Get an employee's monthly rollups (an index range scan on uq_rollup_emp_month)
+        
+        Args:
+            emp_id: Employee ID
+            start_month: First month (inclusive, default: no limit)
+            end_month: Last month (inclusive, default: no limit)
+        
+        Returns:
+            List of AttendanceMonthlyRollup, ordered by month
+        """
+        query = self.db.query(AttendanceMonthlyRollup).filter(AttendanceMonthlyRollup.emp_id == emp_id)
+        if start_month is not None:
+            query = query.filter(AttendanceMonthlyRollup.month >= start_month)
+        if end_month is not None:
+            query = query.filter(AttendanceMonthlyRollup.month <= end_month)
+        return query.order_by(AttendanceMonthlyRollup.month).all()
+    
+    def replace_range(
+        self,
+        start_month: date,
+        end_month: date,
+        rollups: List[dict],
+        emp_ids: Optional[List[str]] = None
+    ) -> None:
+        """
+        Replace every rollup of a month range
+        
+        Args:
+            start_month: First month (inclusive)
+            end_month: Last month (inclusive)
+            rollups: New rollup rows; employees and months without one are left
+                without a rollup
+            emp_ids: Only replace these employees' rollups (one bound parameter
+                each; keep lists short)
+        """
+        query = self.db.query(AttendanceMonthlyRollup).filter(
+            AttendanceMonthlyRollup.month >= start_month,
+            AttendanceMonthlyRollup.month <= end_month
+        )
+        if emp_ids is not None:
+            query = query.filter(AttendanceMonthlyRollup.emp_id.in_(emp_ids))
+        query.delete(synchronize_session=False)
+        for i in range(0, len(rollups), BULK_BATCH_SIZE):
+            self.db.bulk_insert_mappings(AttendanceMonthlyRollup, rollups[i:i + BULK_BATCH_SIZE])
+    
+    def commit(self) -> None:
+        """Commit transaction"""
+        self.db.commit()
@@ -0,0 +1,70 @@
+"""
+Attendance Summary Repository
+Database access layer for AttendanceDailySummary model
+"""
+from sqlalchemy.orm import Session
+from app.models.models import AttendanceDailySummary
+from typing import List, Optional
+from datetime import date
+
+# Rows per executemany batch for bulk inserts
+BULK_BATCH_SIZE = 1000
+
+class AttendanceSummaryRepository:
+    """Handles all database operations for AttendanceDailySummary model"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_in_date_range(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[AttendanceDailySummary]:
+        """
+        Get the summaries of a date range (a primary-key range scan)
+        
+        Args:
+            start_date: First date (inclusive, default: no limit)
+            end_date: Last date (inclusive, default: no limit)
+        
+        Returns:
+            List of AttendanceDailySummary, ordered by date
+        """
+        query = self.db.query(AttendanceDailySummary)
+        if start_date is not None:
+            query = query.filter(AttendanceDailySummary.date >= start_date)
+        if end_date is not None:
+            query = query.filter(AttendanceDailySummary.date <= end_date)
+        return query.order_by(AttendanceDailySummary.date).all()
+    
+    def replace_range(self, start_date: date, end_date: date, summaries: List[dict]) -> None:
+        """
+        Replace every summary within a date range
+        
+        Args:
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            summaries: New summary rows; dates of the range without one are left
+                without a summary
+        """
+        self.db.query(AttendanceDailySummary).filter(
+            AttendanceDailySummary.date >= start_date,
+            AttendanceDailySummary.date <= end_date
+        ).delete(synchronize_session=False)
+        for i in range(0, len(summaries), BULK_BATCH_SIZE):
+            self.db.bulk_insert_mappings(AttendanceDailySummary, summaries[i:i + BULK_BATCH_SIZE])
+    
+    def replace_dates(self, dates: List[date], summaries: List[dict]) -> None:
+        """
+        Replace the summaries of the given dates
+        
+        Args:
+            dates: Dates to replace (one bound parameter each; keep lists short)
+            summaries: New summary rows; dates without one are left without a summary
+        """
+        self.db.query(AttendanceDailySummary).filter(
+            AttendanceDailySummary.date.in_(dates)
+        ).delete(synchronize_session=False)
+        for i in range(0, len(summaries), BULK_BATCH_SIZE):
+            self.db.bulk_insert_mappings(AttendanceDailySummary, summaries[i:i + BULK_BATCH_SIZE])
+    
+    def commit(self) -> None:
+        """Commit transaction"""
+        self.db.commit()
@@ -0,0 +1,143 @@
+"""
+Ingestion Job Repository
+Database access layer for IngestionJob model
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from app.models.models import IngestionJob, JobStatus, get_ist_now
+from typing import List, Optional
+from datetime import datetime
+
+class IngestionJobRepository:
+    """Handles all database operations for IngestionJob model"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_by_id(self, job_id: int) -> Optional[IngestionJob]:
+        """Get ingestion job by ID"""
+        return self.db.query(IngestionJob).filter(IngestionJob.id == job_id).first()
+    
+    def create(self, job_data: dict) -> IngestionJob:
+        """
+        Create new ingestion job
+        
+        Args:
+            job_data: Dictionary with job fields
+        
+        Returns:
+            Created IngestionJob object
+        """
+        job = IngestionJob(**job_data)
+        self.db.add(job)
+        self.db.flush()  # Generate ID
+        return job
+    
+    def claim_next(self, worker_id: str) -> Optional[IngestionJob]:
+        """
+        Claim the oldest queued job for a worker
+        
+        The QUEUED -> RUNNING transition is a conditional UPDATE, so two
+        workers racing for the same job cannot both win it.
+        
+        Args:
+            worker_id: Identifier of the claiming worker
+        
+        Returns:
+            Claimed IngestionJob or None if the queue is empty
+        """
+        while True:
+            candidate = self.db.query(IngestionJob.id).filter(
+                IngestionJob.status == JobStatus.QUEUED.value
+            ).order_by(IngestionJob.id).first()
+            if not candidate:
+                return None
+            
+            claimed = self.db.query(IngestionJob).filter(
+                IngestionJob.id == candidate.id,
+                IngestionJob.status == JobStatus.QUEUED.value
+            ).update({
+                IngestionJob.status: JobStatus.RUNNING.value,
+                IngestionJob.worker_id: worker_id,
+                IngestionJob.started_at: get_ist_now(),
+                IngestionJob.heartbeat_at: get_ist_now(),
+                IngestionJob.attempts: IngestionJob.attempts + 1
+            }, synchronize_session=False)
+            self.db.commit()
+            
+            if claimed:
+                return self.get_by_id(candidate.id)
+    
+    def get_status(self, job_id: int) -> Optional[str]:
+        """Read a job's committed status, bypassing the session's cached copy"""
+        return self.db.query(IngestionJob.status).filter(IngestionJob.id == job_id).scalar()
+    
+    def transition(self, job_id: int, from_statuses: List[str], to_status: str) -> bool:
+        """
+        Move a job to a new status if it is currently in one of from_statuses
+        
+        Args:
+            job_id: Job ID
+            from_statuses: Statuses the change is allowed from
+            to_status: New status
+        
+        Returns:
+            True if the job was changed
+        """
+        changed = self.db.query(IngestionJob).filter(
+            IngestionJob.id == job_id,
+            IngestionJob.status.in_(from_statuses)
+        ).update({IngestionJob.status: to_status}, synchronize_session=False)
+        self.db.commit()
+        return bool(changed)
+    
+    def heartbeat(self, job_ids: List[int]) -> None:
+        """
+        Stage a heartbeat on jobs that are still RUNNING (committed by the caller)
+        
+        Args:
+            job_ids: Job IDs
+        """
+        self.db.query(IngestionJob).filter(
+            IngestionJob.id.in_(job_ids),
+            IngestionJob.status == JobStatus.RUNNING.value
+        ).update({IngestionJob.heartbeat_at: get_ist_now()}, synchronize_session=False)
+    
+    def requeue_stale(self, heartbeat_before: datetime, max_attempts: int) -> int:
+        """
+        Return jobs abandoned by a crashed worker to the queue
+        
+        A running job's heartbeat is refreshed whenever its worker commits a
+        chunk, so a long file that is still making progress is never swept.
+        
+        Args:
+            heartbeat_before: RUNNING jobs with no heartbeat since this are considered abandoned
+            max_attempts: Jobs that already used this many attempts are failed instead
+        
+        Returns:
+            Number of jobs requeued or failed
+        """
+        # Jobs claimed before heartbeats were recorded fall back to their start time
+        stale = self.db.query(IngestionJob).filter(
+            IngestionJob.status == JobStatus.RUNNING.value,
+            func.coalesce(IngestionJob.heartbeat_at, IngestionJob.started_at) < heartbeat_before
+        )
+        failed = stale.filter(IngestionJob.attempts >= max_attempts).update({
+            IngestionJob.status: JobStatus.FAILED.value,
+            IngestionJob.error: "Worker stopped responding",
+            IngestionJob.finished_at: get_ist_now()
+        }, synchronize_session=False)
+        requeued = stale.filter(IngestionJob.attempts < max_attempts).update({
+            IngestionJob.status: JobStatus.QUEUED.value,
+            IngestionJob.worker_id: None
+        }, synchronize_session=False)
+        self.db.commit()
+        return failed + requeued
+    
+    def commit(self) -> None:
+        """Commit transaction"""
+        self.db.commit()
+    
+    def rollback(self) -> None:
+        """Rollback transaction"""
+        self.db.rollback()
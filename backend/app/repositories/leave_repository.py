@@ -3,8 +3,8 @@ Leave Repository
 Database access layer for Leave-related models
 """
 from sqlalchemy.orm import Session
-from app.models.models import LeaveType, LeaveBalance, LeaveRequest, LeaveApprovalLog
-from typing import List, Optional
+from app.models.models import LeaveType, LeaveBalance, LeaveRequest, LeaveApprovalLog, Holiday
+from typing import List, Optional, Set
 from datetime import date
 
 class LeaveRepository:
@@ -69,7 +69,7 @@ class LeaveRepository:
         return self.db.query(LeaveRequest).filter(
             LeaveRequest.emp_id == emp_id
         ).order_by(LeaveRequest.created_at.desc()).all()
-
+    
     def get_all_requests(self, limit: int = 50) -> List[LeaveRequest]:
         """Get all leave requests across system, ordered by date"""
         return self.db.query(LeaveRequest).order_by(
@@ -118,6 +118,16 @@ class LeaveRepository:
         self.db.add(log)
         return log
     
+    # Holiday operations
+    def get_holiday_dates(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Set[date]:
+        """Get the dates of public holidays, optionally within a date range (inclusive)"""
+        query = self.db.query(Holiday.date)
+        if start_date is not None:
+            query = query.filter(Holiday.date >= start_date)
+        if end_date is not None:
+            query = query.filter(Holiday.date <= end_date)
+        return {holiday_date for holiday_date, in query.all()}
+    
     def flush(self) -> None:
         """Flush changes"""
         self.db.flush()
@@ -0,0 +1,88 @@
+"""
+Status Recompute Job Repository
+Database access layer for StatusRecomputeJob model
+"""
+from sqlalchemy.orm import Session
+from app.models.models import StatusRecomputeJob, JobStatus, get_ist_now
+from typing import Optional
+from datetime import datetime
+
+class StatusRecomputeJobRepository:
+    """Handles all database operations for StatusRecomputeJob model"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_by_id(self, job_id: int) -> Optional[StatusRecomputeJob]:
+        """Get status recompute job by ID"""
+        return self.db.query(StatusRecomputeJob).filter(StatusRecomputeJob.id == job_id).first()
+    
+    def create(self, job_data: dict) -> StatusRecomputeJob:
+        """
+        Create new status recompute job
+        
+        Args:
+            job_data: Dictionary with job fields
+            
+        Returns:
+            Created StatusRecomputeJob object
+        """
+        job = StatusRecomputeJob(**job_data)
+        self.db.add(job)
+        self.db.flush()  # Generate ID
+        return job
+    
+    def claim_next(self, worker_id: str) -> Optional[StatusRecomputeJob]:
+        """
+        Claim the oldest queued job for a worker (conditional UPDATE, as for ingestion jobs)
+        
+        Args:
+            worker_id: Identifier of the claiming worker
+            
+        Returns:
+            Claimed StatusRecomputeJob or None if the queue is empty
+        """
+        while True:
+            candidate = self.db.query(StatusRecomputeJob.id).filter(
+                StatusRecomputeJob.status == JobStatus.QUEUED.value
+            ).order_by(StatusRecomputeJob.id).first()
+            if not candidate:
+                return None
+            
+            claimed = self.db.query(StatusRecomputeJob).filter(
+                StatusRecomputeJob.id == candidate.id,
+                StatusRecomputeJob.status == JobStatus.QUEUED.value
+            ).update({
+                StatusRecomputeJob.status: JobStatus.RUNNING.value,
+                StatusRecomputeJob.worker_id: worker_id,
+                StatusRecomputeJob.started_at: get_ist_now()
+            }, synchronize_session=False)
+            self.db.commit()
+            
+            if claimed:
+                return self.get_by_id(candidate.id)
+    
+    def requeue_stale(self, started_before: datetime) -> int:
+        """
+        Return jobs abandoned by a crashed worker to the queue.
+        A recompute is idempotent, so it is simply run again.
+        
+        Args:
+            started_before: RUNNING jobs started before this are considered abandoned
+            
+        Returns:
+            Number of jobs requeued
+        """
+        requeued = self.db.query(StatusRecomputeJob).filter(
+            StatusRecomputeJob.status == JobStatus.RUNNING.value,
+            StatusRecomputeJob.started_at < started_before
+        ).update({
+            StatusRecomputeJob.status: JobStatus.QUEUED.value,
+            StatusRecomputeJob.worker_id: None
+        }, synchronize_session=False)
+        self.db.commit()
+        return requeued
+    
+    def commit(self) -> None:
+        """Commit transaction"""
+        self.db.commit()
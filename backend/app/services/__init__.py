@@ -6,5 +6,6 @@ from app.services.auth_service import AuthService
 from app.services.attendance_service import AttendanceService
 from app.services.leave_service import LeaveService
 from app.services.admin_service import AdminService
+from app.services.ingestion_service import IngestionService
 
-__all__ = ["AuthService", "AttendanceService", "LeaveService", "AdminService"]
+__all__ = ["AuthService", "AttendanceService", "LeaveService", "AdminService", "IngestionService"]
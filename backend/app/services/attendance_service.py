@@ -3,220 +3,512 @@ Attendance Service
 Business logic for attendance management and file processing
 """
 from sqlalchemy.orm import Session
-from fastapi import UploadFile, HTTPException
-from typing import List, Dict
+from fastapi import HTTPException
+from typing import Callable, Iterator, List, Dict, NamedTuple, Optional, Tuple
+import base64
+import binascii
+import csv
+import hashlib
+import io
+import json
 import logging
+import os
+import time
+from collections import Counter
 from datetime import date, datetime
+import pandas as pd
 
 from app.repositories.attendance_repository import AttendanceRepository
+from app.repositories.attendance_punch_repository import AttendancePunchRepository
 from app.repositories.file_repository import FileRepository
-from app.models.models import Employee, UserRole
-from app.utils.file_utils import calculate_file_hash, generate_safe_filename, normalize_emp_id
-from app.utils.date_utils import parse_date, format_time
-from app.services.cleaner import detect_and_clean_memory
-from app.core.azure_utils import upload_bytes_to_azure
+from app.repositories.leave_repository import LeaveRepository
+from app.models.models import Employee, UserRole, get_ist_now
+from app.utils.file_utils import normalize_emp_id
+from app.utils.date_utils import parse_date, format_time, parse_punch_log, to_minutes
+from app.services.parse_pool import ParseResult, timed_parse
+from app.services.cleaner import CLEANER_VERSION
+from app.services.office_time import office_time_for_logs
+from app.services.daily_summary_service import DailySummaryService
+from app.services.monthly_rollup_service import MonthlyRollupService
+from app.services.status_rules import STATUS_ABSENT, STATUS_ON_LEAVE, STATUS_PRESENT, evaluate_status
 
 logger = logging.getLogger(__name__)
 
+# Config: attendance records written per transaction during ingestion
+INGEST_COMMIT_ROWS = int(os.getenv("INGEST_COMMIT_ROWS", "5000"))
+
+# Attendance column -> cleaned record field, for the time and duration fields
+TIME_FIELDS = {
+    "first_in": "First_In",
+    "last_out": "Last_Out",
+    "in_duration": "In_Duration",
+    "out_duration": "Out_Duration",
+    "total_duration": "Total_Duration"
+}
+
+# Dashboard count -> attendance status it counts
+DASHBOARD_STATUSES = {
+    "present": STATUS_PRESENT,
+    "absent": STATUS_ABSENT,
+    "on_leave": STATUS_ON_LEAVE
+}
+
+# Config: attendance rows fetched per cursor round trip (and streamed per chunk) by exports
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "2000"))
+
+# Attendance columns of an export, in output order; employee_name is appended
+EXPORT_COLUMNS = [
+    "date", "emp_id", "attendance_status", "first_in", "last_out",
+    "in_duration", "out_duration", "total_duration",
+    "office_minutes", "break_minutes", "is_manually_corrected"
+]
+
+# Export format -> media type
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+class IngestCheckpoint(NamedTuple):
+    last_date: Optional[date]  # Every record up to this date is committed
+    rows: int                  # Source records committed
+    saved: int
+    updated: int
+    unchanged: int
+
 class AttendanceService:
     """Handles attendance business logic"""
     
     def __init__(self, db: Session):
         self.db = db
         self.attendance_repo = AttendanceRepository(db)
+        self.punch_repo = AttendancePunchRepository(db)
         self.file_repo = FileRepository(db)
+        self.leave_repo = LeaveRepository(db)
+        self.daily_summary = DailySummaryService(db)
+        self.monthly_rollup = MonthlyRollupService(db)
     
-    def process_uploaded_files(
+    def process_file_content(
         self,
-        files: List[UploadFile],
-        admin: Employee
+        filename: str,
+        file_path: str,
+        file_hash: str,
+        uploaded_by: str,
+        timings: Optional[Dict] = None,
+        parsed: Optional[ParseResult] = None,
+        force: bool = False,
+        checkpoint: Optional[IngestCheckpoint] = None,
+        on_checkpoint: Optional[Callable[[IngestCheckpoint], bool]] = None
     ) -> Dict:
         """
-        Process uploaded attendance files
+        Clean an attendance file and write its records
         
-        Args:
-            files: List of uploaded files
-            admin: Admin user uploading files
-            
-        Returns:
-            Dictionary with processing results
-        """
-        results = []
-        
-        for file in files:
-            logger.info(f"Received file for processing: {file.filename}")
-            try:
-                result = self._process_single_file(file, admin)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Error processing file {file.filename}: {e}", exc_info=True)
-                self.attendance_repo.rollback()
-                results.append({
-                    "filename": file.filename,
-                    "status": "error",
-                    "reason": str(e)
-                })
-        
-        return {"message": "Upload processing complete", "results": results}
-    
-    def _process_single_file(
-        self,
-        file: UploadFile,
-        admin: Employee
-    ) -> Dict:
-        """
-        Process a single attendance file
+        Records are committed in chunks of whole dates; an interrupted run can
+        be resumed from its last checkpoint.
         
         Args:
-            file: Uploaded file
-            admin: Admin user
-            
+            filename: Original file name
+            file_path: Where the upload is stored
+            file_hash: SHA-256 of the file content
+            uploaded_by: Email of the uploading admin
+            timings: Optional dictionary that receives parse_ms and write_ms
+            parsed: Cleaner output already produced by the parse pool
+            force: Reprocess even if this exact file was already ingested unchanged
+            checkpoint: Progress of an earlier run of this file to resume from
+            on_checkpoint: Called before each chunk commit with the progress so far;
+                returning False cancels the ingest after that commit
+        
         Returns:
-            Processing result dictionary
+            Processing result dictionary (counts include resumed progress)
         """
-        # Read file content
-        content = file.file.read() # Read directly from SpooledTemporaryFile synchronously
+        if timings is None:
+            timings = {}
         
-        # Calculate hash for duplicate detection
-        file_hash = calculate_file_hash(content)
+        # Hash computed while the upload was stored drives duplicate detection
         existing_file = self.file_repo.get_by_hash(file_hash)
         
         if existing_file:
-            logger.info(f"[SYSTEM] File {file.filename} already uploaded (Hash collision). Skipping Azure upload.")
+            logger.info(f"[SYSTEM] File {filename} already uploaded (hash match); reusing its upload record")
+            prior = None if force else self._prior_ingest_result(existing_file, filename)
+            if prior:
+                return prior
         
         # Clean and detect file format
-        cleaned_data, detected_type = detect_and_clean_memory(content)
-        logger.info(f"[DEBUG] Processing file: {file.filename} | Detected Type: {detected_type}")
+        if parsed is None:
+            parsed = timed_parse(file_path, file_hash)
+        cleaned_data, detected_type, timings["parse_ms"] = parsed
+        logger.info(f"[DEBUG] Processing file: {filename} | Detected Type: {detected_type}")
         
         if not cleaned_data:
-            logger.error(f"[ERROR] No data extracted from {file.filename} using {detected_type}")
+            logger.error(f"[ERROR] No data extracted from {filename} using {detected_type}")
             return {
-                "filename": file.filename,
+                "filename": filename,
                 "status": "error",
+                "type": detected_type,
                 "reason": "Unknown file format"
             }
         
-        # Upload to Azure if new file
         if not existing_file:
-            safe_filename = generate_safe_filename(file.filename)
-            # await upload_bytes_to_azure(content, safe_filename, file.content_type) 
-            # TODO: Azure upload should be handled in background or made sync. 
-            # For now, suppressing the await to make the function sync.
-            import asyncio
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                     # If we are in a thread with a running loop (unlikely for threadpool), this might fail.
-                     # But we are moving to sync.
-                     pass
-            except:
-                pass
-            # For this refactor, let's assuming we comment out Azure upload or make it sync. 
-            # I will comment it out and add a TODO to fix azure_utils.py to be sync or use requests.
-            # actually better: just run it.
-            # upload_bytes_to_azure(content, safe_filename, file.content_type)
-            pass 
-
-            
             # Create file upload log
             log_data = {
-                "filename": file.filename,
-                "uploaded_by": admin.email,
+                "filename": filename,
+                "uploaded_by": uploaded_by,
                 "report_type": detected_type,
                 "file_hash": file_hash,
-                "file_path": safe_filename
+                "file_path": file_path
             }
             upload_log = self.file_repo.create(log_data)
             logger.info(f"Created file log ID: {upload_log.id}")
         else:
-            logger.info(f"Using existing upload record for {file.filename}")
+            upload_log = existing_file
+            logger.info(f"Using existing upload record for {filename}")
         
         # Process attendance records
-        saved_count, updated_count = self._process_attendance_records(
+        stage_start = time.perf_counter()
+        progress, completed = self._process_attendance_records(
             cleaned_data,
-            file.filename
+            filename,
+            checkpoint=checkpoint,
+            on_checkpoint=on_checkpoint
         )
+        saved_count, updated_count, unchanged_count = progress.saved, progress.updated, progress.unchanged
+        if not completed:
+            timings["write_ms"] = int((time.perf_counter() - stage_start) * 1000)
+            logger.info(f"Cancelled processing {filename} after {progress.last_date}")
+            return {
+                "filename": filename,
+                "status": "cancelled",
+                "type": detected_type,
+                "records": len(cleaned_data),
+                "saved": saved_count,
+                "updated": updated_count,
+                "unchanged": unchanged_count,
+                "details": f"Cancelled after {progress.rows} of {len(cleaned_data)} records (committed through {progress.last_date})"
+            }
+        self._record_ingest(upload_log, cleaned_data, saved_count, updated_count, unchanged_count)
         
         # Commit transaction
         self.attendance_repo.commit()
+        timings["write_ms"] = int((time.perf_counter() - stage_start) * 1000)
         
-        logger.info(f"Completed processing {file.filename}: Saved {saved_count}, Updated {updated_count}")
+        logger.info(f"Completed processing {filename}: Saved {saved_count}, Updated {updated_count}, Unchanged {unchanged_count}")
         
         return {
-            "filename": file.filename,
+            "filename": filename,
             "status": "success",
             "type": detected_type,
-            "details": f"Processed {len(cleaned_data)} records (Saved: {saved_count}, Updated: {updated_count})"
+            "records": len(cleaned_data),
+            "saved": saved_count,
+            "updated": updated_count,
+            "unchanged": unchanged_count,
+            "details": f"Processed {len(cleaned_data)} records (Saved: {saved_count}, Updated: {updated_count}, Unchanged: {unchanged_count})"
+        }
+    
+    def get_prior_ingest_result(self, file_hash: str, filename: str) -> Optional[Dict]:
+        """
+        Get the result of an earlier ingest of an identical file
+        
+        Args:
+            file_hash: SHA-256 of the file content
+            filename: Name of the current upload
+        
+        Returns:
+            Prior result dictionary, or None if the file must be (re)processed
+        """
+        existing_file = self.file_repo.get_by_hash(file_hash)
+        if not existing_file:
+            return None
+        return self._prior_ingest_result(existing_file, filename)
+    
+    def _prior_ingest_result(self, upload_log, filename: str) -> Optional[Dict]:
+        """
+        Reuse an earlier ingest if nothing it wrote has changed since
+        
+        The ingest is reusable when it ran with the current cleaner version and
+        the attendance rows in its date span are exactly as it left them: same
+        row count and no row modified after it finished.
+        """
+        if not upload_log.ingested_at or upload_log.parser_version != CLEANER_VERSION:
+            return None
+        
+        row_count, last_updated = self.attendance_repo.get_span_stats(upload_log.first_date, upload_log.last_date)
+        if row_count != upload_log.span_row_count:
+            return None
+        if last_updated and last_updated > upload_log.ingested_at:
+            return None
+        
+        logger.info(f"[SKIP] {filename} is identical to an upload ingested at {upload_log.ingested_at}; reusing result")
+        return {
+            "filename": filename,
+            "status": "success",
+            "type": upload_log.report_type,
+            "records": upload_log.records_count,
+            "saved": upload_log.saved_count,
+            "updated": upload_log.updated_count,
+            "unchanged": upload_log.unchanged_count,
+            "skipped": True,
+            "details": f"Already ingested on {upload_log.ingested_at:%Y-%m-%d %H:%M}, skipped (Saved: {upload_log.saved_count}, Updated: {upload_log.updated_count}, Unchanged: {upload_log.unchanged_count})"
         }
     
+    def _record_ingest(
+        self,
+        upload_log,
+        cleaned_data: List[Dict],
+        saved_count: int,
+        updated_count: int,
+        unchanged_count: int
+    ) -> None:
+        """Store the ingest outcome on the upload log so identical re-uploads can be skipped"""
+        dates = [d for d in (parse_date(v) for v in {rec.get('Date') for rec in cleaned_data}) if d]
+        if not dates:
+            return
+        
+        self.db.flush()
+        first_date, last_date = min(dates), max(dates)
+        upload_log.span_row_count, _ = self.attendance_repo.get_span_stats(first_date, last_date)
+        upload_log.first_date = first_date
+        upload_log.last_date = last_date
+        upload_log.records_count = len(cleaned_data)
+        upload_log.saved_count = saved_count
+        upload_log.updated_count = updated_count
+        upload_log.unchanged_count = unchanged_count
+        upload_log.parser_version = CLEANER_VERSION
+        upload_log.ingested_at = get_ist_now()
+    
     def _process_attendance_records(
         self,
         cleaned_data: List[Dict],
-        source_filename: str
-    ) -> tuple:
+        source_filename: str,
+        checkpoint: Optional[IngestCheckpoint] = None,
+        on_checkpoint: Optional[Callable[[IngestCheckpoint], bool]] = None
+    ) -> Tuple[IngestCheckpoint, bool]:
         """
-        Process attendance records from cleaned data
+        Process attendance records from cleaned data, committing every
+        INGEST_COMMIT_ROWS records
         
         Args:
             cleaned_data: List of cleaned attendance records
             source_filename: Source file name
-            
+            checkpoint: Progress of an earlier, interrupted run to resume from
+            on_checkpoint: Called before each commit with the progress so far;
+                returning False stops after that commit
+        
         Returns:
-            Tuple of (saved_count, updated_count)
+            Tuple of (progress, completed)
         """
-        saved_count = 0
-        updated_count = 0
-        
         logger.info(f"[INFO] Processing {len(cleaned_data)} records from {source_filename}")
         
+        records, occurrences = self._collapse_records(cleaned_data, source_filename)
+        
+        progress = checkpoint or IngestCheckpoint(None, 0, 0, 0, 0)
+        if checkpoint:
+            logger.info(f"[INFO] Resuming after {checkpoint.last_date} ({checkpoint.rows} records already committed)")
+        
+        # Commit whole dates (report sections) at a time, so the checkpoint date is exact
+        for chunk in self._date_chunks(records, progress.last_date):
+            saved_count, updated_count, unchanged_count = self._write_chunk(chunk, occurrences)
+            progress = IngestCheckpoint(
+                last_date=max(date_obj for _, date_obj in chunk),
+                rows=progress.rows + sum(occurrences[key] for key in chunk),
+                saved=progress.saved + saved_count,
+                updated=progress.updated + updated_count,
+                unchanged=progress.unchanged + unchanged_count
+            )
+            # The checkpoint is saved in the same transaction as the rows it covers
+            keep_going = on_checkpoint(progress) if on_checkpoint else True
+            self.attendance_repo.commit()
+            if not keep_going:
+                return progress, False
+        return progress, True
+    
+    @staticmethod
+    def _collapse_records(cleaned_data: List[Dict], source_filename: str) -> Tuple[Dict, Counter]:
+        """
+        Normalize cleaned records and collapse them to one row per (emp_id, date);
+        later rows overwrite non-empty fields of earlier ones, as repeated
+        updates would
+        
+        Dates, employee IDs and times repeat throughout a file (one date per
+        section, a few hundred IDs), so each distinct value is normalized once
+        and rows only do dictionary lookups.
+        
+        Args:
+            cleaned_data: List of cleaned attendance records
+            source_filename: Source file name
+        
+        Returns:
+            Tuple of ((emp_id, date) -> record data, (emp_id, date) -> source row count)
+        """
+        emp_ids = {raw: normalize_emp_id(str(raw).strip()) for raw in {rec.get('EmpID', '') for rec in cleaned_data}}
+        dates = {raw: parse_date(raw) for raw in {rec.get('Date') for rec in cleaned_data}}
+        times = {
+            raw: format_time(raw)
+            for raw in {rec.get(field) for rec in cleaned_data for field in TIME_FIELDS.values()}
+        }
+        
+        records = {}
+        occurrences = Counter()
         for rec in cleaned_data:
-            # Normalize employee ID
-            raw_id = str(rec.get('EmpID', '')).strip()
-            emp_id = normalize_emp_id(raw_id)
-            
+            emp_id = emp_ids[rec.get('EmpID', '')]
             if not emp_id:
                 continue
             
-            # Parse date
-            date_val = rec.get('Date')
-            date_obj = parse_date(date_val)
-            
+            date_obj = dates[rec.get('Date')]
             if not date_obj:
-                logger.error(f"Could not parse date '{date_val}' for {emp_id}")
+                logger.error(f"Could not parse date '{rec.get('Date')}' for {emp_id}")
                 continue
             
-            # Check if record exists
-            existing = self.attendance_repo.get_by_emp_and_date(emp_id, date_obj)
-            
             # Prepare record data
-            record_data = {
-                "first_in": format_time(rec.get('First_In')),
-                "last_out": format_time(rec.get('Last_Out')),
-                "in_duration": format_time(rec.get('In_Duration')),
-                "out_duration": format_time(rec.get('Out_Duration')),
-                "total_duration": format_time(rec.get('Total_Duration')),
+            record_data = {column: times[rec.get(field)] for column, field in TIME_FIELDS.items()}
+            record_data.update({
                 "punch_records": rec.get('Punch_Records'),
                 "attendance_status": rec.get('Attendance'),
                 "employee_name": rec.get('Employee_Name'),
                 "source_file": source_filename
-            }
+            })
             
-            if existing:
-                # Update existing record
-                self.attendance_repo.update(existing, record_data)
-                updated_count += 1
-                logger.info(f"[UPDATE] {emp_id} | {date_obj} | In: {record_data['first_in']} | Out: {record_data['last_out']}")
+            key = (emp_id, date_obj)
+            if key in records:
+                records[key].update({k: v for k, v in record_data.items() if v is not None})
             else:
-                # Create new record
-                record_data.update({
-                    "emp_id": emp_id,
-                    "date": date_obj
-                })
-                self.attendance_repo.create(record_data)
-                saved_count += 1
-                logger.info(f"[INSERT] {emp_id} | {date_obj} | In: {record_data['first_in']} | Out: {record_data['last_out']}")
-        
-        return saved_count, updated_count
+                records[key] = record_data
+            occurrences[key] += 1
+        return records, occurrences
+    
+    @staticmethod
+    def _date_chunks(records: Dict, resume_after: Optional[date]) -> Iterator[Dict]:
+        """
+        Split collapsed records into commit chunks of whole dates
+        
+        Args:
+            records: (emp_id, date) -> record data
+            resume_after: Dates up to and including this one are skipped
+        
+        Yields:
+            Dictionaries of at least INGEST_COMMIT_ROWS records (except the last),
+            in date order
+        """
+        by_date = {}
+        for key in records:
+            if resume_after is None or key[1] > resume_after:
+                by_date.setdefault(key[1], []).append(key)
+        chunk = {}
+        for date_obj in sorted(by_date):
+            chunk.update((key, records[key]) for key in by_date[date_obj])
+            if len(chunk) >= INGEST_COMMIT_ROWS:
+                yield chunk
+                chunk = {}
+        if chunk:
+            yield chunk
+    
+    def _write_chunk(self, records: Dict, occurrences: Counter) -> tuple:
+        """
+        Write one chunk of collapsed records
+        
+        Args:
+            records: (emp_id, date) -> record data
+            occurrences: Number of source rows per (emp_id, date)
+        
+        Returns:
+            Tuple of (saved_count, updated_count, unchanged_count)
+        """
+        punches = self._evaluate_logged_days(records)
+        
+        # One query for every existing record in the chunk's date span (for the counts and
+        # fingerprints); the write itself is an upsert on (emp_id, date) so overlapping
+        # uploads stay idempotent
+        dates = [date_obj for _, date_obj in records]
+        existing = self.attendance_repo.get_fingerprints_in_date_range(min(dates), max(dates))
+        
+        rows = []
+        unchanged = set()
+        for (emp_id, date_obj), record_data in records.items():
+            fingerprint = self._content_fingerprint(record_data)
+            stored = existing.get((emp_id, date_obj))
+            if stored and stored[1] == fingerprint:
+                # Same content as this row's last ingest and not modified since: nothing to write
+                unchanged.add((emp_id, date_obj))
+                continue
+            logger.debug(f"[{'UPDATE' if stored else 'INSERT'}] {emp_id} | {date_obj} | In: {record_data['first_in']} | Out: {record_data['last_out']}")
+            rows.append({"emp_id": emp_id, "date": date_obj, **record_data, "content_hash": fingerprint})
+        
+        self.attendance_repo.upsert(rows)
+        self._replace_punches(
+            {key: day for key, day in punches.items() if key not in unchanged}, min(dates), max(dates)
+        )
+        if rows:
+            # Only dates and employee-months with a written row can have different totals
+            self.daily_summary.refresh_dates(row["date"] for row in rows)
+            self.monthly_rollup.refresh_days((row["emp_id"], row["date"]) for row in rows)
+        
+        # Repeated rows of a day count with its outcome (beyond the first insert of a new day)
+        saved_count = sum(1 for key in records if key not in existing)
+        unchanged_count = sum(occurrences[key] for key in unchanged)
+        updated_count = sum(occurrences[key] for key in records) - saved_count - unchanged_count
+        return saved_count, updated_count, unchanged_count
+    
+    @staticmethod
+    def _content_fingerprint(record_data: Dict) -> str:
+        """
+        Fingerprint of a record's ingested fields. source_file is left out so
+        the same day re-exported in another file still compares equal.
+        """
+        content = repr(sorted((k, v) for k, v in record_data.items() if k != "source_file"))
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+    
+    def _evaluate_logged_days(self, records: Dict) -> Dict:
+        """
+        Pair the punches of every record that carries a punch log and apply the
+        status rules, filling office time and attendance_status in place.
+        Records without a log (e.g. monthly reports) keep the report's status
+        and get NULL office time, so the upsert keeps any stored values.
+        
+        Args:
+            records: (emp_id, date) -> record data
+        
+        Returns:
+            (emp_id, date) -> list of (minute, direction) for the logged records
+        """
+        punches = {
+            key: parse_punch_log(data["punch_records"])
+            for key, data in records.items() if data["punch_records"] is not None
+        }
+        for data in records.values():
+            data.update(office_minutes=None, break_minutes=None, unmatched_punches=None)
+        if not punches:
+            return punches
+        
+        keys = list(punches)
+        office = office_time_for_logs([punches[key] for key in keys])
+        status = evaluate_status(
+            pd.Series([to_minutes(records[key]["in_duration"]) for key in keys], dtype="float64"),
+            pd.Series([len(punches[key]) for key in keys]),
+            office["office_minutes"]
+        )
+        for key, day, day_status in zip(keys, office.to_dict("records"), status):
+            records[key].update({column: int(value) for column, value in day.items()})
+            records[key]["attendance_status"] = day_status
+        return punches
+    
+    def _replace_punches(self, punches: Dict, start_date: date, end_date: date) -> None:
+        """
+        Rewrite attendance_punches for the records that carry a punch log.
+        Records without one keep their stored punches, as they keep their
+        stored punch_records.
+        
+        Args:
+            punches: (emp_id, date) -> list of (minute, direction), already upserted
+            start_date: First date in the file
+            end_date: Last date in the file
+        """
+        if not punches:
+            return
+        # The upsert does not return IDs; one range query maps the keys back to rows
+        attendance_ids = self.attendance_repo.get_ids_in_date_range(start_date, end_date)
+        punch_count = self.punch_repo.replace_for_attendance({
+            attendance_ids[key]: day for key, day in punches.items()
+        })
+        logger.info(f"[INFO] Stored {punch_count} punches for {len(punches)} attendance days")
     
     def get_attendance_records(self, user: Employee) -> List:
         """
@@ -226,36 +518,327 @@ class AttendanceService:
             records = self.attendance_repo.get_by_emp_id(user.emp_id)
         else:
             records = self.attendance_repo.get_all()
-            
+        
         # Enrich and flatten for frontend
-        result = []
-        for r in records:
-            data = {c.name: getattr(r, c.name) for c in r.__table__.columns}
-            # Support both date objects and ISO strings
-            if isinstance(data['date'], (date, datetime)):
-                data['date'] = data['date'].isoformat()
-            
-            # Resolve name (owner relationship takes priority)
-            data['employee_name'] = (r.owner.full_name if r.owner else None) or r.employee_name
-            result.append(data)
-            
-        return result
+        return [self._record_to_dict(r, r.owner.full_name if r.owner else None) for r in records]
+    
+    def list_attendance_records(
+        self,
+        user: Employee,
+        limit: int,
+        cursor: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        emp_id: Optional[str] = None,
+        status: Optional[str] = None,
+        name: Optional[str] = None
+    ) -> Dict:
+        """
+        Get one page of attendance records, newest first
+        
+        Employees only ever see their own records, whatever emp_id they pass.
+        
+        Args:
+            user: Requesting user
+            limit: Page size
+            cursor: next_cursor of the previous page
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            emp_id: Only this employee's records
+            status: Only records with this attendance status
+            name: Case-insensitive part of the employee's name
+        
+        Returns:
+            Dictionary with items and next_cursor (None on the last page)
+        
+        Raises:
+            HTTPException: If the date range is empty or the cursor is invalid
+        """
+        if start_date and end_date and start_date > end_date:
+            raise HTTPException(status_code=400, detail="Start date cannot be after end date")
+        if user.role == UserRole.EMPLOYEE:
+            emp_id = user.emp_id
+        elif emp_id:
+            emp_id = normalize_emp_id(emp_id)
+        
+        rows = self.attendance_repo.get_page(
+            limit + 1,
+            after=self._decode_cursor(cursor) if cursor else None,
+            start_date=start_date,
+            end_date=end_date,
+            emp_id=emp_id,
+            status=status,
+            name=name
+        )
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1][0]
+            next_cursor = self._encode_cursor(last.date, last.emp_id)
+        return {
+            "items": [self._record_to_dict(record, owner_name) for record, owner_name in page],
+            "next_cursor": next_cursor,
+            "limit": limit
+        }
+    
+    def get_dashboard(
+        self,
+        user: Employee,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        emp_id: Optional[str] = None,
+        name: Optional[str] = None
+    ) -> Dict:
+        """
+        Daily attendance counts and average hours for the dashboards
+        
+        Organisation-wide counts are read from the daily summaries; filtered
+        ones come from one GROUP BY over (date, status). Days that are not
+        Present are left out on Sundays and public holidays. Average hours
+        are over Present days, from the total duration (or the in-duration
+        where there is none). Employees only ever see their own records.
+        
+        Args:
+            user: Requesting user
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            emp_id: Only this employee's records
+            name: Case-insensitive part of the employee's name
+        
+        Returns:
+            Dictionary with days (present, absent, on_leave and avg_hours per
+            date, oldest first), summary (the same over the whole range),
+            latest (the last day or None) and employee (the only matching
+            employee or None)
+        
+        Raises:
+            HTTPException: If the date range is empty
+        """
+        if start_date and end_date and start_date > end_date:
+            raise HTTPException(status_code=400, detail="Start date cannot be after end date")
+        if user.role == UserRole.EMPLOYEE:
+            emp_id = user.emp_id
+        elif emp_id:
+            emp_id = normalize_emp_id(emp_id)
+        
+        if emp_id or name:
+            rows = self.attendance_repo.get_daily_status_totals(start_date, end_date, emp_id, name)
+        else:
+            # Organisation-wide counts come from the maintained per-date summaries
+            rows = self.daily_summary.get_status_totals(start_date, end_date)
+        totals = pd.DataFrame(rows, columns=["date", "status", "days", "minutes"])
+        if not totals.empty:
+            holidays = self.leave_repo.get_holiday_dates(start_date, end_date)
+            is_off_day = (pd.to_datetime(totals["date"]).dt.dayofweek == 6) | totals["date"].isin(list(holidays))
+            totals = totals[~is_off_day | (totals["status"] == STATUS_PRESENT)]
+        
+        daily = pd.DataFrame(index=pd.Index(sorted(totals["date"].unique()), name="date"))
+        for key, status in DASHBOARD_STATUSES.items():
+            # (date, status) is unique in the GROUP BY result
+            by_date = totals[totals["status"] == status].set_index("date")
+            daily[key] = by_date["days"].reindex(daily.index, fill_value=0).astype("int64")
+            if status == STATUS_PRESENT:
+                daily["present_minutes"] = by_date["minutes"].reindex(daily.index, fill_value=0).astype("int64")
+        
+        days = [
+            {
+                "date": day.isoformat(),
+                **{key: int(row[key]) for key in DASHBOARD_STATUSES},
+                "avg_hours": self._average_hours(row["present_minutes"], row["present"])
+            }
+            for day, row in daily.iterrows()
+        ]
+        summary = {key: int(daily[key].sum()) for key in DASHBOARD_STATUSES}
+        summary["avg_hours"] = self._average_hours(daily["present_minutes"].sum(), summary["present"])
+        summary["days"] = len(days)
+        
+        employee = None
+        if emp_id or name:
+            matches = self.attendance_repo.get_matching_employees(2, start_date, end_date, emp_id, name)
+            if len(matches) == 1:
+                employee = {"emp_id": matches[0][0], "name": matches[0][1]}
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "days": days,
+            "summary": summary,
+            "latest": days[-1] if days else None,
+            "employee": employee
+        }
+    
+    def get_monthly_rollups(self, user: Employee, emp_id: Optional[str] = None, year: Optional[int] = None) -> Dict:
+        """
+        Get an employee's attendance totals per month
+        
+        Employees only ever see their own months, whatever emp_id they pass.
+        
+        Args:
+            user: Requesting user
+            emp_id: Employee to look up (default: the requesting user)
+            year: Only this calendar year (default: every month)
+        
+        Returns:
+            Dictionary with emp_id, year and months (present, absent and
+            leave days, late arrivals and average in-office minutes per month)
+        
+        Raises:
+            HTTPException: If no employee is given or known
+        """
+        if user.role == UserRole.EMPLOYEE or not emp_id:
+            emp_id = user.emp_id
+        else:
+            emp_id = normalize_emp_id(emp_id)
+        if not emp_id:
+            raise HTTPException(status_code=400, detail="emp_id is required")
+        return {
+            "emp_id": emp_id,
+            "year": year,
+            "months": self.monthly_rollup.get_for_employee(emp_id, year)
+        }
+    
+    def export_attendance(
+        self,
+        user: Employee,
+        export_format: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        emp_id: Optional[str] = None,
+        status: Optional[str] = None,
+        name: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Export attendance records as NDJSON or CSV, oldest first
+        
+        Filters are checked before anything is read; the returned iterator
+        then reads and formats EXPORT_BATCH_ROWS rows at a time, so a full
+        year streams in constant memory. Employees only ever export their
+        own records, whatever emp_id they pass.
+        
+        Args:
+            user: Requesting user
+            export_format: 'ndjson' (one JSON object per line) or 'csv' (with header)
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            emp_id: Only this employee's records
+            status: Only records with this attendance status
+            name: Case-insensitive part of the employee's name
+        
+        Returns:
+            Iterator of text chunks
+        
+        Raises:
+            HTTPException: If the format is unknown or the date range is empty
+        """
+        if export_format not in EXPORT_MEDIA_TYPES:
+            raise HTTPException(status_code=400, detail=f"Unsupported export format: {export_format}")
+        if start_date and end_date and start_date > end_date:
+            raise HTTPException(status_code=400, detail="Start date cannot be after end date")
+        if user.role == UserRole.EMPLOYEE:
+            emp_id = user.emp_id
+        elif emp_id:
+            emp_id = normalize_emp_id(emp_id)
+        
+        rows = self.attendance_repo.iter_export_rows(
+            EXPORT_COLUMNS,
+            EXPORT_BATCH_ROWS,
+            start_date=start_date,
+            end_date=end_date,
+            emp_id=emp_id,
+            status=status,
+            name=name
+        )
+        fields = EXPORT_COLUMNS + ["employee_name"]
+        if export_format == "csv":
+            return self._csv_chunks(fields, rows)
+        return self._ndjson_chunks(fields, rows)
+    
+    @staticmethod
+    def _ndjson_chunks(fields: List[str], rows: Iterator[Tuple]) -> Iterator[str]:
+        """Format rows as NDJSON, EXPORT_BATCH_ROWS lines per chunk"""
+        lines = []
+        for row in rows:
+            record = dict(zip(fields, row))
+            record["date"] = record["date"].isoformat()
+            lines.append(json.dumps(record) + "\n")
+            if len(lines) >= EXPORT_BATCH_ROWS:
+                yield "".join(lines)
+                lines = []
+        if lines:
+            yield "".join(lines)
+    
+    @staticmethod
+    def _csv_chunks(fields: List[str], rows: Iterator[Tuple]) -> Iterator[str]:
+        """Format rows as CSV with a header line, EXPORT_BATCH_ROWS lines per chunk"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        pending = 0
+        for row in rows:
+            writer.writerow(row)
+            pending += 1
+            if pending >= EXPORT_BATCH_ROWS:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        yield buffer.getvalue()
+    
+    @staticmethod
+    def _average_hours(minutes: int, days: int) -> float:
+        """Average hours per day, 0 without days"""
+        return round(int(minutes) / days / 60, 2) if days else 0.0
+    
+    @staticmethod
+    def _record_to_dict(record, owner_name: Optional[str]) -> Dict:
+        """Flatten an attendance record for the frontend"""
+        data = {c.name: getattr(record, c.name) for c in record.__table__.columns}
+        # Support both date objects and ISO strings
+        if isinstance(data['date'], (date, datetime)):
+            data['date'] = data['date'].isoformat()
+        
+        # Resolve name (owner's name takes priority)
+        data['employee_name'] = owner_name or record.employee_name
+        return data
+    
+    @staticmethod
+    def _encode_cursor(record_date: date, emp_id: str) -> str:
+        """Opaque page cursor for the key (date, emp_id)"""
+        return base64.urlsafe_b64encode(f"{record_date.isoformat()}|{emp_id}".encode()).decode()
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[date, str]:
+        """
+        Key (date, emp_id) of a page cursor
+        
+        Raises:
+            HTTPException: If the cursor is malformed
+        """
+        try:
+            record_date, emp_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+            return date.fromisoformat(record_date), emp_id
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
     
     def update_attendance_record(
         self,
         attendance_id: int,
-        update_data: Dict
+        update_data: Dict,
+        corrected_by: Optional[str] = None
     ) -> Dict:
         """
         Update attendance record
         
+        The record is flagged as manually corrected, so status recomputes
+        leave it alone.
+        
         Args:
             attendance_id: Attendance record ID
             update_data: Fields to update
-            
+            corrected_by: Email of the admin making the correction
+        
         Returns:
             Updated record data
-            
+        
         Raises:
             HTTPException: If record not found
         """
@@ -265,21 +848,23 @@ class AttendanceService:
             raise HTTPException(status_code=404, detail="Attendance record not found")
         
         # Update record
-        self.attendance_repo.update(record, update_data)
+        self.attendance_repo.update(record, {**update_data, "is_manually_corrected": True, "corrected_by": corrected_by})
+        self.daily_summary.refresh(record.date, record.date)
+        self.monthly_rollup.refresh(record.date, record.date, [record.emp_id])
         self.attendance_repo.commit()
         
         return {"message": "Attendance record updated successfully"}
-
+    
     def delete_attendance_record(self, attendance_id: int) -> Dict:
         """
         Delete attendance record
         
         Args:
             attendance_id: Attendance record ID
-            
+        
         Returns:
             Success message
-            
+        
         Raises:
             HTTPException: If record not found
         """
@@ -287,7 +872,10 @@ class AttendanceService:
         if not record:
             raise HTTPException(status_code=404, detail="Attendance record not found")
         
+        record_date, emp_id = record.date, record.emp_id
         self.attendance_repo.delete(record)
+        self.daily_summary.refresh(record_date, record_date)
+        self.monthly_rollup.refresh(record_date, record_date, [emp_id])
         self.attendance_repo.commit()
         
         return {"message": "Attendance record deleted successfully"}
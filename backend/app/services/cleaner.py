@@ -1,125 +1,305 @@
-import pandas as pd
-import io
+import os
 import re
-import logging
-from datetime import datetime
+import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import chain
+from typing import Iterable, Iterator, Optional
+
+from app.utils.date_utils import PUNCH_SEPARATOR, to_minutes
+
+# Bump whenever cleaner output changes so previously ingested files are re-parsed
+CLEANER_VERSION = "2"
+
+# Layout of the 'In Out Duration Report' employee rows (0-based column positions)
+COL_SNO = 1
+COL_EMP_ID = 3
+COL_EMP_NAME = 5
+COL_IN_DURATION = 7
+COL_OUT_DURATION = 8
+COL_PUNCH_RECORDS = 10
+
+DATE_HEADER_MARKER = 'Attendance Date-'
+# Part of the marker that always sits inside a single cell
+DATE_HEADER_CELL_MARKER = 'Date-'
+DATE_PATTERNS = (
+    r'(\d{1,2}[-/][A-Za-z]{3}[-/]\d{4})',   # 01-Jan-2026
+    r'(\d{1,2}[-/]\d{1,2}[-/]\d{4})',        # 01/01/2026
+)
+NO_PUNCH = "--:--"
+ABSENT_DURATIONS = ['00:00', '0:00', '', 'nan', 'none', 'nil', '-']
+
+# Config: processes cleaning the sections of one sheet in parallel (1 = in-process, 0 = one per CPU).
+# Off by default: starting a pool only pays off for very large single-file reports.
+SECTION_WORKERS = int(os.getenv("PARSE_SECTION_WORKERS", "1")) or os.cpu_count() or 1
+# Rows of whole sections handed to a section worker at a time
+SECTION_BATCH_ROWS = 2000
 
-logger = logging.getLogger(__name__)
+def cell_text(col: pd.Series) -> pd.Series:
+    """str(value).strip() for every cell of a column ('nan' for empty cells)"""
+    return col.map(str).str.strip()
 
-def detect_and_clean_memory(file_content):
+def _to_minutes(ts: pd.Series) -> pd.Series:
     """
-    Simplified cleaner: Only supports the 'In Out Duration Report' format.
-    Returns (cleaned_data, detected_type)
+    Convert 'HH:MM' style strings to minutes past midnight (date_utils.to_minutes).
+    Tags such as '(in)' are ignored; anything unparseable counts as 0.
     """
+    # Reports repeat the same few hundred values, so parse each distinct one once
+    lookup = {value: to_minutes(value) or 0 for value in ts.unique()}
+    return ts.map(lookup).astype('int64')
+
+def _format_minutes(total: pd.Series) -> pd.Series:
+    """Format minute counts as 'HH:MM'"""
+    hours = (total // 60).astype(str).str.zfill(2)
+    minutes = (total % 60).astype(str).str.zfill(2)
+    return hours + ':' + minutes
+
+def _normalize_header_date(raw: str) -> str:
     try:
-        # Try reading as Excel first
-        try:
-            df_raw = pd.read_excel(io.BytesIO(file_content), header=None)
-        except:
-            # Fallback to CSV with tab/comma/semicolon detection
-            try:
-                df_raw = pd.read_csv(io.BytesIO(file_content), header=None, sep=None, engine='python')
-            except:
-                return None, "Invalid Format"
-
-        logger.info(f"Cleaner: Processing file with shape {df_raw.shape}")
-        
-        cleaned_data = []
-        current_attendance_date = None
-
-        for index, row in df_raw.iterrows():
-            row_list = [str(val).strip() if pd.notna(val) else "" for val in row.values]
-            row_str = " ".join(row_list)
-            
-            # 1. Capture Date from header (e.g., Attendance Date- 01-Jan-2026)
-            if 'Attendance Date-' in row_str:
-                date_match = re.search(r'(\d{1,2}[-/][A-Za-z]{3}[-/]\d{4})', row_str)
-                if not date_match:
-                    date_match = re.search(r'(\d{1,2}[-/]\d{1,2}[-/]\d{4})', row_str)
-                
-                if date_match:
-                    current_attendance_date = date_match.group(1)
-                    try:
-                        current_attendance_date = pd.to_datetime(current_attendance_date).strftime('%Y-%m-%d')
-                    except: pass
-                continue
-
-            # 2. Capture Employee Rows (Check if S.No is in Column 1 and is numeric)
-            if len(row) > 10:
-                sno_val = str(row[1]).strip()
-                if sno_val and sno_val.replace('.','',1).isdigit():
-                    try:
-                        if float(sno_val) > 0:
-                            emp_id_raw = str(row[3]).strip()       # Col 3
-                            emp_name = str(row[5]).strip()         # Col 5
-                            in_dur = str(row[7]).strip()           # Col 7 (In Duration)
-                            out_dur = str(row[8]).strip()          # Col 8 (Out Duration)
-                            punch_log = str(row[10]).strip()       # Col 10 (Punch Records)
-                            
-                            if not emp_id_raw or emp_id_raw.lower() == 'nan':
-                                continue
-
-                            # Parse First In / Last Out from Punches
-                            first_in, last_out = "--:--", "--:--"
-                            punch_count = 0
-                            if punch_log and punch_log.lower() != 'nan':
-                                # Strip tags like (in) or (out)
-                                clean_punches = re.sub(r'\(in\)|\(out\)', '', punch_log, flags=re.IGNORECASE)
-                                times = [t.strip() for t in clean_punches.split(',') if ':' in t]
-                                if times:
-                                    first_in = times[0]
-                                    last_out = times[-1]
-                                    punch_count = len(times)
-
-                            # Fallback if punches are empty but durations look like times
-                            if first_in == "--:--" and ":" in in_dur: first_in = in_dur
-                            if last_out == "--:--" and ":" in out_dur: last_out = out_dur
-
-                            # Calculate Total Duration (Actual Span between First In and Last Out)
-                            total_duration = "00:00"
-                            try:
-                                def to_min(ts):
-                                    if ':' not in str(ts): return 0
-                                    try:
-                                        # Handle cases like "10:02(in)" or just "10:02"
-                                        clean_ts = re.sub(r'\(.*?\)', '', str(ts)).strip()
-                                        h, m = map(int, clean_ts.split(':')[:2])
-                                        return h * 60 + m
-                                    except: return 0
-                                
-                                # Use span between First In and Last Out for "Total Office Duration"
-                                if first_in != "--:--" and last_out != "--:--":
-                                    span_min = to_min(last_out) - to_min(first_in)
-                                    if span_min < 0: span_min = 0 # Handle overnight if needed, but usually daily
-                                    total_duration = f"{span_min // 60:02d}:{span_min % 60:02d}"
-                                else:
-                                    # Fallback to sum of provided durations
-                                    total_min = to_min(in_dur) + to_min(out_dur)
-                                    total_duration = f"{total_min // 60:02d}:{total_min % 60:02d}"
-                            except: pass
-
-                            if not current_attendance_date:
-                                continue
-
-                            # Status logic: Present only if they have at least 4 punches (e.g., In-Out-In-Out)
-                            is_absent = in_dur.lower() in ['00:00', '0:00', '', 'nan', 'none', 'nil', '-']
-                            is_present = not is_absent and punch_count >= 4
-
-                            cleaned_data.append({
-                                'Date': current_attendance_date,
-                                'EmpID': emp_id_raw,
-                                'Employee_Name': emp_name,
-                                'In_Duration': in_dur,
-                                'Out_Duration': out_dur,
-                                'Total_Duration': total_duration,
-                                'First_In': first_in,
-                                'Last_Out': last_out,
-                                'Punch_Records': punch_log,
-                                'Attendance': 'Present' if is_present else 'Absent'
-                            })
-                    except: continue
-
-        return cleaned_data, "In/Out Duration Report"
-    except Exception as e:
-        logger.error(f"Cleaner Error: {e}")
-        return None, "Processing Error"
+        return pd.to_datetime(raw).strftime('%Y-%m-%d')
+    except Exception:
+        return raw
+
+def _section_dates(df_raw: pd.DataFrame, text: pd.DataFrame, section_date: Optional[str] = None) -> tuple:
+    """
+    Locate 'Attendance Date-' section headers and forward-fill their date
+    onto the rows that follow.
+
+    Args:
+        df_raw: Raw rows
+        text: Cell text of df_raw
+        section_date: Date of the section still open from the previous chunk
+
+    Returns:
+        Tuple of (is_header mask, attendance date per row)
+    """
+    row_str = reduce(
+        lambda left, right: left + ' ' + right,
+        (text[c].where(df_raw[c].notna(), '') for c in df_raw.columns)
+    )
+    is_header = row_str.str.contains(DATE_HEADER_MARKER, regex=False)
+    headers = row_str[is_header]
+
+    raw_dates = headers.str.extract(DATE_PATTERNS[0], expand=False)
+    for pattern in DATE_PATTERNS[1:]:
+        raw_dates = raw_dates.fillna(headers.str.extract(pattern, expand=False))
+
+    # pd.to_datetime once per distinct header date rather than once per section
+    raw_dates = raw_dates.dropna()
+    normalized = {raw: _normalize_header_date(raw) for raw in raw_dates.unique()}
+
+    dates = pd.Series(None, index=df_raw.index, dtype=object)
+    dates[raw_dates.index] = raw_dates.map(normalized)
+    dates = dates.ffill()
+    if section_date is not None:
+        dates = dates.fillna(section_date)
+    return is_header, dates
+
+def _punch_summary(punch_log: pd.Series) -> pd.DataFrame:
+    """First, last and count of timestamps in each 'HH:MM(in),HH:MM(out),...' log"""
+    has_log = (punch_log != '') & (punch_log.str.lower() != 'nan')
+    times = (
+        punch_log[has_log]
+        .str.replace(r'\(in\)|\(out\)', '', case=False, regex=True)
+        .str.split(PUNCH_SEPARATOR)
+        .explode()
+    )
+    times = times[times.str.contains(':', regex=False).fillna(False).astype(bool)].str.strip()
+    grouped = times.groupby(level=0)
+    summary = pd.DataFrame({
+        'first': grouped.first(),
+        'last': grouped.last(),
+        'count': grouped.size(),
+    }).reindex(punch_log.index)
+    return summary.fillna({'first': NO_PUNCH, 'last': NO_PUNCH, 'count': 0})
+
+def clean_in_out_duration_frame(df_raw: pd.DataFrame) -> list:
+    """
+    Column-oriented cleaning of a raw 'In Out Duration Report' sheet.
+
+    Args:
+        df_raw: Sheet read with header=None
+
+    Returns:
+        List of attendance record dictionaries
+    """
+    return _clean_in_out_chunk(df_raw, None)[0]
+
+def clean_in_out_duration_chunks(chunks: Iterable[pd.DataFrame]) -> list:
+    """
+    Clean an 'In Out Duration Report' sheet delivered as consecutive row chunks.
+    Only one chunk is held at a time; the open section date carries over.
+
+    Args:
+        chunks: Row chunks of the sheet (header=None, same columns in every chunk)
+
+    Returns:
+        List of attendance record dictionaries
+    """
+    if SECTION_WORKERS > 1:
+        return _clean_sections_in_parallel(chunks)
+    records = []
+    section_date = None
+    for chunk in chunks:
+        chunk_records, section_date = _clean_in_out_chunk(chunk, section_date)
+        records.extend(chunk_records)
+    return records
+
+def _header_row_date(values) -> Optional[str]:
+    """Raw date of one row if it is a dated section header (as _section_dates reads it)"""
+    row_str = ' '.join(str(v).strip() if pd.notna(v) else '' for v in values)
+    if DATE_HEADER_MARKER not in row_str:
+        return None
+    for pattern in DATE_PATTERNS:
+        match = re.search(pattern, row_str)
+        if match:
+            return match.group(1)
+    return None
+
+def _last_dated_header(df_raw: pd.DataFrame) -> Optional[int]:
+    """Row position of the last section header in df_raw that carries a date"""
+    values = df_raw.to_numpy(dtype=object)
+    # Scan upwards; sections are short, so this usually stops within a few rows
+    for position in range(len(values) - 1, -1, -1):
+        row = values[position]
+        # The marker can only be in a text cell; str() of any other value never holds it
+        if any(isinstance(v, str) and DATE_HEADER_CELL_MARKER in v for v in row) and _header_row_date(row):
+            return position
+    return None
+
+def _split_sections(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """
+    Regroup row chunks into batches of whole sections. Every batch except the
+    first starts at a dated section header, so no batch depends on the date
+    of the one before it.
+
+    Args:
+        chunks: Row chunks of the sheet
+
+    Yields:
+        Batches of at least SECTION_BATCH_ROWS rows (except the last), in sheet order
+    """
+    pending = []
+    pending_rows = 0
+    for chunk in chunks:
+        # The sequential cleaner ignores such chunks entirely, headers included
+        if len(chunk.columns) <= COL_PUNCH_RECORDS or chunk.empty:
+            continue
+        chunk = chunk.reset_index(drop=True)
+        pending.append(chunk)
+        pending_rows += len(chunk)
+        if pending_rows < SECTION_BATCH_ROWS:
+            continue
+        cut = _last_dated_header(chunk)
+        if cut is None or (cut == 0 and len(pending) == 1):
+            continue
+        yield pd.concat(pending[:-1] + [chunk.iloc[:cut]], ignore_index=True)
+        pending = [chunk.iloc[cut:]]
+        pending_rows = len(pending[0])
+    if pending:
+        yield pd.concat(pending, ignore_index=True)
+
+def _clean_sections_in_parallel(chunks: Iterable[pd.DataFrame]) -> list:
+    """
+    Clean batches of whole sections across SECTION_WORKERS processes. Output
+    is identical to the sequential cleaner; at most two batches per worker
+    are held at a time.
+
+    Args:
+        chunks: Row chunks of the sheet
+
+    Returns:
+        List of attendance record dictionaries, in sheet order
+    """
+    batches = _split_sections(chunks)
+    head = [batch for batch in (next(batches, None), next(batches, None)) if batch is not None]
+    if len(head) < 2:
+        # A single batch is not worth starting processes for
+        return clean_in_out_duration_frame(head[0]) if head else []
+
+    records = []
+    in_flight = deque()
+    with ProcessPoolExecutor(max_workers=SECTION_WORKERS) as pool:
+        for batch in chain(head, batches):
+            in_flight.append(pool.submit(clean_in_out_duration_frame, batch))
+            if len(in_flight) >= 2 * SECTION_WORKERS:
+                records.extend(in_flight.popleft().result())
+        while in_flight:
+            records.extend(in_flight.popleft().result())
+    return records
+
+def _clean_in_out_chunk(df_raw: pd.DataFrame, section_date: Optional[str]) -> tuple:
+    """
+    Clean consecutive rows of an 'In Out Duration Report' sheet
+
+    Args:
+        df_raw: Rows read with header=None
+        section_date: Date of the section open before these rows
+
+    Returns:
+        Tuple of (records, date of the section still open after these rows)
+    """
+    df_raw = df_raw.reset_index(drop=True)
+    # Employee rows need every column up to Punch Records
+    if len(df_raw.columns) <= COL_PUNCH_RECORDS or df_raw.empty:
+        return [], section_date
+
+    text = pd.DataFrame({c: cell_text(df_raw[c]) for c in df_raw.columns})
+
+    # 1. Capture Date from section headers (e.g., Attendance Date- 01-Jan-2026)
+    is_header, attendance_dates = _section_dates(df_raw, text, section_date)
+    if pd.notna(attendance_dates.iloc[-1]):
+        section_date = attendance_dates.iloc[-1]
+
+    # 2. Employee rows: positive numeric S.No, an Employee Code and a known date
+    sno = text[COL_SNO]
+    sno_is_number = sno.str.replace('.', '', n=1, regex=False).str.isdigit() & (sno != '')
+    sno_value = pd.to_numeric(sno.where(sno_is_number), errors='coerce')
+    emp_id = text[COL_EMP_ID]
+    is_employee = (
+        ~is_header
+        & (sno_value > 0)
+        & (emp_id != '') & (emp_id.str.lower() != 'nan')
+        & attendance_dates.notna()
+    )
+    rows = text[is_employee]
+    if rows.empty:
+        return [], section_date
+
+    in_dur = rows[COL_IN_DURATION]
+    out_dur = rows[COL_OUT_DURATION]
+    punch_log = rows[COL_PUNCH_RECORDS]
+
+    # Parse First In / Last Out from Punches
+    punches = _punch_summary(punch_log)
+    first_in, last_out = punches['first'], punches['last']
+
+    # Fallback if punches are empty but durations look like times
+    first_in = first_in.mask((first_in == NO_PUNCH) & in_dur.str.contains(':', regex=False), in_dur)
+    last_out = last_out.mask((last_out == NO_PUNCH) & out_dur.str.contains(':', regex=False), out_dur)
+
+    # Total Duration: span between First In and Last Out, else the sum of provided durations
+    has_span = (first_in != NO_PUNCH) & (last_out != NO_PUNCH)
+    span_min = (_to_minutes(last_out) - _to_minutes(first_in)).clip(lower=0)
+    total_min = _to_minutes(in_dur) + _to_minutes(out_dur)
+    total_duration = _format_minutes(span_min.where(has_span, total_min))
+
+    # Status logic: Present only if they have at least 4 punches (e.g., In-Out-In-Out)
+    is_absent = in_dur.str.lower().isin(ABSENT_DURATIONS)
+    is_present = ~is_absent & (punches['count'] >= 4)
+
+    cleaned = pd.DataFrame({
+        'Date': attendance_dates[is_employee],
+        'EmpID': emp_id[is_employee],
+        'Employee_Name': rows[COL_EMP_NAME],
+        'In_Duration': in_dur,
+        'Out_Duration': out_dur,
+        'Total_Duration': total_duration,
+        'First_In': first_in,
+        'Last_Out': last_out,
+        'Punch_Records': punch_log,
+        'Attendance': is_present.map({True: 'Present', False: 'Absent'}),
+    })
+    columns = list(cleaned.columns)
+    return [dict(zip(columns, values)) for values in zip(*(cleaned[c].tolist() for c in columns))], section_date
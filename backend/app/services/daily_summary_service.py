@@ -0,0 +1,125 @@
+"""
+Daily Summary Service
+Maintains attendance_daily_summary, the per-date attendance counts behind
+the organisation-wide dashboard.
+
+Every attendance write (ingestion, manual corrections, leave sync, status
+recomputes) refreshes the summaries of the dates it changed from one
+GROUP BY over those dates, inside the writer's own transaction. Dashboards
+then read at most one row per date instead of scanning attendance.
+"""
+import logging
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.repositories.attendance_repository import AttendanceRepository
+from app.repositories.attendance_summary_repository import AttendanceSummaryRepository
+from app.models.models import get_ist_now
+from app.services.status_rules import STATUS_ABSENT, STATUS_ON_LEAVE, STATUS_PRESENT
+
+logger = logging.getLogger(__name__)
+
+# Dates per refresh query when refreshing a date set (bound parameters; MSSQL allows 2100)
+REFRESH_DATE_BATCH = 1000
+
+class DailySummaryService:
+    """Refreshes and reads per-date attendance summaries"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.attendance_repo = AttendanceRepository(db)
+        self.summary_repo = AttendanceSummaryRepository(db)
+    
+    def refresh(self, start_date: date, end_date: date) -> int:
+        """
+        Recompute the summaries of a date range from the attendance rows.
+        Pending ORM changes are flushed first; the caller commits.
+        
+        Args:
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+        
+        Returns:
+            Number of dates with a summary
+        """
+        self.db.flush()
+        summaries = self._summarise(self.attendance_repo.get_daily_status_totals(start_date, end_date))
+        self.summary_repo.replace_range(start_date, end_date, summaries)
+        logger.debug(f"Daily summary refreshed for {start_date}..{end_date}: {len(summaries)} dates")
+        return len(summaries)
+    
+    def refresh_dates(self, dates: Iterable[date]) -> int:
+        """
+        Recompute the summaries of the given dates only.
+        Pending ORM changes are flushed first; the caller commits.
+        
+        Args:
+            dates: Dates whose attendance rows changed
+        
+        Returns:
+            Number of dates with a summary
+        """
+        dates = sorted(set(dates))
+        if not dates:
+            return 0
+        self.db.flush()
+        summarised = 0
+        for i in range(0, len(dates), REFRESH_DATE_BATCH):
+            batch = dates[i:i + REFRESH_DATE_BATCH]
+            summaries = self._summarise(self.attendance_repo.get_daily_status_totals(dates=batch))
+            self.summary_repo.replace_dates(batch, summaries)
+            summarised += len(summaries)
+        logger.debug(f"Daily summary refreshed for {len(dates)} dates ({dates[0]}..{dates[-1]}): {summarised} with rows")
+        return summarised
+    
+    @staticmethod
+    def _summarise(totals: List[Tuple[date, Optional[str], int, int]]) -> List[dict]:
+        """Fold (date, status, count, minutes) totals into one summary row per date"""
+        per_date = {}
+        for record_date, status, count, minutes in totals:
+            summary = per_date.setdefault(record_date, {
+                "date": record_date, "present": 0, "absent": 0, "on_leave": 0,
+                "total": 0, "present_minutes": 0, "avg_minutes": None, "updated_at": get_ist_now()
+            })
+            summary["total"] += count
+            if status == STATUS_PRESENT:
+                summary["present"] = count
+                summary["present_minutes"] = minutes
+                summary["avg_minutes"] = minutes / count
+            elif status == STATUS_ABSENT:
+                summary["absent"] = count
+            elif status == STATUS_ON_LEAVE:
+                summary["on_leave"] = count
+        return list(per_date.values())
+    
+    def get_status_totals(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[Tuple[date, Optional[str], int, int]]:
+        """
+        Per-date status counts from the summaries, in the shape of
+        AttendanceRepository.get_daily_status_totals (statuses other than
+        Present / Absent / On Leave are reported together as None)
+        
+        Args:
+            start_date: First date (inclusive, default: no limit)
+            end_date: Last date (inclusive, default: no limit)
+        
+        Returns:
+            List of (date, status, day count, worked minutes), ordered by date
+        """
+        rows = []
+        for summary in self.summary_repo.get_in_date_range(start_date, end_date):
+            other = summary.total - summary.present - summary.absent - summary.on_leave
+            for status, count, minutes in (
+                (STATUS_PRESENT, summary.present, summary.present_minutes),
+                (STATUS_ABSENT, summary.absent, 0),
+                (STATUS_ON_LEAVE, summary.on_leave, 0),
+                (None, other, 0),
+            ):
+                if count:
+                    rows.append((summary.date, status, count, minutes))
+        return rows
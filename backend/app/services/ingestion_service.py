@@ -0,0 +1,289 @@
+"""
+Ingestion Service
+Queues attendance uploads as durable jobs and runs them in a worker process
+"""
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, UploadFile
+from typing import Dict, List, Optional
+import logging
+import time
+
+from app.repositories.ingestion_job_repository import IngestionJobRepository
+from app.models.models import Employee, IngestionJob, JobStatus, get_ist_now
+from app.services.attendance_service import AttendanceService, IngestCheckpoint
+from app.services.parse_pool import parse_files
+from app.core.upload_storage import (
+    UPLOAD_MAX_FILE_MB, UPLOAD_MAX_REQUEST_MB, StoredUpload, discard_upload, store_upload_stream
+)
+
+logger = logging.getLogger(__name__)
+
+class IngestionService:
+    """Handles attendance ingestion jobs"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.job_repo = IngestionJobRepository(db)
+    
+    def enqueue_uploads(self, files: List[UploadFile], admin: Employee, force: bool = False) -> List[IngestionJob]:
+        """
+        Stream uploaded files to storage and queue one ingestion job per file
+        
+        Files are copied in fixed-size chunks and hashed on the way. If any file
+        breaks the per-file or per-request size limit, nothing is queued.
+        
+        Args:
+            files: Uploaded files
+            admin: Admin user uploading the files
+            force: Reprocess even if an identical file was already ingested
+        
+        Returns:
+            Queued IngestionJobs, in upload order
+        
+        Raises:
+            HTTPException: 413 if a size limit is exceeded
+        """
+        file_limit = UPLOAD_MAX_FILE_MB * 1024 * 1024
+        request_left = UPLOAD_MAX_REQUEST_MB * 1024 * 1024
+        stored = []
+        try:
+            for file in files:
+                stage_start = time.perf_counter()
+                upload = store_upload_stream(file.file, file.filename, min(file_limit, request_left))
+                if upload is None:
+                    limit = f"{UPLOAD_MAX_FILE_MB} MB per-file" if file_limit <= request_left else f"{UPLOAD_MAX_REQUEST_MB} MB per-upload"
+                    raise HTTPException(status_code=413, detail=f"{file.filename} exceeds the {limit} limit")
+                request_left -= upload.size
+                stored.append((file.filename, upload, int((time.perf_counter() - stage_start) * 1000)))
+        except BaseException:
+            for _, upload, _ in stored:
+                discard_upload(upload.path)
+            raise
+        
+        return [self.enqueue_upload(filename, upload, admin, force, read_ms) for filename, upload, read_ms in stored]
+    
+    def enqueue_upload(
+        self,
+        filename: str,
+        upload: StoredUpload,
+        admin: Employee,
+        force: bool = False,
+        read_ms: Optional[int] = None
+    ) -> IngestionJob:
+        """
+        Queue a stored upload for ingestion
+        
+        Args:
+            filename: Original file name
+            upload: File already written to upload storage
+            admin: Admin user uploading the file
+            force: Reprocess even if an identical file was already ingested
+            read_ms: Time taken to receive and store the file
+        
+        Returns:
+            Queued IngestionJob
+        """
+        job = self.job_repo.create({
+            "filename": filename,
+            "file_hash": upload.file_hash,
+            "storage_path": upload.path,
+            "uploaded_by": admin.email,
+            "status": JobStatus.QUEUED.value,
+            "force": force,
+            "attempts": 0,
+            "read_ms": read_ms
+        })
+        self.job_repo.commit()
+        logger.info(f"Queued ingestion job {job.id} for {filename}")
+        return job
+    
+    def get_job_status(self, job_id: int) -> Dict:
+        """
+        Get progress of an ingestion job
+        
+        Raises:
+            HTTPException: If job not found
+        """
+        job = self.job_repo.get_by_id(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Ingestion job not found")
+        return self.job_to_dict(job)
+    
+    def cancel_job(self, job_id: int) -> Dict:
+        """
+        Cancel a queued or running ingestion job. A running job stops at its
+        next chunk commit; everything committed before that is kept.
+        
+        Raises:
+            HTTPException: 404 if job not found, 409 if it already finished
+        """
+        return self._transition(job_id, [JobStatus.QUEUED.value, JobStatus.RUNNING.value], JobStatus.CANCELLED.value)
+    
+    def resume_job(self, job_id: int) -> Dict:
+        """
+        Queue a cancelled or failed ingestion job again; it continues after
+        its last committed chunk
+        
+        Raises:
+            HTTPException: 404 if job not found, 409 if it is not resumable
+        """
+        return self._transition(job_id, [JobStatus.CANCELLED.value, JobStatus.FAILED.value], JobStatus.QUEUED.value)
+    
+    def _transition(self, job_id: int, from_statuses: List[str], to_status: str) -> Dict:
+        """Change a job's status, rejecting changes from any other status"""
+        if not self.job_repo.get_by_id(job_id):
+            raise HTTPException(status_code=404, detail="Ingestion job not found")
+        if not self.job_repo.transition(job_id, from_statuses, to_status):
+            raise HTTPException(status_code=409, detail=f"Job is not {' or '.join(from_statuses)}")
+        logger.info(f"Ingestion job {job_id} -> {to_status}")
+        job = self.job_repo.get_by_id(job_id)
+        self.db.refresh(job)
+        return self.job_to_dict(job)
+    
+    @staticmethod
+    def job_to_dict(job: IngestionJob) -> Dict:
+        """Flatten a job for API responses"""
+        return {
+            "id": job.id,
+            "filename": job.filename,
+            "file_hash": job.file_hash,
+            "status": job.status,
+            "skipped": job.skipped,
+            "attempts": job.attempts,
+            "detected_type": job.detected_type,
+            "records": job.records_count,
+            "saved": job.saved_count,
+            "updated": job.updated_count,
+            "unchanged": job.unchanged_count,
+            "error": job.error,
+            "checkpoint": {
+                "date": job.checkpoint_date,
+                "rows": job.checkpoint_rows
+            },
+            "timings": {
+                "read_ms": job.read_ms,
+                "parse_ms": job.parse_ms,
+                "write_ms": job.write_ms
+            },
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "heartbeat_at": job.heartbeat_at,
+            "finished_at": job.finished_at
+        }
+    
+    def run_jobs(self, jobs: List[IngestionJob]) -> None:
+        """
+        Ingest claimed jobs and record each outcome on its job
+        
+        Files are parsed in parallel by the parse pool, straight from upload
+        storage; database writes then run one file at a time in this process,
+        committed in chunks with the job's checkpoint. A failure only fails
+        its own job (a failure of the parse pool fails the whole batch), and a
+        retried job continues after its checkpoint.
+        
+        Args:
+            jobs: Jobs in RUNNING state
+        """
+        attendance_service = AttendanceService(self.db)
+        timings = {job.id: {} for job in jobs}
+        
+        # Identical files that were already ingested finish without being read or parsed
+        pending = []
+        for job in jobs:
+            prior = None if job.force else attendance_service.get_prior_ingest_result(job.file_hash, job.filename)
+            if prior:
+                self._record_result(job, prior, timings[job.id])
+            else:
+                pending.append(job)
+        jobs = pending
+        
+        try:
+            parsed_files = parse_files([(job.storage_path, job.file_hash) for job in jobs])
+        except Exception as e:
+            # The pool itself failed (e.g. a parse process was killed): fail the
+            # whole batch rather than leave it RUNNING; failed jobs can be resumed
+            logger.error(f"Parse pool failed for jobs {[job.id for job in jobs]}: {e}", exc_info=True)
+            parsed_files = [e] * len(jobs)
+        
+        # Jobs of the batch wait while earlier ones are written; every chunk keeps them all alive
+        batch_ids = [job.id for job in jobs]
+        for job, parsed in zip(jobs, parsed_files):
+            try:
+                if isinstance(parsed, Exception):
+                    raise parsed
+                result = attendance_service.process_file_content(
+                    job.filename,
+                    job.storage_path,
+                    job.file_hash,
+                    job.uploaded_by,
+                    timings=timings[job.id],
+                    parsed=parsed,
+                    force=job.force,
+                    checkpoint=self._checkpoint_of(job),
+                    on_checkpoint=lambda progress, job=job: self._save_checkpoint(job, progress, batch_ids)
+                )
+            except Exception as e:
+                logger.error(f"Ingestion job {job.id} failed: {e}", exc_info=True)
+                self.db.rollback()
+                result = {"status": "error", "reason": str(e)}
+            
+            self._record_result(job, result, timings[job.id])
+    
+    @staticmethod
+    def _checkpoint_of(job: IngestionJob) -> Optional[IngestCheckpoint]:
+        """Progress committed by an earlier run of the job, if any"""
+        if job.checkpoint_date is None:
+            return None
+        return IngestCheckpoint(
+            job.checkpoint_date,
+            job.checkpoint_rows or 0,
+            job.saved_count or 0,
+            job.updated_count or 0,
+            job.unchanged_count or 0
+        )
+    
+    def _save_checkpoint(self, job: IngestionJob, progress: IngestCheckpoint, batch_ids: List[int]) -> bool:
+        """
+        Stage a chunk's progress on the job, and a heartbeat on every job of
+        its batch (both committed with the chunk)
+        
+        Returns:
+            False if the job was cancelled meanwhile
+        """
+        job.checkpoint_date = progress.last_date
+        job.checkpoint_rows = progress.rows
+        job.saved_count = progress.saved
+        job.updated_count = progress.updated
+        job.unchanged_count = progress.unchanged
+        self.job_repo.heartbeat(batch_ids)
+        return self.job_repo.get_status(job.id) != JobStatus.CANCELLED.value
+    
+    def _record_result(self, job: IngestionJob, result: Dict, timings: Dict) -> None:
+        """
+        Store result counts, timings and final state on the job
+        
+        The final status is a conditional RUNNING -> terminal transition, so a
+        cancel that lands after the last checkpoint check is not overwritten.
+        """
+        if result.get("status") == "cancelled":
+            status = JobStatus.CANCELLED.value
+        elif result.get("status") == "success":
+            status = JobStatus.SUCCEEDED.value
+        else:
+            status = JobStatus.FAILED.value
+        job.skipped = bool(result.get("skipped"))
+        job.detected_type = result.get("type")
+        # A failed run keeps the counts of the chunks it committed
+        if "saved" in result:
+            job.records_count = result.get("records")
+            job.saved_count = result.get("saved")
+            job.updated_count = result.get("updated")
+            job.unchanged_count = result.get("unchanged")
+        job.error = str(result.get("reason"))[:2000] if status == JobStatus.FAILED.value else None
+        job.parse_ms = timings.get("parse_ms")
+        job.write_ms = timings.get("write_ms")
+        job.finished_at = get_ist_now()
+        # Commits the fields above together with the status change
+        self.job_repo.transition(job.id, [JobStatus.RUNNING.value], status)
+        self.db.refresh(job)
+        logger.info(f"Ingestion job {job.id} finished: {job.status}")
@@ -10,6 +10,8 @@ from typing import List, Dict
 from app.repositories.leave_repository import LeaveRepository
 from app.repositories.attendance_repository import AttendanceRepository
 from app.repositories.employee_repository import EmployeeRepository
+from app.services.daily_summary_service import DailySummaryService
+from app.services.monthly_rollup_service import MonthlyRollupService
 from app.models.models import Employee, UserRole
 
 class LeaveService:
@@ -20,6 +22,8 @@ class LeaveService:
         self.leave_repo = LeaveRepository(db)
         self.attendance_repo = AttendanceRepository(db)
         self.employee_repo = EmployeeRepository(db)
+        self.daily_summary = DailySummaryService(db)
+        self.monthly_rollup = MonthlyRollupService(db)
     
     def create_leave_type(self, type_data: dict) -> Dict:
         """
@@ -291,23 +295,22 @@ class LeaveService:
     
     def _sync_attendance_on_approval(self, request) -> None:
         """Mark attendance as 'On Leave' for approved dates"""
+        records = []
         curr = request.start_date
         while curr <= request.end_date:
             if curr.weekday() < 5:
-                existing = self.attendance_repo.get_by_emp_and_date(request.emp_id, curr)
-                
-                if existing:
-                    self.attendance_repo.update(existing, {"attendance_status": "On Leave"})
-                else:
-                    attendance_data = {
-                        "emp_id": request.emp_id,
-                        "date": curr,
-                        "attendance_status": "On Leave",
-                        "source_file": "LEAVE_MODULE"
-                    }
-                    self.attendance_repo.create(attendance_data)
-            
+                records.append({
+                    "emp_id": request.emp_id,
+                    "date": curr,
+                    "attendance_status": "On Leave",
+                    "source_file": "LEAVE_MODULE"
+                })
             curr += timedelta(days=1)
+        
+        # Existing days only get their status changed; missing days are created
+        self.attendance_repo.upsert(records, update_fields=["attendance_status"])
+        self.daily_summary.refresh(request.start_date, request.end_date)
+        self.monthly_rollup.refresh(request.start_date, request.end_date, [request.emp_id])
 
     def get_employee_summary(self, emp_id: str = None) -> Dict:
         """
@@ -0,0 +1,189 @@
+"""
+Monthly Detailed Report cleaner
+Turns the per-employee blocks of a 'Monthly Detailed Attendance Report' into
+the same daily record dicts the In/Out Duration cleaner produces.
+
+Each employee block is an 'Employee Code:-' row followed by one row per
+field ('In Time', 'Out Time', 'Duration', 'Status', ...) with a column per
+day. The report-level 'Days' row labels each day column ('22-Dec') and the
+title holds the covered range ('22-Dec-2025 To 31-Dec-2025').
+"""
+import pandas as pd
+from typing import Iterable
+
+from app.services.cleaner import cell_text
+from app.services.status_rules import STATUS_ABSENT, STATUS_HOLIDAY, STATUS_PRESENT, STATUS_WEEKLY_OFF
+
+# Layout (0-based column positions)
+COL_LABEL = 1
+COL_EMP_CODE = 6
+COL_EMP_NAME = 18
+
+EMPLOYEE_LABEL = 'Employee Code:-'
+DAYS_LABEL = 'Days'
+FIELD_LABELS = {
+    'In Time': 'First_In',
+    'Out Time': 'Last_Out',
+    'Duration': 'Total_Duration',
+    'Status': 'Status',
+}
+# Report status code -> attendance status; any other code (A, ...) is Absent.
+# WOP = worked on a weekly off, WO = weekly off, H = holiday.
+REPORT_STATUSES = {
+    'P': STATUS_PRESENT,
+    'WOP': STATUS_PRESENT,
+    'WO': STATUS_WEEKLY_OFF,
+    'H': STATUS_HOLIDAY,
+}
+RANGE_PATTERN = r'(\d{1,2}-[A-Za-z]{3}-\d{4})\s+To\s+\d{1,2}-[A-Za-z]{3}-\d{4}'
+DAY_LABEL_PATTERN = r'^\d{1,2}-[A-Za-z]{3}$'
+HHMM_PATTERN = r'^(\d{1,2}:\d{2})'
+# In/Out Time of a day without that punch
+NO_TIME = '00:00'
+HEADER_ROWS = 15
+
+def _day_column_dates(text: pd.DataFrame) -> pd.Series:
+    """
+    Date of every day column, from the 'Days' row and the report range
+    
+    Returns:
+        Series indexed by column position (empty if the header is missing)
+    """
+    header = text.head(HEADER_ROWS).stack()
+    start = header.str.extract(RANGE_PATTERN, expand=False).dropna()
+    days_rows = text.index[text[COL_LABEL] == DAYS_LABEL]
+    if start.empty or days_rows.empty:
+        return pd.Series(dtype='datetime64[ns]')
+    
+    start = pd.to_datetime(start.iloc[0], format='%d-%b-%Y')
+    labels = text.loc[days_rows[0]].iloc[COL_LABEL + 1:]
+    labels = labels[labels.str.match(DAY_LABEL_PATTERN)]
+    dates = pd.to_datetime(labels + f'-{start.year}', format='%d-%b-%Y', errors='coerce').dropna()
+    # A range crossing New Year has January labels that belong to the next year
+    return dates.mask(dates < start, dates + pd.DateOffset(years=1))
+
+def _hhmm(values: pd.Series) -> pd.Series:
+    """Trim 'HH:MM:SS' to 'HH:MM'; cells without a time become None"""
+    hhmm = values.str.extract(HHMM_PATTERN, expand=False)
+    return hhmm.astype(object).where(hhmm.notna(), None)
+
+def _punch_time(values: pd.Series) -> pd.Series:
+    """In/Out Time as 'HH:MM'; the report's '00:00' for a missing punch becomes None"""
+    hhmm = _hhmm(values)
+    return hhmm.where(hhmm != NO_TIME, None)
+
+def clean_monthly_detailed_frame(df_raw: pd.DataFrame) -> list:
+    """
+    Column-oriented cleaning of a raw 'Monthly Detailed Attendance Report' sheet.
+    
+    The report has no punch log or in/out split, so Punch_Records, In_Duration
+    and Out_Duration are None, as are the times of punches the report lacks;
+    the upsert then keeps any values a daily report already stored for those
+    days. Weekly offs and holidays keep their own status instead of Absent.
+    
+    Args:
+        df_raw: Sheet read with header=None
+    
+    Returns:
+        List of attendance record dictionaries
+    """
+    return clean_monthly_detailed_chunks([df_raw])
+
+def clean_monthly_detailed_chunks(chunks: Iterable[pd.DataFrame]) -> list:
+    """
+    Clean a 'Monthly Detailed Attendance Report' sheet delivered as consecutive
+    row chunks. The header must be in the first chunk; an employee block cut
+    by a chunk boundary is held back and completed with the next chunk.
+    
+    Args:
+        chunks: Row chunks of the sheet (header=None, same columns in every chunk)
+    
+    Returns:
+        List of attendance record dictionaries
+    """
+    records = []
+    day_dates = None
+    pending = None  # Rows of the last block seen, which may continue in the next chunk
+    for chunk in chunks:
+        if len(chunk.columns) <= COL_EMP_NAME:
+            return []
+        frame = chunk if pending is None else pd.concat([pending, chunk], ignore_index=True)
+        frame = frame.reset_index(drop=True)
+        text = pd.DataFrame({c: cell_text(frame[c]) for c in frame.columns})
+        
+        if day_dates is None:
+            day_dates = _day_column_dates(text)
+            if day_dates.empty:
+                return []
+        
+        starts = text.index[text[COL_LABEL] == EMPLOYEE_LABEL]
+        if starts.empty:
+            # Rows above the first block are not needed; a block in progress keeps growing
+            pending = frame if pending is not None else None
+            continue
+        records.extend(_clean_blocks(text.iloc[:starts[-1]], day_dates))
+        pending = frame.iloc[starts[-1]:]
+    
+    if pending is not None:
+        text = pd.DataFrame({c: cell_text(pending[c]) for c in pending.columns})
+        records.extend(_clean_blocks(text.reset_index(drop=True), day_dates))
+    return records
+
+def _clean_blocks(text: pd.DataFrame, day_dates: pd.Series) -> list:
+    """
+    Clean complete employee blocks
+    
+    Args:
+        text: Cell text of the rows (rows above the first block are ignored)
+        day_dates: Date of every day column
+    
+    Returns:
+        List of attendance record dictionaries
+    """
+    # 1. Number the employee blocks and collect each block's code and name
+    label = text[COL_LABEL]
+    is_employee = label == EMPLOYEE_LABEL
+    block = is_employee.cumsum()
+    employees = pd.DataFrame({
+        'EmpID': text.loc[is_employee, COL_EMP_CODE].values,
+        'Employee_Name': text.loc[is_employee, COL_EMP_NAME].values,
+    }, index=block[is_employee].values)
+    
+    # 2. Field rows of every block -> one row per (block, day column) with a column per field
+    is_field = label.isin(list(FIELD_LABELS)) & (block > 0)
+    if not is_field.any():
+        return []
+    values = text.loc[is_field, list(day_dates.index)]
+    values.index = pd.MultiIndex.from_arrays(
+        [block[is_field], label[is_field].map(FIELD_LABELS)], names=['block', 'field']
+    )
+    values.columns.name = 'col'
+    cells = values.stack()
+    cells = cells[~cells.index.duplicated()]
+    days = cells.unstack('field').reindex(columns=list(FIELD_LABELS.values()), fill_value='')
+    days = days.reset_index()
+    
+    # 3. Keep days the report has a status for, belonging to an employee with a code
+    days = days.join(employees, on='block')
+    status = days['Status']
+    days = days[
+        (status != '') & (status.str.lower() != 'nan')
+        & (days['EmpID'] != '') & (days['EmpID'].str.lower() != 'nan')
+    ]
+    if days.empty:
+        return []
+    
+    cleaned = pd.DataFrame({
+        'Date': days['col'].map(day_dates.dt.strftime('%Y-%m-%d')),
+        'EmpID': days['EmpID'],
+        'Employee_Name': days['Employee_Name'],
+        'In_Duration': None,
+        'Out_Duration': None,
+        'Total_Duration': _hhmm(days['Total_Duration']),
+        'First_In': _punch_time(days['First_In']),
+        'Last_Out': _punch_time(days['Last_Out']),
+        'Punch_Records': None,
+        'Attendance': days['Status'].str.upper().map(REPORT_STATUSES).fillna(STATUS_ABSENT),
+    })
+    columns = list(cleaned.columns)
+    return [dict(zip(columns, values)) for values in zip(*(cleaned[c].tolist() for c in columns))]
@@ -0,0 +1,150 @@
+"""
+Monthly Rollup Service
+Maintains attendance_monthly_rollup, each employee's attendance totals per
+month (present, absent and leave days, late arrivals, average in-office
+minutes) for self-service profile and calendar views.
+
+Attendance writes refresh the months of the employees they changed, from
+one GROUP BY over those months and employees, inside the writer's own
+transaction; reading an employee's months is then a single index lookup.
+"""
+import calendar
+import logging
+import os
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.repositories.attendance_repository import AttendanceRepository
+from app.repositories.attendance_rollup_repository import AttendanceRollupRepository
+from app.models.models import get_ist_now
+from app.services.status_rules import STATUS_ABSENT, STATUS_HALF_DAY, STATUS_ON_LEAVE, STATUS_PRESENT
+from app.utils.date_utils import to_minutes
+
+logger = logging.getLogger(__name__)
+
+# Config: an attended day is a late arrival when its first in-punch is after this time
+LATE_AFTER_MINUTE = to_minutes(os.getenv("ATTENDANCE_LATE_AFTER", "09:30"))
+
+# Statuses of days the employee came in; late arrivals and office time count only these
+ATTENDED_STATUSES = (STATUS_PRESENT, STATUS_HALF_DAY)
+
+# Employees per refresh query when refreshing given employees (bound parameters; MSSQL allows 2100)
+REFRESH_EMP_BATCH = 1000
+
+# Rollup day column -> attendance status it counts
+DAY_COLUMNS = {
+    "present_days": STATUS_PRESENT,
+    "absent_days": STATUS_ABSENT,
+    "leave_days": STATUS_ON_LEAVE
+}
+
+class MonthlyRollupService:
+    """Refreshes and reads per-employee monthly attendance rollups"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.attendance_repo = AttendanceRepository(db)
+        self.rollup_repo = AttendanceRollupRepository(db)
+    
+    def refresh(self, start_date: date, end_date: date, emp_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Recompute the rollups of every month overlapping a date range.
+        Pending ORM changes are flushed first; the caller commits.
+        
+        Args:
+            start_date: First date (inclusive); its whole month is refreshed
+            end_date: Last date (inclusive); its whole month is refreshed
+            emp_ids: Only these employees' rollups (default: all employees)
+        
+        Returns:
+            Number of rollups written
+        """
+        self.db.flush()
+        start_month = start_date.replace(day=1)
+        end_month = end_date.replace(day=1)
+        last_day = end_date.replace(day=calendar.monthrange(end_date.year, end_date.month)[1])
+        
+        if emp_ids is None:
+            batches = [None]
+        else:
+            emp_ids = sorted(set(emp_ids))
+            batches = [emp_ids[i:i + REFRESH_EMP_BATCH] for i in range(0, len(emp_ids), REFRESH_EMP_BATCH)]
+        written = 0
+        for batch in batches:
+            totals = self.attendance_repo.get_monthly_status_totals(start_month, last_day, LATE_AFTER_MINUTE, batch)
+            rollups = self._roll_up(totals)
+            self.rollup_repo.replace_range(start_month, end_month, rollups, batch)
+            written += len(rollups)
+        logger.debug(f"Monthly rollups refreshed for {start_month:%Y-%m}..{end_month:%Y-%m}: {written} rows")
+        return written
+    
+    def refresh_days(self, days: Iterable[Tuple[str, date]]) -> int:
+        """
+        Recompute the rollups of the employee-months that contain the given
+        attendance days, one refresh per month.
+        Pending ORM changes are flushed first; the caller commits.
+        
+        Args:
+            days: (emp_id, date) of the attendance rows that changed
+        
+        Returns:
+            Number of rollups written
+        """
+        emp_ids_by_month = defaultdict(set)
+        for emp_id, record_date in days:
+            emp_ids_by_month[record_date.replace(day=1)].add(emp_id)
+        return sum(
+            self.refresh(month, month, emp_ids)
+            for month, emp_ids in sorted(emp_ids_by_month.items())
+        )
+    
+    @staticmethod
+    def _roll_up(totals: List[Tuple[str, int, int, Optional[str], int, int, int, int]]) -> List[dict]:
+        """Fold per-status monthly totals into one rollup row per employee and month"""
+        rollups = {}
+        for row_emp_id, year, month, status, days, late, office_minutes, office_days in totals:
+            rollup = rollups.setdefault((row_emp_id, year, month), {
+                "emp_id": row_emp_id, "month": date(year, month, 1),
+                **{column: 0 for column in DAY_COLUMNS},
+                "late_arrivals": 0, "office_minutes": 0, "office_days": 0,
+                "avg_office_minutes": None, "updated_at": get_ist_now()
+            })
+            for column, counted_status in DAY_COLUMNS.items():
+                if status == counted_status:
+                    rollup[column] = days
+            if status in ATTENDED_STATUSES:
+                rollup["late_arrivals"] += late
+                rollup["office_minutes"] += office_minutes
+                rollup["office_days"] += office_days
+        for rollup in rollups.values():
+            if rollup["office_days"]:
+                rollup["avg_office_minutes"] = rollup["office_minutes"] / rollup["office_days"]
+        return list(rollups.values())
+    
+    def get_for_employee(self, emp_id: str, year: Optional[int] = None) -> List[Dict]:
+        """
+        Get an employee's monthly rollups
+        
+        Args:
+            emp_id: Employee ID
+            year: Only this calendar year (default: every month)
+        
+        Returns:
+            List of monthly totals, oldest month first
+        """
+        start_month = date(year, 1, 1) if year else None
+        end_month = date(year, 12, 1) if year else None
+        return [
+            {
+                "month": rollup.month.strftime("%Y-%m"),
+                "present_days": rollup.present_days,
+                "absent_days": rollup.absent_days,
+                "leave_days": rollup.leave_days,
+                "late_arrivals": rollup.late_arrivals,
+                "avg_office_minutes": None if rollup.avg_office_minutes is None else round(rollup.avg_office_minutes, 1)
+            }
+            for rollup in self.rollup_repo.get_by_emp_id(emp_id, start_month, end_month)
+        ]
@@ -0,0 +1,137 @@
+"""
+Office Time Engine
+Pairs each attendance day's punches into in -> out intervals and stores the
+effective in-office minutes, break minutes and unmatched punch count on the
+attendance row.
+
+Pairing rules (applied to all days at once with array operations):
+- A punch tagged '(in)' / '(out)' keeps its direction; an untagged punch
+  alternates by position (1st in, 2nd out, ...)
+- An 'in' immediately followed by a later 'out' of the same day is an interval
+- Break time is the gap between one interval's 'out' and the next one's 'in'
+- Every other punch (double in, out without in, trailing in) is unmatched
+"""
+import logging
+from datetime import date
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.repositories.attendance_repository import AttendanceRepository
+from app.repositories.attendance_punch_repository import AttendancePunchRepository
+
+logger = logging.getLogger(__name__)
+
+# Attendance rows per recompute batch
+RECOMPUTE_BATCH_SIZE = 5000
+
+def compute_office_time(punches: pd.DataFrame, attendance_ids: Optional[List[int]] = None) -> pd.DataFrame:
+    """
+    Pair punches into intervals and total them per attendance day
+    
+    Args:
+        punches: Columns attendance_id, minute, direction; ordered by
+            attendance_id and punch order
+        attendance_ids: Days to report (default: the days in punches); days
+            without punches get zeros
+    
+    Returns:
+        DataFrame indexed by attendance_id with office_minutes,
+        break_minutes and unmatched_punches
+    """
+    ids = punches["attendance_id"].to_numpy()
+    minute = punches["minute"].to_numpy(dtype="int64")
+    direction = punches["direction"].to_numpy(dtype=object)
+    
+    # Untagged punches alternate in/out by their position within the day
+    position = punches.groupby("attendance_id", sort=False).cumcount().to_numpy()
+    is_in = np.where(pd.isna(direction), position % 2 == 0, direction == "in")
+    
+    # An interval starts at an 'in' whose next punch (same day, not earlier) is an 'out'
+    same_day_next = np.r_[ids[1:] == ids[:-1], False]
+    next_minute = np.r_[minute[1:], 0]
+    next_is_in = np.r_[is_in[1:], True]
+    starts = is_in & same_day_next & ~next_is_in & (next_minute >= minute)
+    matched = starts | np.r_[False, starts[:-1]]
+    
+    # Intervals, in order; a break runs from one interval's out to the next one's in
+    interval_ids = ids[starts]
+    interval_in = minute[starts]
+    interval_out = next_minute[starts]
+    same_day_interval = np.r_[interval_ids[1:] == interval_ids[:-1], False]
+    gap = np.r_[interval_in[1:], 0] - interval_out
+    breaks = np.where(same_day_interval, np.clip(gap, 0, None), 0)
+    
+    index = pd.unique(ids) if attendance_ids is None else attendance_ids
+    result = pd.DataFrame({
+        "office_minutes": pd.Series(interval_out - interval_in).groupby(interval_ids).sum(),
+        "break_minutes": pd.Series(breaks).groupby(interval_ids).sum(),
+        "unmatched_punches": pd.Series(~matched).groupby(ids).sum(),
+    }).reindex(index, fill_value=0)
+    result.index.name = "attendance_id"
+    return result.fillna(0).astype("int64")
+
+def office_time_for_logs(punch_logs: List[List[Tuple[int, Optional[str]]]]) -> pd.DataFrame:
+    """
+    Office time of freshly parsed punch logs
+    
+    Args:
+        punch_logs: One list of (minute, direction) per day, in log order
+    
+    Returns:
+        DataFrame with one row per log, in the same order (RangeIndex)
+    """
+    frame = pd.DataFrame(
+        [(position, minute, direction) for position, day in enumerate(punch_logs) for minute, direction in day],
+        columns=["attendance_id", "minute", "direction"]
+    )
+    return compute_office_time(frame, list(range(len(punch_logs)))).reset_index(drop=True)
+
+class OfficeTimeService:
+    """Computes and stores office time for attendance rows"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.attendance_repo = AttendanceRepository(db)
+        self.punch_repo = AttendancePunchRepository(db)
+    
+    def recompute(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> int:
+        """
+        Recompute office time from stored punches for every attendance row
+        with a punch log, in ID batches; each batch is committed
+        
+        Args:
+            start_date: First date (inclusive, default: no limit)
+            end_date: Last date (inclusive, default: no limit)
+        
+        Returns:
+            Number of attendance rows updated
+        """
+        last_id = 0
+        updated = 0
+        while True:
+            attendance_ids = self.attendance_repo.get_logged_ids_after(
+                last_id, RECOMPUTE_BATCH_SIZE, start_date, end_date
+            )
+            if not attendance_ids:
+                break
+            frame = pd.DataFrame(
+                self.punch_repo.get_for_attendance_ids(attendance_ids),
+                columns=["attendance_id", "minute", "direction"]
+            )
+            self._store(compute_office_time(frame, attendance_ids))
+            self.attendance_repo.commit()
+            updated += len(attendance_ids)
+            last_id = attendance_ids[-1]
+            logger.info(f"Office time recomputed for {updated} attendance rows")
+        return updated
+    
+    def _store(self, result: pd.DataFrame) -> None:
+        """Write computed office time onto the attendance rows"""
+        rows = result.reset_index().rename(columns={"attendance_id": "id"})
+        self.attendance_repo.bulk_update([
+            {column: int(value) for column, value in row.items()}
+            for row in rows.to_dict("records")
+        ])
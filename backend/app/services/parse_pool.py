@@ -0,0 +1,84 @@
+"""
+Parse Pool
+Runs the attendance cleaner for several files in parallel worker processes.
+pandas Excel parsing is CPU-bound and holds the GIL, so threads do not help.
+Only parsing happens here; database writes stay in the calling process.
+A single file is parsed in the calling process, where the In/Out Duration
+cleaner fans its sections out across processes instead.
+Workers get the stored file's path, never its bytes, and cleaner output is
+cached per file hash, so reprocessing a file skips both the read and the parse.
+"""
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Union
+
+from app.services import cleaner
+from app.services.cleaner import CLEANER_VERSION
+from app.services.report_parsers import parse_report
+from app.core.parse_cache import load_parsed, store_parsed
+
+logger = logging.getLogger(__name__)
+
+# Config: number of parse processes (0 = one per CPU)
+PARSE_WORKERS = int(os.getenv("INGESTION_PARSE_WORKERS", "0")) or os.cpu_count() or 1
+
+# (cleaned_data, detected_type, parse_ms)
+ParseResult = Tuple[list, str, int]
+
+def timed_parse(path: str, file_hash: str) -> ParseResult:
+    """
+    Run the cleaner on one stored file (or load its cached output) and measure how long it took
+    
+    Args:
+        path: Stored upload
+        file_hash: SHA-256 of the file content
+    """
+    start = time.perf_counter()
+    cached = load_parsed(file_hash, CLEANER_VERSION)
+    if cached:
+        cleaned_data, detected_type = cached
+        logger.info(f"Parse cache hit for {file_hash[:12]}")
+    else:
+        cleaned_data, detected_type = parse_report(path)
+        # Failed parses return None and are not cached
+        if cleaned_data is not None:
+            store_parsed(file_hash, CLEANER_VERSION, cleaned_data, detected_type)
+    return cleaned_data, detected_type, int((time.perf_counter() - start) * 1000)
+
+def _clean_sections_in_process() -> None:
+    """File pool workers already share the CPUs; they clean a file's sections themselves"""
+    cleaner.SECTION_WORKERS = 1
+
+def parse_files(files: List[Tuple[str, str]]) -> List[Union[ParseResult, Exception]]:
+    """
+    Parse several stored files, fanning out across the process pool
+    
+    Args:
+        files: (path, file_hash) per file
+    
+    Returns:
+        One entry per file, in input order: a ParseResult, or the exception
+        raised while parsing that file (other files are unaffected)
+    """
+    workers = min(PARSE_WORKERS, len(files))
+    if workers <= 1:
+        results = []
+        for path, file_hash in files:
+            try:
+                results.append(timed_parse(path, file_hash))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    logger.info(f"Parsing {len(files)} files across {workers} processes")
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_clean_sections_in_process) as pool:
+        futures = [pool.submit(timed_parse, path, file_hash) for path, file_hash in files]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+    return results
@@ -0,0 +1,278 @@
+"""
+Report Parsers
+Registry of attendance report layouts and the file formats they are read from.
+
+A file is handled in three steps, each picking exactly one implementation:
+1. sniff_file_format() looks at the first few KB (magic bytes / delimiter)
+2. that format's reader streams the first sheet as row chunks (header=None)
+3. the report parser whose title appears in the first chunk cleans the chunks;
+   a sheet without a known title is read as FALLBACK_REPORT, as before titles
+   were matched, and is an 'Unknown Report' only if that finds no records
+
+Only one chunk of rows is materialized as a DataFrame at a time, so the
+cleaner's memory use follows PARSE_CHUNK_ROWS rather than the file size.
+"""
+import os
+import csv
+import codecs
+import math
+import logging
+from collections import Counter
+from datetime import time
+from itertools import chain, islice
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import xlrd
+import openpyxl
+
+from app.services.cleaner import clean_in_out_duration_chunks
+from app.services.monthly_cleaner import clean_monthly_detailed_chunks
+
+logger = logging.getLogger(__name__)
+
+SNIFF_BYTES = 8192
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # Legacy .xls (Compound File)
+ZIP_MAGIC = b"PK\x03\x04"                          # .xlsx (Office Open XML)
+OTHER_OOXML_PARTS = (b"word/", b"ppt/")            # .docx / .pptx share the ZIP container
+CSV_DELIMITERS = ",;\t|"
+TEXT_ENCODINGS = ("utf-8-sig", "cp1252")
+TITLE_ROWS = 15  # Report titles sit above the data
+# Layout assumed for a sheet whose title is missing or further down
+FALLBACK_REPORT = "In/Out Duration Report"
+
+# Config: rows per chunk handed to the cleaner (the first chunk must hold the title rows)
+PARSE_CHUNK_ROWS = max(int(os.getenv("PARSE_CHUNK_ROWS", "5000")), TITLE_ROWS)
+
+class ReportParser(NamedTuple):
+    name: str                                           # Reported as detected_type
+    title: str                                          # Text identifying the report in its top rows
+    clean: Callable[[Iterable[pd.DataFrame]], list]     # Raw row chunks -> attendance records
+
+REPORT_PARSERS: List[ReportParser] = []
+
+def register_parser(parser: ReportParser) -> None:
+    """Add a report layout to the registry"""
+    REPORT_PARSERS.append(parser)
+
+# ----------------------------------------------------------------------------
+# File formats
+# ----------------------------------------------------------------------------
+
+def _text_encoding(head: bytes) -> Optional[str]:
+    """Encoding of a text file judged from its first bytes (None if binary)"""
+    if b"\x00" in head:
+        return None
+    for encoding in TEXT_ENCODINGS:
+        try:
+            # final=False: the head may end inside a multi-byte character
+            codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return None
+
+def _sniff_delimiter(head: bytes) -> Optional[str]:
+    """
+    Pick the delimiter that splits the most lines into the same number of
+    fields. csv.Sniffer is not used: punch logs hold comma-separated times,
+    which makes it prefer ',' for ';' and tab separated exports.
+    """
+    encoding = _text_encoding(head)
+    if not encoding:
+        return None
+    lines = codecs.getincrementaldecoder(encoding)().decode(head, final=False).splitlines()
+    if len(head) >= SNIFF_BYTES:
+        lines = lines[:-1]  # Cut off mid-line
+    lines = [line for line in lines if line.strip()]
+    best, best_rows = None, 1
+    for delimiter in CSV_DELIMITERS:
+        widths = Counter(len(row) for row in csv.reader(lines, delimiter=delimiter))
+        rows = max((n for width, n in widths.items() if width > 1), default=0)
+        if rows > best_rows:
+            best, best_rows = delimiter, rows
+    return best
+
+def sniff_file_format(head: bytes) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Identify a file's container format from its first bytes
+    
+    Args:
+        head: First SNIFF_BYTES of the file
+    
+    Returns:
+        (format, delimiter) where format is 'xls', 'xlsx' or 'delimited'
+        (delimiter only set for 'delimited'), or None if unrecognised
+    """
+    if head.startswith(OLE2_MAGIC):
+        return "xls", None
+    if head.startswith(ZIP_MAGIC):
+        if b"xl/" not in head and any(part in head for part in OTHER_OOXML_PARTS):
+            return None
+        return "xlsx", None
+    delimiter = _sniff_delimiter(head)
+    if delimiter:
+        return "delimited", delimiter
+    return None
+
+def _chunk_frame(rows: list, width: int) -> pd.DataFrame:
+    """Rows as an object DataFrame padded to the sheet width with empty (NaN) cells"""
+    # The DataFrame constructor would pad short rows with None, which reads as 'None'
+    rows = [row + [np.nan] * (width - len(row)) for row in rows]
+    return pd.DataFrame(rows, dtype=object).reindex(columns=range(width))
+
+def _xls_cell(value, cell_type: int, datemode: int):
+    """Convert an xlrd cell the way pandas.read_excel does"""
+    if cell_type in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK, xlrd.XL_CELL_ERROR) or value == "":
+        return np.nan
+    if cell_type == xlrd.XL_CELL_NUMBER:
+        if math.isfinite(value) and int(value) == value:
+            return int(value)
+    elif cell_type == xlrd.XL_CELL_DATE:
+        try:
+            value = xlrd.xldate.xldate_as_datetime(value, datemode)
+        except OverflowError:
+            return value
+        # Dates on the epoch are times of day
+        if value.timetuple()[0:3] in ((1899, 12, 31), (1904, 1, 1)):
+            return time(value.hour, value.minute, value.second, value.microsecond)
+    elif cell_type == xlrd.XL_CELL_BOOLEAN:
+        return bool(value)
+    return value
+
+def _read_xls(path: str, _) -> Iterator[pd.DataFrame]:
+    # on_demand: only the first sheet is loaded; the file itself is memory-mapped
+    book = xlrd.open_workbook(path, on_demand=True)
+    try:
+        sheet = book.sheet_by_index(0)
+        for start in range(0, sheet.nrows, PARSE_CHUNK_ROWS):
+            rows = [
+                [_xls_cell(v, t, book.datemode) for v, t in zip(sheet.row_values(i), sheet.row_types(i))]
+                for i in range(start, min(start + PARSE_CHUNK_ROWS, sheet.nrows))
+            ]
+            yield _chunk_frame(rows, sheet.ncols)
+    finally:
+        book.release_resources()
+
+def _xlsx_cell(cell):
+    """Convert an openpyxl cell the way pandas.read_excel does"""
+    if cell.value is None or cell.value == "" or cell.data_type == "e":
+        return np.nan
+    if cell.data_type == "n" and int(cell.value) == cell.value:
+        return int(cell.value)
+    return cell.value
+
+def _read_xlsx(path: str, _) -> Iterator[pd.DataFrame]:
+    # read_only streams rows from the sheet XML instead of building the whole workbook.
+    # Opened from a file object: given a path, openpyxl rejects names not ending in .xlsx
+    with open(path, "rb") as f:
+        book = openpyxl.load_workbook(f, read_only=True, data_only=True, keep_links=False)
+        try:
+            sheet = book.worksheets[0]
+            sheet.reset_dimensions()  # Stored dimensions can be wrong; read every row
+            rows_iter = sheet.iter_rows()
+            width = 0
+            while True:
+                rows = [[_xlsx_cell(cell) for cell in row] for row in islice(rows_iter, PARSE_CHUNK_ROWS)]
+                if not rows:
+                    break
+                width = max(width, max(len(row) for row in rows))
+                yield _chunk_frame(rows, width)
+        finally:
+            book.close()
+
+def _read_delimited(path: str, delimiter: str) -> Iterator[pd.DataFrame]:
+    # Title rows are narrower than data rows, so size the frame by the widest line.
+    # Delimiters inside quoted fields only add empty trailing columns.
+    separator = delimiter.encode()
+    with open(path, "rb") as f:
+        encoding = _text_encoding(f.read(SNIFF_BYTES))
+        f.seek(0)
+        width = max(line.count(separator) for line in f) + 1
+    with pd.read_csv(
+        path, header=None, sep=delimiter, names=range(width), dtype=object,
+        encoding=encoding, chunksize=PARSE_CHUNK_ROWS
+    ) as reader:
+        yield from reader
+
+FILE_READERS: Dict[str, Callable[[str, Optional[str]], Iterator[pd.DataFrame]]] = {
+    "xls": _read_xls,
+    "xlsx": _read_xlsx,
+    "delimited": _read_delimited,
+}
+
+# ----------------------------------------------------------------------------
+# Report layouts
+# ----------------------------------------------------------------------------
+
+def _title_text(df_raw: pd.DataFrame) -> str:
+    top = df_raw.head(TITLE_ROWS)
+    return " ".join(str(v) for v in top.to_numpy().ravel() if pd.notna(v)).lower()
+
+def match_report_parser(df_raw: pd.DataFrame) -> Optional[ReportParser]:
+    """Return the registered report parser whose title appears in the sheet's top rows"""
+    title_text = _title_text(df_raw)
+    for parser in REPORT_PARSERS:
+        if parser.title.lower() in title_text:
+            return parser
+    return None
+
+def _parser_named(name: str) -> ReportParser:
+    return next(parser for parser in REPORT_PARSERS if parser.name == name)
+
+def parse_report(path: str) -> Tuple[Optional[list], str]:
+    """
+    Sniff, read and clean an attendance report
+    
+    Args:
+        path: Stored upload; it is read from disk, never loaded whole
+    
+    Returns:
+        (cleaned_data, detected_type). cleaned_data is None when the file could
+        not be read or matched; detected_type then describes the failure.
+    """
+    with open(path, "rb") as f:
+        sniffed = sniff_file_format(f.read(SNIFF_BYTES))
+    if not sniffed:
+        return None, "Invalid Format"
+    file_format, delimiter = sniffed
+    
+    chunks = FILE_READERS[file_format](path, delimiter)
+    try:
+        try:
+            first = next(chunks, pd.DataFrame())
+        except Exception as e:
+            logger.error(f"Cleaner: could not read {file_format} file: {e}")
+            return None, "Invalid Format"
+        
+        parser = match_report_parser(first)
+        matched = parser is not None
+        if not matched:
+            parser = _parser_named(FALLBACK_REPORT)
+            logger.warning(f"Cleaner: no report title found in {file_format} file; trying {parser.name}")
+        
+        logger.info(f"Cleaner: {parser.name} ({file_format}), {PARSE_CHUNK_ROWS} rows per chunk")
+        try:
+            cleaned_data = parser.clean(chain([first], chunks))
+        except Exception as e:
+            logger.error(f"Cleaner Error ({parser.name}): {e}")
+            return None, "Processing Error" if matched else "Unknown Report"
+        if not matched and not cleaned_data:
+            logger.error(f"Cleaner: no report parser matches {file_format} file")
+            return None, "Unknown Report"
+        return cleaned_data, parser.name
+    finally:
+        chunks.close()
+
+register_parser(ReportParser(
+    name="In/Out Duration Report",
+    title="In Out Duration Report",
+    clean=clean_in_out_duration_chunks,
+))
+
+register_parser(ReportParser(
+    name="Monthly Detailed Report",
+    title="Monthly Detailed Attendance Report",
+    clean=clean_monthly_detailed_chunks,
+))
@@ -0,0 +1,157 @@
+"""
+Status Recompute Service
+Re-evaluates attendance_status with the current status rules over a date
+range, as an admin-requested job run by the ingestion worker
+"""
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from typing import Dict, Tuple
+from datetime import date
+import logging
+
+import pandas as pd
+
+from app.repositories.attendance_repository import AttendanceRepository
+from app.repositories.status_recompute_job_repository import StatusRecomputeJobRepository
+from app.models.models import Employee, JobStatus, StatusRecomputeJob, get_ist_now
+from app.services.status_rules import PROTECTED_STATUSES, evaluate_status
+from app.services.daily_summary_service import DailySummaryService
+from app.services.monthly_rollup_service import MonthlyRollupService
+
+logger = logging.getLogger(__name__)
+
+# Attendance rows per recompute batch (one read, one bulk update, one commit)
+RECOMPUTE_BATCH_SIZE = 5000
+
+class StatusRecomputeService:
+    """Handles attendance status recompute jobs"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.attendance_repo = AttendanceRepository(db)
+        self.job_repo = StatusRecomputeJobRepository(db)
+        self.daily_summary = DailySummaryService(db)
+        self.monthly_rollup = MonthlyRollupService(db)
+    
+    def enqueue(self, start_date: date, end_date: date, admin: Employee) -> Dict:
+        """
+        Queue a status recompute for a date range
+        
+        Args:
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            admin: Admin user requesting the recompute
+        
+        Returns:
+            Queued job
+        
+        Raises:
+            HTTPException: If the range is empty
+        """
+        if start_date > end_date:
+            raise HTTPException(status_code=400, detail="Start date cannot be after end date")
+        
+        job = self.job_repo.create({
+            "start_date": start_date,
+            "end_date": end_date,
+            "requested_by": admin.email,
+            "status": JobStatus.QUEUED.value
+        })
+        self.job_repo.commit()
+        logger.info(f"Queued status recompute job {job.id} for {start_date}..{end_date}")
+        return self.job_to_dict(job)
+    
+    def get_job_status(self, job_id: int) -> Dict:
+        """
+        Get progress of a status recompute job
+        
+        Raises:
+            HTTPException: If job not found
+        """
+        job = self.job_repo.get_by_id(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Status recompute job not found")
+        return self.job_to_dict(job)
+    
+    @staticmethod
+    def job_to_dict(job: StatusRecomputeJob) -> Dict:
+        """Flatten a job for API responses"""
+        return {
+            "id": job.id,
+            "start_date": job.start_date,
+            "end_date": job.end_date,
+            "status": job.status,
+            "rows_checked": job.rows_checked,
+            "rows_changed": job.rows_changed,
+            "error": job.error,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at
+        }
+    
+    def run_job(self, job: StatusRecomputeJob) -> None:
+        """
+        Run a claimed job and record its outcome
+        
+        Args:
+            job: Job in RUNNING state
+        """
+        try:
+            job.rows_checked, job.rows_changed = self.recompute(job.start_date, job.end_date)
+            job.status = JobStatus.SUCCEEDED.value
+            job.error = None
+        except Exception as e:
+            logger.error(f"Status recompute job {job.id} failed: {e}", exc_info=True)
+            self.db.rollback()
+            job.status = JobStatus.FAILED.value
+            job.error = str(e)[:2000]
+        job.finished_at = get_ist_now()
+        self.job_repo.commit()
+        logger.info(f"Status recompute job {job.id} finished: {job.status}")
+    
+    def recompute(self, start_date: date, end_date: date) -> Tuple[int, int]:
+        """
+        Re-evaluate the status of every attendance day with a punch log in a
+        date range. Rows are read in ID batches, evaluated as a whole and only
+        the changed ones are written, together with the daily summaries and
+        monthly rollups of their dates; each batch is committed. Manually corrected rows and
+        leave days are never touched.
+        
+        Args:
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+        
+        Returns:
+            Tuple of (rows checked, rows changed)
+        """
+        last_id = 0
+        checked = 0
+        changed = 0
+        while True:
+            rows = self.attendance_repo.get_status_inputs_after(
+                last_id, RECOMPUTE_BATCH_SIZE, start_date, end_date, PROTECTED_STATUSES
+            )
+            if not rows:
+                break
+            batch = pd.DataFrame(rows, columns=["id", "emp_id", "date", "status", "in_duration_min", "office_minutes", "punch_count"])
+            batch["new_status"] = evaluate_status(
+                batch["in_duration_min"].astype("float64"),
+                batch["punch_count"],
+                batch["office_minutes"].astype("float64")
+            )
+            updates = batch[batch["new_status"] != batch["status"]]
+            now = get_ist_now()
+            self.attendance_repo.bulk_update([
+                {"id": int(record_id), "attendance_status": status, "content_hash": None, "updated_at": now}
+                for record_id, status in zip(updates["id"], updates["new_status"])
+            ])
+            if not updates.empty:
+                self.daily_summary.refresh_dates(updates["date"])
+                self.monthly_rollup.refresh_days(zip(updates["emp_id"], updates["date"]))
+            self.attendance_repo.commit()
+            
+            checked += len(batch)
+            changed += len(updates)
+            last_id = int(batch["id"].iloc[-1])
+        logger.info(f"Status recompute {start_date}..{end_date}: {changed} of {checked} rows changed")
+        return checked, changed
@@ -0,0 +1,56 @@
+"""
+Attendance Status Rules
+Decides Present / Half Day / Absent for attendance days that have a punch log.
+
+Ingestion and the status recompute job both evaluate days through
+evaluate_status(), so changing a threshold only needs a recompute over the
+affected dates, not a re-upload of every file. The defaults reproduce the
+original rule: absent without an in-duration, present from 4 punches.
+"""
+import os
+
+import pandas as pd
+
+STATUS_PRESENT = "Present"
+STATUS_HALF_DAY = "Half Day"
+STATUS_ABSENT = "Absent"
+STATUS_ON_LEAVE = "On Leave"
+# Days off as reported by a monthly report; dashboards and rollups count them as neither present nor absent
+STATUS_WEEKLY_OFF = "Weekly Off"
+STATUS_HOLIDAY = "Holiday"
+
+# Statuses set by other modules (leave sync); rules never overwrite them
+PROTECTED_STATUSES = [STATUS_ON_LEAVE]
+
+# Config
+PRESENT_MIN_PUNCHES = int(os.getenv("ATTENDANCE_PRESENT_MIN_PUNCHES", "4"))
+PRESENT_MIN_MINUTES = int(os.getenv("ATTENDANCE_PRESENT_MIN_MINUTES", "0"))     # In-office minutes (0 = no minimum)
+HALF_DAY_MIN_PUNCHES = int(os.getenv("ATTENDANCE_HALF_DAY_MIN_PUNCHES", "2"))
+HALF_DAY_MIN_MINUTES = int(os.getenv("ATTENDANCE_HALF_DAY_MIN_MINUTES", "0"))   # 0 = half days disabled
+
+def evaluate_status(in_duration_min: pd.Series, punch_count: pd.Series, office_minutes: pd.Series) -> pd.Series:
+    """
+    Evaluate the status of many attendance days at once
+    
+    Args:
+        in_duration_min: In-duration from the report in minutes (NULL/0 = none)
+        punch_count: Number of punches in the day's log
+        office_minutes: In-office minutes from the office time engine
+    
+    Returns:
+        Series of STATUS_PRESENT / STATUS_HALF_DAY / STATUS_ABSENT, aligned with the inputs
+    """
+    has_duration = in_duration_min.fillna(0) > 0
+    office_minutes = office_minutes.fillna(0)
+    
+    is_present = has_duration & (punch_count >= PRESENT_MIN_PUNCHES) & (office_minutes >= PRESENT_MIN_MINUTES)
+    is_half_day = (
+        (HALF_DAY_MIN_MINUTES > 0)
+        & has_duration & ~is_present
+        & (punch_count >= HALF_DAY_MIN_PUNCHES)
+        & (office_minutes >= HALF_DAY_MIN_MINUTES)
+    )
+    status = pd.Series(STATUS_ABSENT, index=in_duration_min.index, dtype=object)
+    status[is_half_day] = STATUS_HALF_DAY
+    status[is_present] = STATUS_PRESENT
+    return status
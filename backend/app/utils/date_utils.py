@@ -2,9 +2,10 @@
 Date Utilities
 Helper functions for date/time operations
 """
+import re
 from datetime import date, datetime
 import pandas as pd
-from typing import Optional
+from typing import List, Optional, Tuple
 
 def parse_date(date_val: any) -> Optional[date]:
     """
@@ -12,7 +13,7 @@ def parse_date(date_val: any) -> Optional[date]:
     
     Args:
         date_val: Date value (string, datetime, or date object)
-        
+    
     Returns:
         date object or None if parsing fails
     """
@@ -35,10 +36,66 @@ def format_time(time_val: any) -> Optional[str]:
     
     Args:
         time_val: Time value
-        
+    
     Returns:
         Formatted time string or None
     """
     if not time_val or str(time_val).strip().lower() in ['', 'nan', 'none']:
         return None
     return str(time_val).strip()
+
+# Time and punch log syntax, shared with the report cleaner so a value parses the
+# same way wherever it is read:
+# leading 'H:M' pair of a time or duration; anything after a further ':' (seconds) is ignored
+TIME_PATTERN = r'^\s*([+-]?\d+)\s*:\s*([+-]?\d+)\s*(?::|$)'
+# '(in)'-style tags, removed before a value is parsed
+TAG_PATTERN = r'\(.*?\)'
+# Punch logs are comma-separated; an entry containing ':' is one punch
+PUNCH_SEPARATOR = ','
+DIRECTION_PATTERN = re.compile(r'\((in|out)\)', re.IGNORECASE)
+
+_TIME_RE = re.compile(TIME_PATTERN)
+_TAG_RE = re.compile(TAG_PATTERN)
+
+def to_minutes(value: any) -> Optional[int]:
+    """
+    Convert an 'HH:MM' time or duration string to whole minutes
+    
+    Args:
+        value: Stored time ('09:05', '09:05:30', '09:05(in)') or duration ('08:45')
+    
+    Returns:
+        Minutes since midnight / duration in minutes, or None if there is no time
+        (None, '--:--', 'nan', ...)
+    """
+    if value is None:
+        return None
+    match = _TIME_RE.match(_TAG_RE.sub('', str(value)))
+    if not match:
+        return None
+    return int(match.group(1)) * 60 + int(match.group(2))
+
+def parse_punch_log(log: any) -> List[Tuple[int, Optional[str]]]:
+    """
+    Split a punch log into individual punches
+    
+    Entries are the ones the cleaner counts (comma-separated, containing ':'),
+    parsed with to_minutes; entries without a readable time are dropped.
+    
+    Args:
+        log: Punch records string, e.g. '09:58(in),13:01(out),13:45(in)'
+    
+    Returns:
+        List of (minutes since midnight, 'in' / 'out' / None) in log order;
+        empty for None, 'nan' or a log without times
+    """
+    if log is None:
+        return []
+    punches = []
+    for entry in str(log).split(PUNCH_SEPARATOR):
+        minute = to_minutes(entry)
+        if minute is None:
+            continue
+        direction = DIRECTION_PATTERN.search(entry)
+        punches.append((minute, direction.group(1).lower() if direction else None))
+    return punches
@@ -2,22 +2,9 @@
 File Utilities
 Helper functions for file operations
 """
-import hashlib
 from typing import Tuple
 from fastapi import UploadFile
 
-def calculate_file_hash(content: bytes) -> str:
-    """
-    Calculate SHA-256 hash of file content
-    
-    Args:
-        content: File content as bytes
-        
-    Returns:
-        64-character hexadecimal hash string
-    """
-    return hashlib.sha256(content).hexdigest()
-
 def validate_file_type(file: UploadFile, allowed_extensions: Tuple[str, ...] = ('.xlsx', '.xls', '.csv')) -> bool:
     """
     Validate if file has allowed extension
@@ -0,0 +1,4 @@
+"""
+Workers Package
+Long-running processes that run outside the API server
+"""
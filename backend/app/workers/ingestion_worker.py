@@ -0,0 +1,107 @@
+"""
+Ingestion Worker
+Claims queued ingestion jobs and processes them outside the web workers.
+Status recompute jobs are run by the same worker once the ingestion queue is empty.
+
+Run from the backend directory:
+    python worker.py            # poll forever
+    python worker.py --once     # drain the queue and exit
+"""
+import argparse
+import logging
+import os
+import socket
+import time
+from datetime import timedelta
+
+from app.core.database import SessionLocal, engine
+from app.models import models
+from app.models.models import get_ist_now
+from app.repositories.ingestion_job_repository import IngestionJobRepository
+from app.repositories.status_recompute_job_repository import StatusRecomputeJobRepository
+from app.services.ingestion_service import IngestionService
+from app.services.status_recompute_service import StatusRecomputeService
+from app.services.parse_pool import PARSE_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Config
+POLL_INTERVAL_SECONDS = float(os.getenv("INGESTION_POLL_INTERVAL_SECONDS", "2"))
+STALE_JOB_MINUTES = int(os.getenv("INGESTION_STALE_JOB_MINUTES", "30"))
+MAX_JOB_ATTEMPTS = int(os.getenv("INGESTION_MAX_JOB_ATTEMPTS", "3"))
+
+def run_pending_jobs(worker_id: str) -> int:
+    """
+    Process queued jobs until the queue is empty
+    
+    Args:
+        worker_id: Identifier recorded on claimed jobs
+        
+    Returns:
+        Number of jobs processed
+    """
+    db = SessionLocal()
+    processed = 0
+    try:
+        job_repo = IngestionJobRepository(db)
+        service = IngestionService(db)
+        
+        # Jobs left RUNNING by a crashed worker (no heartbeat for a while) go back on the queue
+        stale_before = get_ist_now() - timedelta(minutes=STALE_JOB_MINUTES)
+        recovered = job_repo.requeue_stale(stale_before, MAX_JOB_ATTEMPTS)
+        if recovered:
+            logger.warning(f"Recovered {recovered} stale ingestion jobs")
+        
+        while True:
+            # Claim up to one job per parse process so a multi-file upload is parsed in parallel
+            jobs = []
+            while len(jobs) < PARSE_WORKERS:
+                job = job_repo.claim_next(worker_id)
+                if not job:
+                    break
+                logger.info(f"[{worker_id}] Claimed ingestion job {job.id} ({job.filename})")
+                jobs.append(job)
+            if not jobs:
+                break
+            service.run_jobs(jobs)
+            processed += len(jobs)
+        
+        # Status recomputes run after ingestion so they see the latest punches
+        status_repo = StatusRecomputeJobRepository(db)
+        status_service = StatusRecomputeService(db)
+        recovered = status_repo.requeue_stale(stale_before)
+        if recovered:
+            logger.warning(f"Recovered {recovered} stale status recompute jobs")
+        while True:
+            job = status_repo.claim_next(worker_id)
+            if not job:
+                break
+            logger.info(f"[{worker_id}] Claimed status recompute job {job.id} ({job.start_date}..{job.end_date})")
+            status_service.run_job(job)
+            processed += 1
+    finally:
+        db.close()
+    return processed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="RBIS HRMS attendance ingestion worker")
+    parser.add_argument("--once", action="store_true", help="Process queued jobs and exit")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+    models.Base.metadata.create_all(bind=engine)
+    
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info(f"Ingestion worker {worker_id} started")
+    
+    while True:
+        try:
+            run_pending_jobs(worker_id)
+        except Exception as e:
+            logger.error(f"Ingestion worker error: {e}", exc_info=True)
+        if args.once:
+            break
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""
+Benchmarks
+Stand-alone timing scripts for the ingestion hot paths. They run against a
+local SQLite file, never the configured database, and can be run from the
+backend directory, e.g.:
+    
+    python -m benchmarks.normalization
+    python -m benchmarks.ingestion --employees 500 --days 31
+"""
+import os
+import tempfile
+
+# Config: SQLite file the benchmarks write to (recreated by every run)
+BENCHMARK_DB_PATH = os.getenv("BENCHMARK_DB_PATH", os.path.join(tempfile.gettempdir(), "hrms_benchmark.db"))
+
+# app.core.database builds its engine at import time from DATABASE_URL
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCHMARK_DB_PATH}"
@@ -0,0 +1,121 @@
+"""
+Benchmark: attendance ingestion throughput
+
+Generates a synthetic In/Out Duration report (or takes an existing file),
+then times each ingestion stage against a fresh SQLite database:
+    clean      parse_report(): sniff, read and clean the file
+    ingest     AttendanceService._process_attendance_records() into empty tables
+    re-ingest  the same records again, all unchanged
+
+Each stage is timed on its own, then run once more under tracemalloc for
+peak memory (tracing slows Python down several times, so the two are never
+mixed). Section worker processes are not traced; use --section-workers 1
+for a complete memory figure of the clean stage.
+    
+    python -m benchmarks.ingestion [--employees 500] [--days 31] [--punches 4]
+                                   [--format xlsx|csv] [--file report.xls]
+                                   [--section-workers N] [--no-memory]
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks import BENCHMARK_DB_PATH
+from benchmarks.report_generator import write_report
+from app.core.database import SessionLocal, engine
+from app.models import models
+from app.services import cleaner
+from app.services.attendance_service import AttendanceService
+from app.services.report_parsers import parse_report
+
+def reset_database() -> None:
+    """Drop and recreate every table of the benchmark database"""
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+
+def run_stage(func: Callable, reset: Optional[Callable] = None, memory: bool = True) -> Tuple[object, float, Optional[float]]:
+    """
+    Time a stage, then measure its peak traced memory in a separate run
+    
+    Args:
+        func: The stage; must do the same work on every call after reset
+        reset: Called before each run to restore the starting state
+        memory: Also measure peak memory
+    
+    Returns:
+        Tuple of (result of the timed run, seconds, peak MB or None)
+    """
+    if reset:
+        reset()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    
+    peak = None
+    if memory:
+        if reset:
+            reset()
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+def print_stage(name: str, rows: int, elapsed: float, peak: Optional[float]) -> None:
+    peak_text = f"{peak:.1f}" if peak is not None else "-"
+    print(f"{name:<10} {rows:>10,} {elapsed:>10.2f} {rows / elapsed:>12,.0f} {peak_text:>10}")
+
+def ingest_records(cleaned_data: List[Dict], filename: str) -> None:
+    """Write cleaned records the way an ingestion job does, in a session of its own"""
+    db = SessionLocal()
+    try:
+        AttendanceService(db)._process_attendance_records(cleaned_data, filename)
+    finally:
+        db.close()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time attendance ingestion against a local SQLite database")
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--punches", type=float, default=4, help="mean punches per employee-day")
+    parser.add_argument("--format", choices=["xlsx", "csv"], default="xlsx")
+    parser.add_argument("--file", help="benchmark this report instead of a generated one")
+    parser.add_argument("--section-workers", type=int, help="override PARSE_SECTION_WORKERS")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced memory runs")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    
+    if args.section_workers:
+        cleaner.SECTION_WORKERS = args.section_workers
+    
+    path = args.file
+    if not path:
+        path = os.path.join(tempfile.gettempdir(), f"hrms_benchmark_report.{args.format}")
+        start = time.perf_counter()
+        write_report(path, args.employees, args.days, args.punches)
+        print(
+            f"Generated {args.employees} employees x {args.days} days, {args.punches:g} punches/day "
+            f"in {time.perf_counter() - start:.1f} s"
+        )
+    print(f"Report: {path} ({os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+    print(f"Database: {BENCHMARK_DB_PATH}, section workers: {cleaner.SECTION_WORKERS}")
+    print()
+    print(f"{'stage':<10} {'rows':>10} {'seconds':>10} {'rows/s':>12} {'peak MB':>10}")
+    
+    memory = not args.no_memory
+    (cleaned_data, detected_type), elapsed, peak = run_stage(lambda: parse_report(path), memory=memory)
+    if cleaned_data is None:
+        raise SystemExit(f"Report could not be parsed: {detected_type}")
+    rows = len(cleaned_data)
+    print_stage("clean", rows, elapsed, peak)
+    
+    ingest = lambda: ingest_records(cleaned_data, os.path.basename(path))
+    print_stage("ingest", rows, *run_stage(ingest, reset=reset_database, memory=memory)[1:])
+    print_stage("re-ingest", rows, *run_stage(ingest, memory=memory)[1:])
+
+if __name__ == "__main__":
+    main()
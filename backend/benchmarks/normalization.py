@@ -0,0 +1,94 @@
+"""
+Benchmark: date / employee ID normalization of cleaned records
+
+Compares normalizing every row (parse_date, normalize_emp_id and format_time
+per record, as ingestion used to) with AttendanceService._collapse_records,
+which normalizes each distinct value once, and checks both give the same rows.
+    
+    python -m benchmarks.normalization [--employees 500] [--days 31] [--repeat 3]
+"""
+import argparse
+import time
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+import benchmarks  # noqa: F401  (database default)
+from app.services.attendance_service import AttendanceService, TIME_FIELDS
+from app.utils.date_utils import format_time, parse_date
+from app.utils.file_utils import normalize_emp_id
+
+def make_records(employees: int, days: int) -> List[Dict]:
+    """Cleaner-shaped records: one per employee per day, dates as the cleaner emits them"""
+    start = date(2026, 1, 1)
+    return [
+        {
+            "Date": (start + timedelta(days=day)).strftime("%Y-%m-%d"),
+            "EmpID": f"RBIS{emp}",
+            "Employee_Name": f"Employee {emp}",
+            "In_Duration": f"0{7 + emp % 3}:{emp % 60:02d}",
+            "Out_Duration": f"00:{(emp + day) % 60:02d}",
+            "Total_Duration": f"0{8 + emp % 2}:{day % 60:02d}",
+            "First_In": f"09:{emp % 60:02d}",
+            "Last_Out": f"18:{day % 60:02d}",
+            "Punch_Records": f"09:{emp % 60:02d}(in),18:{day % 60:02d}(out)",
+            "Attendance": "Absent",
+        }
+        for day in range(days)
+        for emp in range(1, employees + 1)
+    ]
+
+def collapse_per_row(cleaned_data: List[Dict], source_filename: str) -> Tuple[Dict, Counter]:
+    """The previous implementation: every value of every row is normalized"""
+    records = {}
+    occurrences = Counter()
+    for rec in cleaned_data:
+        emp_id = normalize_emp_id(str(rec.get('EmpID', '')).strip())
+        if not emp_id:
+            continue
+        date_obj = parse_date(rec.get('Date'))
+        if not date_obj:
+            continue
+        record_data = {column: format_time(rec.get(field)) for column, field in TIME_FIELDS.items()}
+        record_data.update({
+            "punch_records": rec.get('Punch_Records'),
+            "attendance_status": rec.get('Attendance'),
+            "employee_name": rec.get('Employee_Name'),
+            "source_file": source_filename
+        })
+        key = (emp_id, date_obj)
+        if key in records:
+            records[key].update({k: v for k, v in record_data.items() if v is not None})
+        else:
+            records[key] = record_data
+        occurrences[key] += 1
+    return records, occurrences
+
+def best_of(repeat: int, func, *args) -> float:
+    """Fastest of several runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    records = make_records(args.employees, args.days)
+    assert collapse_per_row(records, "bench.xls") == AttendanceService._collapse_records(records, "bench.xls")
+    
+    per_row = best_of(args.repeat, collapse_per_row, records, "bench.xls")
+    distinct = best_of(args.repeat, AttendanceService._collapse_records, records, "bench.xls")
+    print(f"{len(records)} records ({args.employees} employees x {args.days} days)")
+    print(f"  per row:        {per_row * 1000:8.1f} ms  {len(records) / per_row:12,.0f} rows/s")
+    print(f"  distinct value: {distinct * 1000:8.1f} ms  {len(records) / distinct:12,.0f} rows/s")
+    print(f"  speedup:        {per_row / distinct:8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Synthetic 'In Out Duration Report' generator
+
+Writes workbooks with the layout of files/EmployeeInOutDurationDailyAttendance
+RBIS.xls: title rows, then one 'Attendance Date-' section per day with a
+header row and one row per employee (S.No, Employee Code, Employee Name,
+In Duration, Out Duration, Punch Records). Output is .xlsx (or .csv), which
+the report parsers read the same way as the legacy .xls export.
+    
+    python -m benchmarks.report_generator out.xlsx --employees 500 --days 31 --punches 4
+"""
+import argparse
+import csv
+import random
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+import openpyxl
+
+# Sheet width and column positions of the export (0-based)
+WIDTH = 11
+COL_COMPANY = 2
+COL_TITLE = 4
+COL_RANGE = 6
+COL_GENERATED = 9
+COL_LABEL = 1
+COL_SNO = 1
+COL_EMP_ID = 3
+COL_EMP_NAME = 5
+COL_IN_DURATION = 7
+COL_OUT_DURATION = 8
+COL_PUNCH_RECORDS = 10
+
+DAY_START_MINUTE = 9 * 60
+LAST_MINUTE = 23 * 60 + 59
+
+def _row(cells: Optional[Dict[int, object]] = None) -> List[object]:
+    """One sheet row with the given column positions filled (None = empty cell)"""
+    row = [None] * WIDTH
+    for position, value in (cells or {}).items():
+        row[position] = value
+    return row
+
+def _hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def _punch_day(rng: random.Random, punches: float) -> tuple:
+    """
+    Random punches of one employee-day
+    
+    Returns:
+        Tuple of (in duration, out duration, punch log or None)
+    """
+    count = max(0, round(rng.gauss(punches, 1.5))) if rng.random() > 0.1 else 0
+    if count == 0:
+        return "00:00", "00:00", None
+    
+    minutes = [DAY_START_MINUTE + rng.randint(-60, 90)]
+    for _ in range(count - 1):
+        minutes.append(min(minutes[-1] + rng.randint(5, 240), LAST_MINUTE))
+    # Durations are summed over in -> out pairs and the gaps between them
+    pairs = list(zip(minutes[::2], minutes[1::2]))
+    in_minutes = sum(out - start for start, out in pairs)
+    out_minutes = sum(start - out for (_, out), (start, _) in zip(pairs, pairs[1:]))
+    log = "".join(
+        f"{_hhmm(minute)}({'in' if i % 2 == 0 else 'out'}),"
+        for i, minute in enumerate(minutes)
+    )
+    return _hhmm(in_minutes), _hhmm(out_minutes), log
+
+def report_rows(
+    employees: int,
+    days: int,
+    punches: float = 4,
+    start: date = date(2026, 1, 1),
+    seed: int = 0
+) -> Iterator[List[object]]:
+    """
+    Rows of a synthetic In/Out Duration report
+    
+    Args:
+        employees: Employees per day section
+        days: Day sections, one per consecutive date from start
+        punches: Mean punches per employee-day (about 10% of days are absences)
+        start: First date
+        seed: Random seed; the same arguments always give the same report
+    
+    Yields:
+        Rows of WIDTH cells
+    """
+    rng = random.Random(seed)
+    end = start + timedelta(days=days - 1)
+    yield _row()
+    yield _row({COL_COMPANY: "DefaultCompany"})
+    yield _row()
+    yield _row({COL_TITLE: "In Out Duration Report"})
+    yield _row({COL_RANGE: f"{start:%d-%b-%Y} To {end:%d-%b-%Y}"})
+    yield _row()
+    yield _row({COL_GENERATED: f"Generated On: {datetime.now():%d-%b-%Y %I:%M %p}"})
+    yield _row()
+    yield _row()
+    for day in range(days):
+        yield _row({COL_LABEL: "Attendance Date-", COL_EMP_NAME: f"{start + timedelta(days=day):%d-%b-%Y}"})
+        yield _row({COL_LABEL: "Department-", COL_EMP_NAME: "DefaultDepartment"})
+        yield _row({
+            COL_SNO: "S.No",
+            COL_EMP_ID: "Employee Code",
+            COL_EMP_NAME: "Employee Name",
+            COL_IN_DURATION: "In Duration (In Hrs)",
+            COL_OUT_DURATION: "Out Duration( In Hrs)",
+            COL_PUNCH_RECORDS: "Punch Records ",
+        })
+        for emp in range(1, employees + 1):
+            in_duration, out_duration, log = _punch_day(rng, punches)
+            yield _row({
+                COL_SNO: emp,
+                COL_EMP_ID: f"{emp:04d}",
+                COL_EMP_NAME: f"Employee {emp}",
+                COL_IN_DURATION: in_duration,
+                COL_OUT_DURATION: out_duration,
+                COL_PUNCH_RECORDS: log,
+            })
+        yield _row()
+
+def write_report(path: str, employees: int, days: int, punches: float = 4, seed: int = 0) -> int:
+    """
+    Write a synthetic In/Out Duration report
+    
+    Args:
+        path: Output file; .csv writes a delimited export, anything else .xlsx
+        employees: Employees per day section
+        days: Day sections
+        punches: Mean punches per employee-day
+        seed: Random seed
+    
+    Returns:
+        Number of employee rows written
+    """
+    rows = report_rows(employees, days, punches, seed=seed)
+    if path.lower().endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            csv.writer(f).writerows(rows)
+    else:
+        # write_only streams rows to disk instead of building the sheet in memory
+        book = openpyxl.Workbook(write_only=True)
+        sheet = book.create_sheet()
+        for row in rows:
+            sheet.append(row)
+        book.save(path)
+    return employees * days
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic In/Out Duration report")
+    parser.add_argument("path")
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--punches", type=float, default=4, help="mean punches per employee-day")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rows = write_report(args.path, args.employees, args.days, args.punches, args.seed)
+    print(f"Wrote {rows} employee rows to {args.path}")
+
+if __name__ == "__main__":
+    main()
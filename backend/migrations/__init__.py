@@ -0,0 +1,45 @@
+"""
+Database Migrations
+One-off schema/data upgrades for existing databases
+
+create_all() in app.main only creates missing tables; it never alters an
+existing one. Each module here exposes upgrade(connection) and can be run
+from the backend directory, e.g.:
+    
+    python -m migrations.attendance_unique_emp_date
+"""
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateColumn
+
+from app.core.database import engine
+
+def run(upgrade) -> None:
+    """Run a migration's upgrade() in a single transaction"""
+    with engine.begin() as connection:
+        upgrade(connection)
+
+def add_missing_columns(connection, table) -> list:
+    """
+    Add model columns that the existing table does not have yet.
+    A table that does not exist is left for create_all() to build in full.
+    
+    Args:
+        connection: Open connection
+        table: SQLAlchemy Table as declared by the model
+    
+    Returns:
+        Names of the columns added
+    """
+    inspector = inspect(connection)
+    if not inspector.has_table(table.name):
+        return []
+    existing = {col["name"] for col in inspector.get_columns(table.name)}
+    added = []
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        ddl = CreateColumn(column).compile(dialect=connection.dialect)
+        keyword = "ADD" if connection.dialect.name == "mssql" else "ADD COLUMN"
+        connection.exec_driver_sql(f"ALTER TABLE {table.name} {keyword} {ddl}")
+        added.append(column.name)
+    return added
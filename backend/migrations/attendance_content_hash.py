@@ -0,0 +1,17 @@
+"""
+Migration: content fingerprints for change detection
+
+Adds attendance.content_hash and the unchanged counts on file_uploads and
+ingestion_jobs. Existing rows have no fingerprint, so the next ingest that
+covers them writes them once and records one.
+"""
+from app.models.models import Attendance, FileUploadLog, IngestionJob
+from migrations import add_missing_columns, run
+
+def upgrade(connection) -> None:
+    for model in (Attendance, FileUploadLog, IngestionJob):
+        added = add_missing_columns(connection, model.__table__)
+        print(f"{model.__tablename__}: added {added or 'nothing'}")
+
+if __name__ == "__main__":
+    run(upgrade)
@@ -0,0 +1,44 @@
+"""
+Migration: attendance_daily_summary table
+
+1. Creates attendance_daily_summary
+2. Fills it from the existing attendance rows, one year of dates per
+   GROUP BY
+
+Safe to re-run: every summary of the attendance date span is rebuilt.
+"""
+from datetime import timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.models import Attendance, AttendanceDailySummary
+from app.services.daily_summary_service import DailySummaryService
+from migrations import run
+
+BATCH_DAYS = 366
+
+def upgrade(connection) -> None:
+    AttendanceDailySummary.__table__.create(connection, checkfirst=True)
+    print("Table attendance_daily_summary in place")
+    
+    first, last = connection.execute(select(func.min(Attendance.date), func.max(Attendance.date))).one()
+    if first is None:
+        print("No attendance rows to summarise")
+        return
+    
+    # The service writes through a session joined to this migration's transaction
+    db = Session(bind=connection)
+    service = DailySummaryService(db)
+    summarised = 0
+    start = first
+    while start <= last:
+        end = min(start + timedelta(days=BATCH_DAYS - 1), last)
+        summarised += service.refresh(start, end)
+        start = end + timedelta(days=1)
+    db.flush()
+    db.close()
+    print(f"Summarised {summarised} dates from {first} to {last}")
+
+if __name__ == "__main__":
+    run(upgrade)
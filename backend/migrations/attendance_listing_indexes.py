@@ -0,0 +1,21 @@
+"""
+Migration: indexes for the paginated attendance listing
+
+1. Creates ix_attendance_date_emp (keyset pagination on date, emp_id)
+2. Creates ix_attendance_status_date (listing filtered by status)
+
+Safe to re-run: existing indexes are left alone.
+"""
+from app.models.models import Attendance
+from migrations import run
+
+INDEXES = ("ix_attendance_date_emp", "ix_attendance_status_date")
+
+def upgrade(connection) -> None:
+    for index in Attendance.__table__.indexes:
+        if index.name in INDEXES:
+            index.create(connection, checkfirst=True)
+            print(f"Index {index.name} in place")
+
+if __name__ == "__main__":
+    run(upgrade)
@@ -0,0 +1,56 @@
+"""
+Migration: integer minute columns on attendance
+
+1. Adds first_in_min, last_out_min, in_duration_min, out_duration_min and
+   total_duration_min
+2. Backfills them from the stored time strings, in primary-key batches
+3. Creates the index ix_attendance_date_minutes
+
+Safe to re-run: only rows with a time string but no minutes are revisited.
+"""
+from sqlalchemy import and_, bindparam, or_, select
+
+from app.models.models import Attendance
+from app.repositories.attendance_repository import MINUTE_COLUMNS, derive_minute_columns
+from migrations import add_missing_columns, run
+
+BATCH_SIZE = 5000
+
+def upgrade(connection) -> None:
+    added = add_missing_columns(connection, Attendance.__table__)
+    print(f"attendance: added {added or 'nothing'}")
+    
+    table = Attendance.__table__
+    sources = list(MINUTE_COLUMNS.values())
+    missing = or_(*(
+        and_(table.c[source].isnot(None), table.c[column].is_(None))
+        for column, source in MINUTE_COLUMNS.items()
+    ))
+    update = table.update().where(table.c.id == bindparam("row_id")).values(
+        {column: bindparam(column) for column in MINUTE_COLUMNS}
+    )
+    
+    last_id = 0
+    backfilled = 0
+    while True:
+        rows = connection.execute(
+            select(table.c.id, *(table.c[s] for s in sources))
+            .where(missing, table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        params = [{"row_id": row.id, **derive_minute_columns(row._asdict())} for row in rows]
+        connection.execute(update, params)
+        backfilled += len(rows)
+        last_id = rows[-1].id
+    print(f"Backfilled minute columns on {backfilled} attendance rows")
+    
+    for index in table.indexes:
+        if index.name == "ix_attendance_date_minutes":
+            index.create(connection, checkfirst=True)
+            print("Index ix_attendance_date_minutes in place")
+
+if __name__ == "__main__":
+    run(upgrade)
@@ -0,0 +1,39 @@
+"""
+Migration: attendance_monthly_rollup table
+
+1. Creates attendance_monthly_rollup
+2. Fills it from the existing attendance rows, one calendar year per
+   GROUP BY
+
+Safe to re-run: every rollup of the attendance date span is rebuilt.
+"""
+from datetime import date
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.models import Attendance, AttendanceMonthlyRollup
+from app.services.monthly_rollup_service import MonthlyRollupService
+from migrations import run
+
+def upgrade(connection) -> None:
+    AttendanceMonthlyRollup.__table__.create(connection, checkfirst=True)
+    print("Table attendance_monthly_rollup in place")
+    
+    first, last = connection.execute(select(func.min(Attendance.date), func.max(Attendance.date))).one()
+    if first is None:
+        print("No attendance rows to roll up")
+        return
+    
+    # The service writes through a session joined to this migration's transaction
+    db = Session(bind=connection)
+    service = MonthlyRollupService(db)
+    written = 0
+    for year in range(first.year, last.year + 1):
+        written += service.refresh(max(first, date(year, 1, 1)), min(last, date(year, 12, 31)))
+    db.flush()
+    db.close()
+    print(f"Wrote {written} monthly rollups from {first:%Y-%m} to {last:%Y-%m}")
+
+if __name__ == "__main__":
+    run(upgrade)
@@ -0,0 +1,27 @@
+"""
+Migration: office time columns on attendance
+
+1. Adds office_minutes, break_minutes and unmatched_punches
+2. Computes them from attendance_punches for every row with a punch log
+   (run migrations.attendance_punches first)
+
+Safe to re-run; the same recompute can be limited to a date range through
+OfficeTimeService.recompute().
+"""
+from sqlalchemy.orm import Session
+
+from app.models.models import Attendance
+from app.services.office_time import OfficeTimeService
+from migrations import add_missing_columns, run
+
+def upgrade(connection) -> None:
+    added = add_missing_columns(connection, Attendance.__table__)
+    print(f"attendance: added {added or 'nothing'}")
+    
+    # The session joins the migration's transaction; its batch commits do not end it
+    with Session(bind=connection) as session:
+        updated = OfficeTimeService(session).recompute()
+    print(f"Computed office time for {updated} attendance rows")
+
+if __name__ == "__main__":
+    run(upgrade)
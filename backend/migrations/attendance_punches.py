@@ -0,0 +1,49 @@
+"""
+Migration: attendance_punches table
+
+1. Creates attendance_punches
+2. Fills it from the punch_records log of existing attendance rows that have
+   no punches yet, in primary-key batches
+
+Safe to re-run.
+"""
+from sqlalchemy import exists, select
+
+from app.models.models import Attendance, AttendancePunch
+from app.utils.date_utils import parse_punch_log
+from migrations import run
+
+BATCH_SIZE = 5000
+
+def upgrade(connection) -> None:
+    AttendancePunch.__table__.create(connection, checkfirst=True)
+    print("Table attendance_punches in place")
+    
+    attendance = Attendance.__table__
+    punches = AttendancePunch.__table__
+    has_punches = exists().where(punches.c.attendance_id == attendance.c.id)
+    
+    last_id = 0
+    inserted = 0
+    while True:
+        rows = connection.execute(
+            select(attendance.c.id, attendance.c.punch_records)
+            .where(attendance.c.punch_records.isnot(None), ~has_punches, attendance.c.id > last_id)
+            .order_by(attendance.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        params = [
+            {"attendance_id": row.id, "seq": seq, "minute": minute, "direction": direction}
+            for row in rows
+            for seq, (minute, direction) in enumerate(parse_punch_log(row.punch_records))
+        ]
+        if params:
+            connection.execute(punches.insert(), params)
+        inserted += len(params)
+        last_id = rows[-1].id
+    print(f"Inserted {inserted} punches")
+
+if __name__ == "__main__":
+    run(upgrade)
@@ -0,0 +1,46 @@
+"""
+Migration: unique (emp_id, date) on attendance
+
+1. Removes duplicate attendance rows, keeping a manually corrected row if
+   there is one, otherwise the oldest
+2. Drops the single-column emp_id index (covered by the composite index)
+3. Creates the unique index uq_attendance_emp_date
+"""
+from sqlalchemy import case, func, inspect, select
+
+from app.models.models import Attendance
+from migrations import run
+
+def upgrade(connection) -> None:
+    ranked = select(
+        Attendance.id,
+        func.row_number().over(
+            partition_by=(Attendance.emp_id, Attendance.date),
+            order_by=(
+                case((Attendance.is_manually_corrected == True, 0), else_=1),
+                Attendance.id
+            )
+        ).label("rn")
+    ).subquery()
+    duplicates = select(ranked.c.id).where(ranked.c.rn > 1)
+    
+    result = connection.execute(
+        Attendance.__table__.delete().where(Attendance.id.in_(duplicates))
+    )
+    print(f"Removed {result.rowcount} duplicate attendance rows")
+    
+    existing = {ix["name"] for ix in inspect(connection).get_indexes(Attendance.__tablename__)}
+    if "ix_attendance_emp_id" in existing:
+        connection.exec_driver_sql(
+            "DROP INDEX ix_attendance_emp_id ON attendance"
+            if connection.dialect.name in ("mssql", "mysql")
+            else "DROP INDEX ix_attendance_emp_id"
+        )
+    
+    for index in Attendance.__table__.indexes:
+        if index.name == "uq_attendance_emp_date":
+            index.create(connection, checkfirst=True)
+            print("Unique index uq_attendance_emp_date in place")
+
+if __name__ == "__main__":
+    run(upgrade)
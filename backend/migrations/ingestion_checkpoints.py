@@ -0,0 +1,15 @@
+"""
+Migration: ingestion job checkpoints
+
+Adds ingestion_jobs.checkpoint_date and checkpoint_rows. Jobs that ran before
+have no checkpoint and, if retried, start from the beginning of their file.
+"""
+from app.models.models import IngestionJob
+from migrations import add_missing_columns, run
+
+def upgrade(connection) -> None:
+    added = add_missing_columns(connection, IngestionJob.__table__)
+    print(f"{IngestionJob.__tablename__}: added {added or 'nothing'}")
+
+if __name__ == "__main__":
+    run(upgrade)
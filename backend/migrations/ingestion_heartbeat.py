@@ -0,0 +1,15 @@
+"""
+Migration: ingestion job heartbeat
+
+Adds ingestion_jobs.heartbeat_at. Jobs claimed before it existed have no
+heartbeat; the stale-job sweep judges them by started_at as before.
+"""
+from app.models.models import IngestionJob
+from migrations import add_missing_columns, run
+
+def upgrade(connection) -> None:
+    added = add_missing_columns(connection, IngestionJob.__table__)
+    print(f"{IngestionJob.__tablename__}: added {added or 'nothing'}")
+
+if __name__ == "__main__":
+    run(upgrade)
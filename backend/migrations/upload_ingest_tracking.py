@@ -0,0 +1,17 @@
+"""
+Migration: ingest tracking for duplicate-upload skipping
+
+Adds attendance.updated_at, the last-ingest columns on file_uploads and the
+force/skipped flags on ingestion_jobs. Existing uploads have no recorded
+ingest, so their next re-upload is processed once and recorded.
+"""
+from app.models.models import Attendance, FileUploadLog, IngestionJob
+from migrations import add_missing_columns, run
+
+def upgrade(connection) -> None:
+    for model in (Attendance, FileUploadLog, IngestionJob):
+        added = add_missing_columns(connection, model.__table__)
+        print(f"{model.__tablename__}: added {added or 'nothing'}")
+
+if __name__ == "__main__":
+    run(upgrade)
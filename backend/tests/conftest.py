@@ -0,0 +1,53 @@
+"""
+Test configuration
+The app modules build their database engine and settings at import time, so
+the environment is prepared here before any test imports them. Tests always
+run against a scratch SQLite file, never the configured database. Run from
+the backend directory:
+
+    python -m pytest -q
+"""
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+TEST_DIR = tempfile.mkdtemp(prefix="hrms_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DIR, 'hrms_tests.db')}"
+os.environ["UPLOAD_STORAGE_DIR"] = os.path.join(TEST_DIR, "uploads")
+os.environ["PARSE_CACHE_DIR"] = ""
+os.environ.setdefault("SECRET_KEY", "test-secret-key-not-for-production-use")
+
+@pytest.fixture
+def db():
+    """Session on freshly created tables"""
+    from app.core.database import SessionLocal, engine
+    from app.models import models
+
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+
+@pytest.fixture
+def admin():
+    from app.models.models import UserRole
+    return SimpleNamespace(email="admin@rbis.test", role=UserRole.SUPER_ADMIN, emp_id=None)
+
+@pytest.fixture
+def client(db, admin):
+    """API client signed in as an admin"""
+    from fastapi.testclient import TestClient
+    from app.api.dependencies import get_current_user
+    from app.main import app
+
+    app.dependency_overrides[get_current_user] = lambda: admin
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
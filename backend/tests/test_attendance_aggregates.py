@@ -0,0 +1,131 @@
+"""
+Attendance aggregate consistency tests
+After every kind of attendance write, the daily summaries and monthly
+rollups must equal an aggregate computed directly from the attendance rows.
+"""
+import os
+from collections import defaultdict
+from datetime import date
+
+import pytest
+
+from app.models.models import Attendance, AttendanceDailySummary, AttendanceMonthlyRollup, LeaveRequest, LeaveType
+from app.services import parse_pool, status_rules
+from app.services.leave_service import LeaveService
+from app.services.monthly_rollup_service import LATE_AFTER_MINUTE
+from app.services.status_recompute_service import StatusRecomputeService
+from app.services.status_rules import STATUS_ABSENT, STATUS_HALF_DAY, STATUS_ON_LEAVE, STATUS_PRESENT
+from app.workers import ingestion_worker
+from benchmarks.report_generator import write_report
+
+MONTHLY_SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "files", "Monthly_DetailedReport-December 2025.xls")
+
+def _daily_reference(db) -> dict:
+    summaries = defaultdict(lambda: [0, 0, 0, 0, 0])
+    for row in db.query(Attendance):
+        summary = summaries[row.date]
+        summary[3] += 1
+        if row.attendance_status == STATUS_PRESENT:
+            summary[0] += 1
+            summary[4] += row.total_duration_min or row.in_duration_min or 0
+        summary[1] += row.attendance_status == STATUS_ABSENT
+        summary[2] += row.attendance_status == STATUS_ON_LEAVE
+    return {
+        day: (present, absent, on_leave, total, minutes, round(minutes / present, 6) if present else None)
+        for day, (present, absent, on_leave, total, minutes) in summaries.items()
+    }
+
+def _daily_stored(db) -> dict:
+    return {
+        s.date: (s.present, s.absent, s.on_leave, s.total, s.present_minutes, None if s.avg_minutes is None else round(s.avg_minutes, 6))
+        for s in db.query(AttendanceDailySummary)
+    }
+
+def _monthly_reference(db) -> dict:
+    rollups = defaultdict(lambda: [0, 0, 0, 0, 0, 0])
+    for row in db.query(Attendance):
+        rollup = rollups[(row.emp_id, row.date.replace(day=1))]
+        rollup[0] += row.attendance_status == STATUS_PRESENT
+        rollup[1] += row.attendance_status == STATUS_ABSENT
+        rollup[2] += row.attendance_status == STATUS_ON_LEAVE
+        if row.attendance_status in (STATUS_PRESENT, STATUS_HALF_DAY):
+            rollup[3] += (row.first_in_min or 0) > LATE_AFTER_MINUTE
+            if row.office_minutes is not None:
+                rollup[4] += row.office_minutes
+                rollup[5] += 1
+    return {
+        key: (present, absent, leave, late, round(minutes / days, 6) if days else None)
+        for key, (present, absent, leave, late, minutes, days) in rollups.items()
+    }
+
+def _monthly_stored(db) -> dict:
+    return {
+        (r.emp_id, r.month): (
+            r.present_days, r.absent_days, r.leave_days, r.late_arrivals,
+            None if r.avg_office_minutes is None else round(r.avg_office_minutes, 6)
+        )
+        for r in db.query(AttendanceMonthlyRollup)
+    }
+
+def _assert_consistent(db):
+    db.expire_all()
+    assert _daily_stored(db) == _daily_reference(db)
+    assert _monthly_stored(db) == _monthly_reference(db)
+
+@pytest.fixture
+def ingested(client, db, tmp_path, monkeypatch):
+    """A generated report spanning two months plus the December monthly sample"""
+    monkeypatch.setattr(parse_pool, "PARSE_WORKERS", 1)
+    monkeypatch.setattr(ingestion_worker, "PARSE_WORKERS", 1)
+    report = str(tmp_path / "report.xlsx")
+    write_report(report, employees=12, days=40)
+    for path in (report, MONTHLY_SAMPLE):
+        with open(path, "rb") as f:
+            response = client.post("/api/v1/attendance/upload/files", files=[("files", (os.path.basename(path), f))])
+        assert response.status_code == 200
+    assert ingestion_worker.run_pending_jobs("test-worker") == 2
+    assert db.query(Attendance).count() > 12 * 40
+    return db
+
+def test_ingest(ingested):
+    _assert_consistent(ingested)
+    assert {s.date.month for s in ingested.query(AttendanceDailySummary)} == {12, 1, 2}
+
+def test_update_and_delete(client, ingested):
+    db = ingested
+    absent = db.query(Attendance).filter(Attendance.attendance_status == STATUS_ABSENT).order_by(Attendance.id).first()
+    response = client.put(f"/api/v1/attendance/{absent.id}", json={
+        "attendance_status": STATUS_PRESENT, "first_in": "11:00", "in_duration": "07:30"
+    })
+    assert response.status_code == 200
+    _assert_consistent(db)
+
+    present = db.query(Attendance).filter(Attendance.attendance_status == STATUS_PRESENT).order_by(Attendance.id.desc()).first()
+    assert client.delete(f"/api/v1/attendance/{present.id}").status_code == 200
+    _assert_consistent(db)
+
+def test_leave_approval(ingested, admin):
+    db = ingested
+    emp_id = db.query(Attendance.emp_id).filter(Attendance.date == date(2026, 1, 29)).first()[0]
+    leave_type = LeaveType(name="Casual", annual_quota=12)
+    db.add(leave_type)
+    db.flush()
+    # Crosses a month end and runs past the last ingested day
+    request = LeaveRequest(
+        emp_id=emp_id, leave_type_id=leave_type.id, start_date=date(2026, 1, 29), end_date=date(2026, 2, 13),
+        total_days=12, reason="Travel", status="APPROVED_BY_HR"
+    )
+    db.add(request)
+    db.commit()
+
+    LeaveService(db).approve_by_ceo(request.id, admin, "APPROVE")
+    _assert_consistent(db)
+    assert db.query(Attendance).filter(Attendance.emp_id == emp_id, Attendance.attendance_status == STATUS_ON_LEAVE).count() == 12
+
+def test_status_recompute(ingested, monkeypatch):
+    db = ingested
+    monkeypatch.setattr(status_rules, "PRESENT_MIN_PUNCHES", 6)
+    monkeypatch.setattr(status_rules, "HALF_DAY_MIN_MINUTES", 60)
+    checked, changed = StatusRecomputeService(db).recompute(date(2025, 12, 1), date(2026, 2, 28))
+    assert changed > 0
+    _assert_consistent(db)
@@ -0,0 +1,100 @@
+"""
+Attendance export tests
+CSV and NDJSON exports stream the same rows, oldest first, with the listing
+filters applied; batches smaller than the result exercise the chunking.
+"""
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.models import Attendance, Employee, UserRole
+from app.services import attendance_service
+from app.services.attendance_service import EXPORT_COLUMNS
+
+EMPLOYEES = 9
+DAYS = 6
+START = date(2026, 3, 1)
+FIELDS = EXPORT_COLUMNS + ["employee_name"]
+
+@pytest.fixture
+def records(db, monkeypatch):
+    monkeypatch.setattr(attendance_service, "EXPORT_BATCH_ROWS", 7)
+    # Every third employee has no account; their name comes from the report
+    db.add_all(Employee(emp_id=f"RBIS{e:04d}", full_name=f"{'Asha' if e % 2 else 'Ravi'} {e}") for e in range(EMPLOYEES) if e % 3)
+    db.add_all(
+        Attendance(
+            emp_id=f"RBIS{e:04d}",
+            date=START + timedelta(days=d),
+            attendance_status="Present" if (e + d) % 3 else "Absent",
+            first_in="09:40" if (e + d) % 3 else None,
+            in_duration="08:00" if (e + d) % 3 else "00:00",
+            office_minutes=480 if (e + d) % 3 else None,
+            employee_name=f"Report {e}",
+            source_file="report.xls"
+        )
+        for d in range(DAYS) for e in range(EMPLOYEES)
+    )
+    db.commit()
+    return db.query(Attendance).all()
+
+def _export(client, export_format: str, **filters) -> list:
+    response = client.get("/api/v1/attendance/export", params={"format": export_format, **filters})
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith(attendance_service.EXPORT_MEDIA_TYPES[export_format])
+    assert f'.{export_format}"' in response.headers["content-disposition"]
+    if export_format == "csv":
+        reader = csv.reader(io.StringIO(response.text))
+        assert next(reader) == FIELDS
+        return [dict(zip(FIELDS, row)) for row in reader]
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def _keys(rows: list) -> list:
+    return [(row["date"], row["emp_id"]) for row in rows]
+
+def _expected(records, predicate=lambda r: True) -> list:
+    return sorted((r.date.isoformat(), r.emp_id) for r in records if predicate(r))
+
+@pytest.mark.parametrize("export_format", ["csv", "ndjson"])
+def test_export_every_row_oldest_first(client, records, export_format):
+    rows = _export(client, export_format)
+    assert _keys(rows) == _expected(records)
+
+def test_formats_agree(client, records):
+    csv_rows, ndjson_rows = _export(client, "csv"), _export(client, "ndjson")
+    assert len(csv_rows) == len(ndjson_rows) == EMPLOYEES * DAYS
+
+    first = ndjson_rows[0]
+    assert first == {
+        "date": START.isoformat(), "emp_id": "RBIS0000", "attendance_status": "Absent",
+        "first_in": None, "last_out": None, "in_duration": "00:00", "out_duration": None,
+        "total_duration": None, "office_minutes": None, "break_minutes": None,
+        "is_manually_corrected": False, "employee_name": "Report 0"
+    }
+    # CSV writes NULL as an empty field and everything else as text
+    for csv_row, json_row in zip(csv_rows, ndjson_rows):
+        assert csv_row == {k: "" if v is None else str(v) for k, v in json_row.items()}
+    assert {r["employee_name"] for r in ndjson_rows if r["emp_id"] == "RBIS0001"} == {"Asha 1"}
+
+@pytest.mark.parametrize("export_format", ["csv", "ndjson"])
+@pytest.mark.parametrize("filters,predicate", [
+    ({"start_date": "2026-03-02", "end_date": "2026-03-04"}, lambda r: date(2026, 3, 2) <= r.date <= date(2026, 3, 4)),
+    ({"emp_id": "4"}, lambda r: r.emp_id == "RBIS0004"),
+    ({"status": "Absent"}, lambda r: r.attendance_status == "Absent"),
+    ({"name": "asha", "status": "Present"}, lambda r: r.emp_id in ("RBIS0001", "RBIS0005", "RBIS0007") and r.attendance_status == "Present"),
+])
+def test_export_filters(client, records, export_format, filters, predicate):
+    rows = _export(client, export_format, **filters)
+    assert rows
+    assert _keys(rows) == _expected(records, predicate)
+
+def test_employee_exports_own_rows_only(client, records, admin):
+    admin.role, admin.emp_id = UserRole.EMPLOYEE, "RBIS0002"
+    rows = _export(client, "ndjson", emp_id="RBIS0003")
+    assert _keys(rows) == _expected(records, lambda r: r.emp_id == "RBIS0002")
+
+@pytest.mark.parametrize("params", [{"format": "xlsx"}, {"start_date": "2026-03-05", "end_date": "2026-03-01"}])
+def test_export_rejects_bad_requests(client, records, params):
+    assert client.get("/api/v1/attendance/export", params=params).status_code == 400
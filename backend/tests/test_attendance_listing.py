@@ -0,0 +1,89 @@
+"""
+Attendance listing tests
+Keyset pages over many records sharing each date: walking next_cursor must
+return every matching row exactly once, in (date, emp_id) descending order.
+"""
+import base64
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.models import Attendance, Employee
+from app.repositories.attendance_repository import AttendanceRepository
+from app.services.attendance_service import AttendanceService
+
+EMPLOYEES = 23
+DAYS = 4
+START = date(2026, 1, 1)
+
+@pytest.fixture
+def records(db):
+    db.add_all(Employee(emp_id=f"RBIS{e:04d}", full_name=f"{'Asha' if e % 3 == 0 else 'Ravi'} {e}") for e in range(EMPLOYEES))
+    db.add_all(
+        Attendance(
+            emp_id=f"RBIS{e:04d}",
+            date=START + timedelta(days=d),
+            attendance_status="Present" if (e + d) % 4 else "Absent",
+            source_file="report.xls"
+        )
+        for d in range(DAYS) for e in range(EMPLOYEES)
+    )
+    db.commit()
+    return db.query(Attendance).all()
+
+def _walk(client, limit: int, **filters) -> list:
+    """Keys of every item, following next_cursor until the last page"""
+    keys, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit, **filters, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/attendance/", params=params)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page["items"]) <= limit
+        keys += [(item["date"], item["emp_id"]) for item in page["items"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if not cursor:
+            return keys, pages
+
+def _expected(records, predicate=lambda r: True) -> list:
+    return sorted(((r.date.isoformat(), r.emp_id) for r in records if predicate(r)), reverse=True)
+
+@pytest.mark.parametrize("limit", [1, 7, EMPLOYEES, EMPLOYEES + 1, 1000])
+def test_pages_cover_every_row_once(client, records, limit):
+    keys, pages = _walk(client, limit)
+    assert keys == _expected(records)
+    assert pages == max(1, -(-len(records) // limit))
+
+def test_pages_with_filters(client, records):
+    keys, _ = _walk(client, 5, status="Absent", start_date=str(START + timedelta(days=1)), name="asha")
+    assert keys == _expected(
+        records,
+        lambda r: r.attendance_status == "Absent" and r.date >= START + timedelta(days=1) and int(r.emp_id[4:]) % 3 == 0
+    )
+    assert keys
+
+def test_repository_continues_after_key(db, records):
+    repo = AttendanceRepository(db)
+    after = (START + timedelta(days=2), "RBIS0010")
+    rows = repo.get_page(1000, after=after)
+    assert [(r.date, r.emp_id) for r, _ in rows] == [
+        (d, e) for d, e in sorted(((r.date, r.emp_id) for r in records), reverse=True) if (d, e) < after
+    ]
+    assert all(name for _, name in rows)
+
+def test_cursor_round_trip():
+    key = (date(2026, 2, 28), "RBIS|0042")
+    assert AttendanceService._decode_cursor(AttendanceService._encode_cursor(*key)) == key
+
+@pytest.mark.parametrize("cursor", [
+    "abc",                                                   # Bad padding
+    "!!!!",                                                  # Not base64 at all
+    base64.urlsafe_b64encode(b"\xff\xfe|x").decode(),        # Not UTF-8
+    base64.urlsafe_b64encode(b"2026-01-01").decode(),        # No emp_id
+    base64.urlsafe_b64encode(b"2026-13-40|RBIS0001").decode(),  # No such date
+])
+def test_bad_cursor_is_400(client, records, cursor):
+    response = client.get("/api/v1/attendance/", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,93 @@
+"""
+Attendance upsert tests
+SQL Server is not available here, so the MERGE path is checked on the
+statements it generates: one set-based MERGE per batch, every batch within
+the 2100-parameter limit, and every record bound exactly once.
+"""
+import math
+import re
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import mssql
+
+from app.repositories import attendance_repository
+from app.repositories.attendance_repository import AttendanceRepository
+
+SQL_SERVER_MAX_PARAMS = 2100
+
+class RecordingSession:
+    """Session on a SQL Server bind that records the statements executed"""
+
+    def __init__(self):
+        self.executed = []
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=mssql.dialect())
+
+    def execute(self, statement, params=None):
+        self.executed.append((str(statement), params))
+
+def _records(count: int) -> list:
+    return [
+        {
+            "emp_id": f"RBIS{i % 97:04d}",
+            "date": date(2026, 1, 1) + timedelta(days=i // 97),
+            "first_in": "09:30",
+            "last_out": None if i % 5 == 0 else "18:00",
+            "in_duration": "07:45",
+            "punch_records": None,
+            "attendance_status": "Present",
+            "source_file": "report.xls",
+            "content_hash": f"hash{i}"
+        }
+        for i in range(count)
+    ]
+
+def _upsert(records: list, update_fields=None) -> list:
+    session = RecordingSession()
+    AttendanceRepository(session).upsert(records, update_fields)
+    return session.executed
+
+@pytest.mark.parametrize("count", [1, 95, 96, 1000, 2500])
+def test_merge_batches_stay_under_parameter_limit(count):
+    executed = _upsert(_records(count))
+    columns = sum(1 for name in executed[0][1] if name.endswith("_0"))
+    rows_per_batch = attendance_repository.MERGE_MAX_PARAMS // columns
+
+    assert len(executed) == math.ceil(count / rows_per_batch)
+    for sql, params in executed:
+        assert sql.count("MERGE ") == 1
+        assert len(params) <= SQL_SERVER_MAX_PARAMS
+        assert set(re.findall(r":(\w+)", sql)) == set(params)
+
+def test_merge_binds_every_record_once_in_order():
+    records = _records(700)
+    executed = _upsert(records)
+
+    bound = []
+    for sql, params in executed:
+        rows = re.search(r"FROM \(VALUES (.*)\) AS v \((.*?)\)\) AS source", sql)
+        columns = [c.strip("[]") for c in rows.group(2).split(", ")]
+        for row in re.findall(r"\(([^()]*)\)", rows.group(1)):
+            values = dict(zip(columns, (params[name.lstrip(":")] for name in row.split(", "))))
+            bound.append((values["emp_id"], values["date"], values["last_out"], values["content_hash"]))
+
+    assert bound == [(r["emp_id"], r["date"], r["last_out"], r["content_hash"]) for r in records]
+
+def test_merge_keeps_stored_values_for_nulls():
+    sql, _ = _upsert(_records(3))[0]
+
+    assert "CAST(v.[punch_records] AS VARCHAR" in sql
+    assert "target.[punch_records] = COALESCE(source.[punch_records], target.[punch_records])" in sql
+    assert "target.[last_out_min] = CASE WHEN source.[last_out] IS NULL THEN target.[last_out_min] ELSE source.[last_out_min] END" in sql
+    assert "target.[content_hash] = source.[content_hash]" in sql
+    assert "WHEN NOT MATCHED THEN INSERT" in sql
+
+def test_merge_updates_only_requested_fields():
+    records = [{"emp_id": "RBIS0001", "date": date(2026, 1, 5), "attendance_status": "On Leave", "source_file": "LEAVE_MODULE"}]
+    sql, _ = _upsert(records, update_fields=["attendance_status"])[0]
+
+    assignments = sql.split("UPDATE SET ", 1)[1].split(" WHEN NOT MATCHED", 1)[0]
+    assert re.findall(r"target\.\[(\w+)\] =", assignments) == ["attendance_status", "content_hash", "updated_at"]
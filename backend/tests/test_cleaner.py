@@ -0,0 +1,100 @@
+"""
+Cleaner equivalence tests
+The vectorized, chunked and section-parallel In/Out Duration cleaners must
+produce exactly the records of the legacy row-by-row cleaner.
+"""
+import glob
+import os
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import legacy_cleaner
+from app.services import cleaner, report_parsers
+
+SAMPLE_DIR = os.path.join(os.path.dirname(cleaner.__file__), "..", "..", "..", "files")
+SAMPLE_FILES = sorted(glob.glob(os.path.join(SAMPLE_DIR, "*.xls*")))
+IN_OUT_REPORT = "In/Out Duration Report"
+
+# Cell values that exercise the edge cases of each column
+FUZZ_VALUES = [
+    '', ' ', None, np.nan, 'nan', '00:00', '0:00', '-', 'NIL', '10:00', '10:0x', ':', '(1:2)',
+    '09:58(in),13:01(out)', '09:58(IN), 13:01(Out),,x:y, 12:00', '1.0', 1.0, 2, -1, '0', '1.5',
+    'Attendance Date- 02/03/2026', 'Attendance Date- 5-Feb-2026', 'Attendance Date- junk',
+    'RBIS12', '-5:30', '+3:07', ' 7 : 8 ', '25:61(x)', 'a(b)c:1', pd.Timestamp('2026-01-03')
+]
+
+def _legacy_records(path: str) -> list:
+    with open(path, "rb") as f:
+        return legacy_cleaner.detect_and_clean_memory(f.read())[0]
+
+def _in_out_samples() -> list:
+    return [path for path in SAMPLE_FILES if report_parsers.parse_report(path)[1] == IN_OUT_REPORT]
+
+@pytest.fixture
+def generated_report(tmp_path):
+    """A multi-section In/Out Duration report (40 employees x 12 days)"""
+    from benchmarks.report_generator import write_report
+    path = str(tmp_path / "report.xlsx")
+    write_report(path, employees=40, days=12, seed=7)
+    return path
+
+def test_samples_present():
+    assert _in_out_samples(), f"no In/Out Duration sample under {SAMPLE_DIR}"
+
+@pytest.mark.parametrize("path", SAMPLE_FILES, ids=os.path.basename)
+def test_parse_report_matches_legacy(path):
+    records, detected_type = report_parsers.parse_report(path)
+    if detected_type != IN_OUT_REPORT:
+        pytest.skip(f"{detected_type}: not a format the legacy cleaner parsed")
+    assert records == _legacy_records(path)
+
+@pytest.mark.parametrize("path", SAMPLE_FILES, ids=os.path.basename)
+def test_frame_cleaner_matches_legacy(path):
+    if report_parsers.parse_report(path)[1] != IN_OUT_REPORT:
+        pytest.skip("not an In/Out Duration report")
+    df_raw = pd.read_excel(path, header=None)
+    assert cleaner.clean_in_out_duration_frame(df_raw) == _legacy_records(path)
+
+@pytest.mark.parametrize("seed", range(40))
+def test_perturbed_sheet_matches_legacy(seed, monkeypatch):
+    path = _in_out_samples()[0]
+    df_raw = pd.read_excel(path, header=None).astype(object)
+    rng = random.Random(seed)
+    for _ in range(rng.randint(1, 60)):
+        df_raw.iat[rng.randrange(len(df_raw)), rng.randrange(df_raw.shape[1])] = rng.choice(FUZZ_VALUES)
+    if seed % 10 == 0:
+        df_raw = df_raw.iloc[:, :rng.choice([5, 11])]
+
+    monkeypatch.setattr(legacy_cleaner.pd, "read_excel", lambda *args, **kwargs: df_raw)
+    expected = legacy_cleaner.detect_and_clean_memory(b"")[0]
+    assert cleaner.clean_in_out_duration_frame(df_raw) == expected
+
+@pytest.mark.parametrize("chunk_rows", [15, 37, 100])
+def test_small_chunks_match_single_frame(chunk_rows, generated_report, monkeypatch):
+    expected = cleaner.clean_in_out_duration_frame(pd.read_excel(generated_report, header=None))
+    monkeypatch.setattr(report_parsers, "PARSE_CHUNK_ROWS", chunk_rows)
+    monkeypatch.setattr(cleaner, "SECTION_WORKERS", 1)
+    records, detected_type = report_parsers.parse_report(generated_report)
+    assert detected_type == IN_OUT_REPORT
+    assert len(records) == 40 * 12
+    assert records == expected
+
+@pytest.mark.parametrize("chunk_rows,batch_rows", [(15, 1), (37, 50), (100, 2000)])
+def test_section_workers_match_sequential(chunk_rows, batch_rows, generated_report, monkeypatch):
+    monkeypatch.setattr(report_parsers, "PARSE_CHUNK_ROWS", chunk_rows)
+    monkeypatch.setattr(cleaner, "SECTION_WORKERS", 1)
+    expected = report_parsers.parse_report(generated_report)
+
+    monkeypatch.setattr(cleaner, "SECTION_WORKERS", 2)
+    monkeypatch.setattr(cleaner, "SECTION_BATCH_ROWS", batch_rows)
+    assert report_parsers.parse_report(generated_report) == expected
+
+def test_section_workers_match_legacy_on_samples(monkeypatch):
+    monkeypatch.setattr(report_parsers, "PARSE_CHUNK_ROWS", 20)
+    monkeypatch.setattr(cleaner, "SECTION_WORKERS", 2)
+    monkeypatch.setattr(cleaner, "SECTION_BATCH_ROWS", 30)
+    for path in _in_out_samples():
+        assert report_parsers.parse_report(path)[0] == _legacy_records(path)
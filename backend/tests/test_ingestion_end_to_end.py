@@ -0,0 +1,108 @@
+"""
+End-to-end ingestion tests
+Synthetic reports are uploaded through the API and ingested by the worker on
+SQLite: counts, the per-row fingerprint skip, the whole-file prior-ingest
+skip, force, and re-ingests after the stored rows changed.
+"""
+import pytest
+
+from app.models.models import Attendance, JobStatus
+from app.services import attendance_service, parse_pool
+from app.workers import ingestion_worker
+from benchmarks.report_generator import write_report
+
+EMPLOYEES = 20
+DAYS = 5
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    # Parse in-process and commit in several chunks per file
+    monkeypatch.setattr(parse_pool, "PARSE_WORKERS", 1)
+    monkeypatch.setattr(ingestion_worker, "PARSE_WORKERS", 1)
+    monkeypatch.setattr(attendance_service, "INGEST_COMMIT_ROWS", EMPLOYEES * 2)
+
+@pytest.fixture
+def report(tmp_path):
+    path = str(tmp_path / "report.xlsx")
+    write_report(path, employees=EMPLOYEES, days=DAYS)
+    return path
+
+def _ingest(client, path: str, force: bool = False) -> dict:
+    """Upload one file, run the worker and return the finished job"""
+    with open(path, "rb") as f:
+        response = client.post(
+            "/api/v1/attendance/upload/files",
+            params={"force": force},
+            files=[("files", ("report.xlsx", f, "application/octet-stream"))]
+        )
+    assert response.status_code == 200
+    job_id = response.json()["results"][0]["job_id"]
+    assert ingestion_worker.run_pending_jobs("test-worker") == 1
+    job = client.get(f"/api/v1/attendance/upload/jobs/{job_id}").json()
+    assert job["status"] == JobStatus.SUCCEEDED.value, job["error"]
+    return job
+
+def _counts(job: dict) -> tuple:
+    return job["records"], job["saved"], job["updated"], job["unchanged"], job["skipped"]
+
+def test_first_ingest_saves_every_row(client, db, report):
+    job = _ingest(client, report)
+
+    assert _counts(job) == (EMPLOYEES * DAYS, EMPLOYEES * DAYS, 0, 0, False)
+    assert job["detected_type"] == "In/Out Duration Report"
+    assert job["checkpoint"]["rows"] == EMPLOYEES * DAYS
+    assert db.query(Attendance).count() == EMPLOYEES * DAYS
+
+def test_identical_upload_reuses_prior_ingest(client, report):
+    first = _ingest(client, report)
+    again = _ingest(client, report)
+
+    assert again["skipped"] is True
+    assert _counts(again)[:4] == _counts(first)[:4]
+    assert again["timings"]["parse_ms"] is None  # Neither read nor parsed
+
+def test_force_reprocesses_and_fingerprints_skip_rows(client, db, report):
+    _ingest(client, report)
+    forced = _ingest(client, report, force=True)
+
+    assert _counts(forced) == (EMPLOYEES * DAYS, 0, 0, EMPLOYEES * DAYS, False)
+    assert db.query(Attendance).count() == EMPLOYEES * DAYS
+
+def test_reingest_after_manual_update_rewrites_that_row(client, db, report):
+    _ingest(client, report)
+    record = db.query(Attendance).order_by(Attendance.id).first()
+    original = record.first_in
+    assert client.put(f"/api/v1/attendance/{record.id}", json={"first_in": "11:11"}).status_code == 200
+
+    # The row changed since the ingest, so the file is not skipped; only that row is written
+    job = _ingest(client, report)
+    assert _counts(job) == (EMPLOYEES * DAYS, 0, 1, EMPLOYEES * DAYS - 1, False)
+    db.expire_all()
+    assert db.get(Attendance, record.id).first_in == original
+
+def test_reingest_after_delete_restores_the_row(client, db, report):
+    _ingest(client, report)
+    record = db.query(Attendance).order_by(Attendance.id).first()
+    assert client.delete(f"/api/v1/attendance/{record.id}").status_code == 200
+
+    job = _ingest(client, report)
+    assert _counts(job) == (EMPLOYEES * DAYS, 1, 0, EMPLOYEES * DAYS - 1, False)
+    assert db.query(Attendance).count() == EMPLOYEES * DAYS
+
+def test_overlapping_reports(client, db, report, tmp_path):
+    _ingest(client, report)
+
+    # The same seed repeats the first DAYS sections and adds two more
+    longer = str(tmp_path / "longer.xlsx")
+    write_report(longer, employees=EMPLOYEES, days=DAYS + 2)
+    job = _ingest(client, longer)
+    assert _counts(job) == (EMPLOYEES * (DAYS + 2), EMPLOYEES * 2, 0, EMPLOYEES * DAYS, False)
+
+    # Different punches for the same days update rows in place
+    other = str(tmp_path / "other.xlsx")
+    write_report(other, employees=EMPLOYEES, days=DAYS, seed=1)
+    job = _ingest(client, other)
+    records, saved, updated, unchanged, _ = _counts(job)
+    assert (records, saved) == (EMPLOYEES * DAYS, 0)
+    assert updated > 0 and updated + unchanged == EMPLOYEES * DAYS
+    assert db.query(Attendance).count() == EMPLOYEES * (DAYS + 2)
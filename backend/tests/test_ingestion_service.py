@@ -0,0 +1,102 @@
+"""
+Ingestion job state tests
+A job's final status is only written while the job is still RUNNING, and
+a batch whose parse pool fails is failed rather than left RUNNING, and
+abandoned jobs are found by their heartbeat.
+"""
+from app.models.models import IngestionJob, JobStatus
+from app.repositories.ingestion_job_repository import IngestionJobRepository
+from app.services.ingestion_service import IngestionService
+
+RESULT = {"status": "success", "type": "In/Out Duration Report", "records": 4, "saved": 4, "updated": 0, "unchanged": 0}
+
+def _running_job(db) -> IngestionJob:
+    job = IngestionJobRepository(db).create({
+        "filename": "report.xls",
+        "file_hash": "hash",
+        "storage_path": "/nonexistent/report.xls",
+        "uploaded_by": "admin@rbis.test",
+        "status": JobStatus.RUNNING.value,
+        "force": False,
+        "attempts": 1
+    })
+    db.commit()
+    return job
+
+def test_result_finishes_running_job(db):
+    job = _running_job(db)
+    IngestionService(db)._record_result(job, RESULT, {"parse_ms": 5, "write_ms": 7})
+
+    stored = IngestionJobRepository(db).get_by_id(job.id)
+    assert stored.status == JobStatus.SUCCEEDED.value
+    assert (stored.saved_count, stored.parse_ms, stored.error) == (4, 5, None)
+    assert stored.finished_at is not None
+
+def test_failure_records_error(db):
+    job = _running_job(db)
+    IngestionService(db)._record_result(job, {"status": "error", "reason": "bad sheet"}, {})
+
+    assert job.status == JobStatus.FAILED.value
+    assert job.error == "bad sheet"
+
+def test_late_cancel_is_not_overwritten(db):
+    job = _running_job(db)
+    service = IngestionService(db)
+    # The last chunk passed its checkpoint check, then the job was cancelled
+    service.cancel_job(job.id)
+    service._record_result(job, RESULT, {})
+
+    assert IngestionJobRepository(db).get_status(job.id) == JobStatus.CANCELLED.value
+    assert job.saved_count == 4
+
+def test_parse_pool_failure_fails_batch(db, monkeypatch):
+    from concurrent.futures.process import BrokenProcessPool
+    from app.services import ingestion_service
+
+    def broken_pool(files):
+        raise BrokenProcessPool("A process in the process pool was terminated abruptly")
+
+    monkeypatch.setattr(ingestion_service, "parse_files", broken_pool)
+    jobs = [_running_job(db), _running_job(db)]
+    jobs[1].file_hash = "other"
+    db.commit()
+    IngestionService(db).run_jobs(jobs)
+
+    for job in jobs:
+        assert job.status == JobStatus.FAILED.value
+        assert "terminated abruptly" in job.error
+        assert job.finished_at is not None
+
+def test_stale_sweep_follows_heartbeat(db):
+    from datetime import timedelta
+    from app.models.models import get_ist_now
+
+    now = get_ist_now()
+    long_running, silent, legacy = _running_job(db), _running_job(db), _running_job(db)
+    for job in (long_running, silent, legacy):
+        job.started_at = now - timedelta(hours=2)
+    long_running.heartbeat_at = now - timedelta(minutes=1)
+    silent.heartbeat_at = now - timedelta(hours=1)
+    db.commit()
+
+    repo = IngestionJobRepository(db)
+    assert repo.requeue_stale(now - timedelta(minutes=30), max_attempts=3) == 2
+    assert repo.get_status(long_running.id) == JobStatus.RUNNING.value
+    assert repo.get_status(silent.id) == JobStatus.QUEUED.value
+    assert repo.get_status(legacy.id) == JobStatus.QUEUED.value
+
+def test_checkpoint_beats_whole_batch(db):
+    from datetime import date
+    from app.services.attendance_service import IngestCheckpoint
+
+    writing, waiting, cancelled = _running_job(db), _running_job(db), _running_job(db)
+    service = IngestionService(db)
+    service.cancel_job(cancelled.id)
+    assert service._save_checkpoint(writing, IngestCheckpoint(date(2026, 1, 2), 10, 10, 0, 0), [j.id for j in (writing, waiting, cancelled)])
+    db.commit()
+
+    for job in (writing, waiting, cancelled):
+        db.refresh(job)
+    assert writing.checkpoint_rows == 10
+    assert writing.heartbeat_at is not None and waiting.heartbeat_at is not None
+    assert cancelled.heartbeat_at is None
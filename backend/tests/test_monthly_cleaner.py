@@ -0,0 +1,56 @@
+"""
+Monthly Detailed Report tests
+Status mapping and missing times on the December sample, and that a monthly
+upload never overwrites what a daily report stored with placeholders.
+"""
+import os
+from collections import Counter
+from datetime import date
+
+import pytest
+
+from app.services import report_parsers
+from app.services.status_rules import STATUS_ABSENT, STATUS_PRESENT, STATUS_WEEKLY_OFF
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "files", "Monthly_DetailedReport-December 2025.xls")
+
+@pytest.fixture(scope="module")
+def records():
+    cleaned, detected_type = report_parsers.parse_report(SAMPLE)
+    assert detected_type == "Monthly Detailed Report"
+    return cleaned
+
+def test_weekly_offs_are_not_absent(records):
+    statuses = Counter(r["Attendance"] for r in records)
+    assert statuses == {STATUS_PRESENT: 195, STATUS_ABSENT: 80, STATUS_WEEKLY_OFF: 45}
+
+    weekdays = Counter(date.fromisoformat(r["Date"]).strftime("%a") for r in records if r["Attendance"] == STATUS_WEEKLY_OFF)
+    assert weekdays == {"Sun": 32, "Sat": 13}
+
+def test_missing_times_are_none(records):
+    for record in records:
+        assert record["First_In"] != "--:--" and record["Last_Out"] != "--:--"
+        if record["Attendance"] != STATUS_PRESENT:
+            assert record["First_In"] is None and record["Last_Out"] is None
+    # A present day with a single punch has no out time
+    assert any(r["Attendance"] == STATUS_PRESENT and r["First_In"] and r["Last_Out"] is None for r in records)
+
+def test_monthly_upload_keeps_stored_times(records, db):
+    from app.models.models import Attendance
+    from app.services.attendance_service import AttendanceService
+
+    absent = next(r for r in records if r["Attendance"] == STATUS_ABSENT)
+    daily = {
+        **absent,
+        "In_Duration": "07:50", "Out_Duration": "00:30", "Total_Duration": "08:20",
+        "First_In": "09:45", "Last_Out": "18:05",
+        "Punch_Records": "09:45(in),13:00(out),13:30(in),18:05(out)", "Attendance": STATUS_PRESENT
+    }
+    service = AttendanceService(db)
+    service._process_attendance_records([daily], "daily.xls")
+    service._process_attendance_records(records, "monthly.xls")
+
+    stored = db.query(Attendance).filter(Attendance.date == date.fromisoformat(absent["Date"])).all()
+    row = next(r for r in stored if r.punch_records)
+    assert (row.first_in, row.last_out, row.in_duration) == ("09:45", "18:05", "07:50")
+    assert row.first_in_min == 9 * 60 + 45
@@ -0,0 +1,84 @@
+"""
+Office time tests
+Punch pairing of compute_office_time(): odd punch counts, trailing and double
+ins, outs without an in, logs out of time order, and day boundaries, plus a
+randomized comparison with a straightforward per-day loop.
+"""
+import random
+
+import pandas as pd
+import pytest
+
+from app.services.office_time import compute_office_time, office_time_for_logs
+
+def _day(*punches):
+    """'HH:MM' or 'HH:MM(in)' punches as (minute, direction)"""
+    parsed = []
+    for punch in punches:
+        time, _, tag = punch.partition("(")
+        hours, minutes = time.split(":")
+        parsed.append((int(hours) * 60 + int(minutes), tag.rstrip(")") or None))
+    return parsed
+
+def _office_time(*days) -> list:
+    result = office_time_for_logs(list(days))
+    return [tuple(row) for row in result[["office_minutes", "break_minutes", "unmatched_punches"]].itertuples(index=False)]
+
+@pytest.mark.parametrize("punches,expected", [
+    (("09:00(in)", "13:00(out)", "13:30(in)", "18:00(out)"), (510, 30, 0)),
+    (("09:00", "13:00", "13:30", "18:00"), (510, 30, 0)),
+    # Odd counts: the last untagged punch is an in without an out
+    (("09:00", "13:00", "14:00"), (240, 0, 1)),
+    (("09:00",), (0, 0, 1)),
+    (("09:00(in)", "13:00(out)", "14:00(in)"), (240, 0, 1)),
+    # Double in: only the second one starts the interval
+    (("09:00(in)", "09:05(in)", "13:00(out)"), (235, 0, 1)),
+    # Out without an in
+    (("08:00(out)", "09:00(in)", "13:00(out)"), (240, 0, 1)),
+    (("09:00(in)", "13:00(out)", "13:10(out)", "14:00(in)", "18:00(out)"), (480, 60, 1)),
+    # Logs are paired in log order; an out earlier than its in is not an interval
+    (("13:00(in)", "09:00(out)"), (0, 0, 2)),
+    (("18:00", "09:00", "13:00", "14:00"), (60, 0, 2)),
+    (("09:00(in)", "13:00(out)", "12:00(in)", "18:00(out)"), (600, 0, 0)),
+    ((), (0, 0, 0)),
+])
+def test_pairing(punches, expected):
+    assert _office_time(_day(*punches)) == [expected]
+
+def test_days_never_pair_across_boundaries():
+    days = [_day("09:00(in)"), _day("17:00(out)"), _day("09:00", "12:00"), [], _day("10:00")]
+    assert _office_time(*days) == [(0, 0, 1), (0, 0, 1), (180, 0, 0), (0, 0, 0), (0, 0, 1)]
+
+def test_requested_days_without_punches_get_zeros():
+    frame = pd.DataFrame(
+        [(7, 540, "in"), (7, 600, "out"), (3, 540, None)],
+        columns=["attendance_id", "minute", "direction"]
+    )
+    result = compute_office_time(frame, [3, 5, 7])
+    assert list(result.index) == [3, 5, 7]
+    assert result.loc[5].tolist() == [0, 0, 0]
+    assert result.loc[7].tolist() == [60, 0, 0]
+    assert result.loc[3].tolist() == [0, 0, 1]
+
+def _reference(day: list) -> tuple:
+    """Pair one day's punches with a plain loop"""
+    is_in = [direction == "in" if direction else position % 2 == 0 for position, (_, direction) in enumerate(day)]
+    intervals, matched, i = [], set(), 0
+    while i < len(day) - 1:
+        if is_in[i] and not is_in[i + 1] and day[i + 1][0] >= day[i][0]:
+            intervals.append((day[i][0], day[i + 1][0]))
+            matched |= {i, i + 1}
+            i += 2
+        else:
+            i += 1
+    office = sum(end - start for start, end in intervals)
+    breaks = sum(max(start - end, 0) for (_, end), (start, _) in zip(intervals, intervals[1:]))
+    return office, breaks, len(day) - len(matched)
+
+def test_matches_reference_on_random_logs():
+    rng = random.Random(14)
+    days = [
+        [(rng.randint(0, 1439), rng.choice(["in", "out", None])) for _ in range(rng.randint(0, 9))]
+        for _ in range(500)
+    ]
+    assert _office_time(*days) == [_reference(day) for day in days]
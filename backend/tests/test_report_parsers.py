@@ -0,0 +1,123 @@
+"""
+Report parser tests
+Container sniffing from magic bytes and delimiters (never the file name), and
+how sheets are matched to report layouts by their title.
+"""
+import csv
+import os
+import shutil
+
+import openpyxl
+import pytest
+
+from app.services import report_parsers
+from app.services.report_parsers import FALLBACK_REPORT, OLE2_MAGIC, ZIP_MAGIC, parse_report, sniff_file_format
+from benchmarks.report_generator import report_rows, write_report
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "files")
+IN_OUT_SAMPLE = os.path.join(SAMPLE_DIR, "EmployeeInOutDurationDailyAttendance RBIS.xls")
+MONTHLY_SAMPLE = os.path.join(SAMPLE_DIR, "Monthly_DetailedReport-December 2025.xls")
+IN_OUT_REPORT = "In/Out Duration Report"
+
+def _head(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read(report_parsers.SNIFF_BYTES)
+
+def _first_chunk(path: str):
+    file_format, delimiter = sniff_file_format(_head(path))
+    return next(report_parsers.FILE_READERS[file_format](path, delimiter))
+
+PUNCH_ROW = ["1", "RBIS0001", "Asha", "08:00", "00:30", "09:58(in),13:01(out),13:31(in),18:00(out)"]
+
+@pytest.mark.parametrize("delimiter", [",", ";", "\t", "|"])
+def test_sniffs_delimiter_despite_commas_in_punch_logs(delimiter):
+    lines = [delimiter.join(["S.No", "Code", "Name", "In", "Out", "Punches"])]
+    lines += [delimiter.join(PUNCH_ROW)] * 5
+    if delimiter != ",":
+        # Other delimiters quote nothing; the punch log's commas stay inside a field
+        assert sniff_file_format("\n".join(lines).encode()) == ("delimited", delimiter)
+    else:
+        quoted = [",".join(f'"{cell}"' for cell in PUNCH_ROW)] * 5
+        assert sniff_file_format("\n".join(lines[:1] + quoted).encode()) == ("delimited", ",")
+
+@pytest.mark.parametrize("head,expected", [
+    (OLE2_MAGIC + b"\x00" * 100, ("xls", None)),
+    (ZIP_MAGIC + b"\x14\x00[Content_Types].xml xl/workbook.xml", ("xlsx", None)),
+    (ZIP_MAGIC + b"\x14\x00[Content_Types].xml word/document.xml", None),
+    (ZIP_MAGIC + b"\x14\x00[Content_Types].xml ppt/presentation.xml", None),
+    ("Code;Name\nRBIS0001;Ravi \xe9t\xe9\nRBIS0002;Asha\n".encode("cp1252"), ("delimited", ";")),
+    (b"%PDF-1.7\n\x00\x01binary", None),
+    (b"just one column\nof text\nper line\n", None),
+    (b"", None),
+])
+def test_sniff_file_format(head, expected):
+    assert sniff_file_format(head) == expected
+
+def test_sniffs_samples_by_content():
+    assert sniff_file_format(_head(IN_OUT_SAMPLE)) == ("xls", None)
+    assert sniff_file_format(_head(os.path.join(SAMPLE_DIR, "Employee_Details.xlsx"))) == ("xlsx", None)
+    assert sniff_file_format(_head(os.path.join(SAMPLE_DIR, "Biometric Attendance System.docx"))) is None
+    assert sniff_file_format(_head(os.path.join(SAMPLE_DIR, "RBIS Holiday Calendar 2026 (1).pdf"))) is None
+
+def test_long_head_ignores_cut_off_line():
+    line = b"a;b;c\n"
+    head = line * (report_parsers.SNIFF_BYTES // len(line)) + b"a,b"
+    assert sniff_file_format(head[:report_parsers.SNIFF_BYTES]) == ("delimited", ";")
+
+@pytest.mark.parametrize("source,misnamed", [
+    (IN_OUT_SAMPLE, "report.csv"),
+    (IN_OUT_SAMPLE, "report.xlsx"),
+    (MONTHLY_SAMPLE, "monthly.txt"),
+])
+def test_misnamed_extension(tmp_path, source, misnamed):
+    copy = str(tmp_path / misnamed)
+    shutil.copy(source, copy)
+    assert parse_report(copy) == parse_report(source)
+
+@pytest.mark.parametrize("real,misnamed", [("report.xlsx", "report.xls"), ("report.csv", "report.xlsx")])
+def test_misnamed_generated_reports(tmp_path, real, misnamed):
+    path = str(tmp_path / real)
+    write_report(path, employees=5, days=3)
+    expected = parse_report(path)
+    assert expected[1] == IN_OUT_REPORT and len(expected[0]) == 15
+    os.rename(path, str(tmp_path / misnamed))
+    assert parse_report(str(tmp_path / misnamed)) == expected
+
+def _write_rows(path: str, rows) -> None:
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            csv.writer(f).writerows(rows)
+    else:
+        book = openpyxl.Workbook(write_only=True)
+        sheet = book.create_sheet()
+        for row in rows:
+            sheet.append(row)
+        book.save(path)
+
+@pytest.mark.parametrize("extension", [".xlsx", ".csv"])
+def test_title_below_top_rows_falls_back_to_in_out_layout(tmp_path, extension):
+    expected = str(tmp_path / f"expected{extension}")
+    write_report(expected, employees=4, days=2)
+    pushed_down = str(tmp_path / f"pushed{extension}")
+    filler = [["Exported by", "attendance system"]] * report_parsers.TITLE_ROWS
+    _write_rows(pushed_down, filler + list(report_rows(4, 2)))
+
+    assert report_parsers.match_report_parser(_first_chunk(pushed_down)) is None
+    records, detected_type = parse_report(pushed_down)
+    assert detected_type == FALLBACK_REPORT
+    assert records == parse_report(expected)[0]
+
+def test_unmatched_sheet_without_records_is_unknown(tmp_path):
+    assert parse_report(os.path.join(SAMPLE_DIR, "Employee_Details.xlsx")) == (None, "Unknown Report")
+
+    path = str(tmp_path / "notes.csv")
+    _write_rows(path, [["Name", "Comment"], ["Asha", "On site"], ["Ravi", "Remote"]])
+    assert parse_report(path) == (None, "Unknown Report")
+
+def test_unreadable_files_are_invalid_format(tmp_path):
+    assert parse_report(os.path.join(SAMPLE_DIR, "Biometric Attendance System.docx")) == (None, "Invalid Format")
+
+    path = str(tmp_path / "broken.xls")
+    with open(path, "wb") as f:
+        f.write(OLE2_MAGIC + b"\x00" * 600)
+    assert parse_report(path) == (None, "Invalid Format")
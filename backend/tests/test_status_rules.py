@@ -0,0 +1,128 @@
+"""
+Status rule tests
+Thresholds and half days of evaluate_status(), the time and punch parsing the
+rules share with the cleaner, and the batched status recompute, which must
+leave leave days and manual corrections alone.
+"""
+from datetime import date
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from app.models.models import Attendance
+from app.services import cleaner, status_recompute_service, status_rules
+from app.services.attendance_service import AttendanceService
+from app.services.leave_service import LeaveService
+from app.services.status_recompute_service import StatusRecomputeService
+from app.services.status_rules import STATUS_ABSENT, STATUS_HALF_DAY, STATUS_ON_LEAVE, STATUS_PRESENT, evaluate_status
+from app.utils.date_utils import parse_punch_log, to_minutes
+
+def _evaluate(in_duration, punches, office):
+    return list(evaluate_status(
+        pd.Series(in_duration, dtype="float64"), pd.Series(punches), pd.Series(office, dtype="float64")
+    ))
+
+def test_default_rule():
+    # Absent without an in-duration, present from 4 punches, no half days
+    assert _evaluate([480, 480, 480, 0, None], [4, 3, 9, 4, 4], [400, 400, 400, 400, 400]) == [
+        STATUS_PRESENT, STATUS_ABSENT, STATUS_PRESENT, STATUS_ABSENT, STATUS_ABSENT
+    ]
+
+def test_thresholds(monkeypatch):
+    monkeypatch.setattr(status_rules, "PRESENT_MIN_PUNCHES", 2)
+    monkeypatch.setattr(status_rules, "PRESENT_MIN_MINUTES", 300)
+    assert _evaluate([480, 480, 480, 480], [1, 2, 2, 2], [480, 299, 300, None]) == [
+        STATUS_ABSENT, STATUS_ABSENT, STATUS_PRESENT, STATUS_ABSENT
+    ]
+
+def test_half_day(monkeypatch):
+    monkeypatch.setattr(status_rules, "HALF_DAY_MIN_MINUTES", 120)
+    monkeypatch.setattr(status_rules, "HALF_DAY_MIN_PUNCHES", 2)
+    assert _evaluate([240, 240, 240, 240, 0, 480], [2, 1, 3, 2, 2, 4], [120, 200, 119, 300, 300, 480]) == [
+        STATUS_HALF_DAY, STATUS_ABSENT, STATUS_ABSENT, STATUS_HALF_DAY, STATUS_ABSENT, STATUS_PRESENT
+    ]
+
+@pytest.mark.parametrize("value,minutes", [
+    ("09:05", 545), ("9:5", 545), (" 7 : 8 ", 428), ("09:05:30", 545), ("09:05(in)", 545),
+    ("+3:07", 187), ("-5:30", -270), ("25:61(x)", 1561), ("08:45 hrs", None),
+    ("--:--", None), ("nan", None), ("", None), (":", None), ("10:0x", None), (None, None)
+])
+def test_rules_and_cleaner_read_times_alike(value, minutes):
+    assert to_minutes(value) == minutes
+    if value is not None:
+        assert cleaner._to_minutes(pd.Series([value], dtype=object)).tolist() == [minutes or 0]
+
+@pytest.mark.parametrize("log,punches", [
+    ("09:58(in),13:01(out),13:45(in),18:02(out)", [(598, "in"), (781, "out"), (825, "in"), (1082, "out")]),
+    ("9:5(in),13:01(out)", [(545, "in"), (781, "out")]),
+    ("09:58(IN), 13:01(Out),,12:00", [(598, "in"), (781, "out"), (720, None)]),
+    ("10:00:30(in),18:00:00(out),", [(600, "in"), (1080, "out")]),
+    ("09:58", [(598, None)]),
+    ("nan", []),
+])
+def test_rules_and_cleaner_read_punch_logs_alike(log, punches):
+    assert parse_punch_log(log) == punches
+
+    summary = cleaner._punch_summary(pd.Series([log], dtype=object)).iloc[0]
+    assert summary["count"] == len(punches)
+    if punches:
+        assert (to_minutes(summary["first"]), to_minutes(summary["last"])) == (punches[0][0], punches[-1][0])
+
+# Punch log, in-duration and the expected status before / after the thresholds change
+DAYS = [
+    ("09:00(in),13:00(out),13:30(in),18:00(out)", "08:30", STATUS_PRESENT, STATUS_PRESENT),
+    ("09:00(in),13:00(out)", "04:00", STATUS_ABSENT, STATUS_HALF_DAY),
+    ("09:00(in),09:30(out)", "00:30", STATUS_ABSENT, STATUS_ABSENT),
+    ("09:00(in),13:00(out),13:30(in),18:00(out)", "00:00", STATUS_ABSENT, STATUS_ABSENT),
+    ("9:5(in),13:01(out),13:30(in),18:00(out)", "08:26", STATUS_PRESENT, STATUS_PRESENT),
+    ("09:00(in),10:00(out),10:05(in),11:00(out)", "01:55", STATUS_PRESENT, STATUS_HALF_DAY),
+]
+EMPLOYEES = 3
+
+@pytest.fixture
+def logged_days(db):
+    records = [
+        {
+            "Date": date(2026, 4, day + 1).isoformat(), "EmpID": f"RBIS{emp:04d}", "Employee_Name": f"Employee {emp}",
+            "In_Duration": in_duration, "Out_Duration": "00:30", "Total_Duration": None,
+            "First_In": log.split("(")[0], "Last_Out": None, "Punch_Records": log, "Attendance": STATUS_ABSENT
+        }
+        for emp in range(EMPLOYEES) for day, (log, in_duration, _, _) in enumerate(DAYS)
+    ]
+    AttendanceService(db)._process_attendance_records(records, "report.xls")
+    return db
+
+def _statuses(db) -> dict:
+    db.expire_all()
+    return {(r.emp_id, r.date.day): r.attendance_status for r in db.query(Attendance)}
+
+def test_ingest_applies_rules(logged_days):
+    statuses = _statuses(logged_days)
+    for emp in range(EMPLOYEES):
+        assert [statuses[(f"RBIS{emp:04d}", day)] for day in range(1, len(DAYS) + 1)] == [before for _, _, before, _ in DAYS]
+
+@pytest.mark.parametrize("batch_size", [1, 4, 5000])
+def test_recompute_skips_leave_and_manual_days(logged_days, monkeypatch, admin, batch_size):
+    db = logged_days
+    # Employee 1 is on leave for day 2, and day 6 of employee 2 was corrected by hand
+    LeaveService(db)._sync_attendance_on_approval(SimpleNamespace(emp_id="RBIS0001", start_date=date(2026, 4, 2), end_date=date(2026, 4, 2)))
+    db.commit()
+    corrected = db.query(Attendance).filter(Attendance.emp_id == "RBIS0002", Attendance.date == date(2026, 4, 6)).one()
+    AttendanceService(db).update_attendance_record(corrected.id, {"attendance_status": STATUS_PRESENT}, corrected_by=admin.email)
+
+    monkeypatch.setattr(status_recompute_service, "RECOMPUTE_BATCH_SIZE", batch_size)
+    monkeypatch.setattr(status_rules, "PRESENT_MIN_PUNCHES", 2)
+    monkeypatch.setattr(status_rules, "PRESENT_MIN_MINUTES", 300)
+    monkeypatch.setattr(status_rules, "HALF_DAY_MIN_MINUTES", 60)
+    checked, changed = StatusRecomputeService(db).recompute(date(2026, 4, 1), date(2026, 4, 30))
+
+    expected = {
+        (f"RBIS{emp:04d}", day): after
+        for emp in range(EMPLOYEES) for day, (_, _, _, after) in enumerate(DAYS, start=1)
+    }
+    expected[("RBIS0001", 2)] = STATUS_ON_LEAVE
+    expected[("RBIS0002", 6)] = STATUS_PRESENT
+    assert _statuses(db) == expected
+    assert checked == EMPLOYEES * len(DAYS) - 2
+    assert changed == 4  # Days 2 and 6 of the employees not on leave or corrected
@@ -0,0 +1,51 @@
+"""
+Upload size limit tests
+An upload over the per-file or per-request limit is rejected with 413 and
+leaves nothing behind: no queued job and no stored file.
+"""
+import hashlib
+import os
+
+import pytest
+
+from app.core import upload_storage
+from app.models.models import IngestionJob
+from app.services import ingestion_service
+
+MB = 1024 * 1024
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_storage, "UPLOAD_STORAGE_DIR", str(tmp_path))
+    monkeypatch.setattr(upload_storage, "UPLOAD_CHUNK_BYTES", 64 * 1024)
+    monkeypatch.setattr(ingestion_service, "UPLOAD_MAX_FILE_MB", 1)
+    monkeypatch.setattr(ingestion_service, "UPLOAD_MAX_REQUEST_MB", 2)
+    return tmp_path
+
+def _upload(client, *sizes):
+    files = [("files", (f"report{i}.csv", os.urandom(size))) for i, size in enumerate(sizes)]
+    return client.post("/api/v1/attendance/upload/files", files=files), files
+
+def test_files_within_limits_are_queued(client, db, storage):
+    response, files = _upload(client, MB, MB)
+    assert response.status_code == 200
+    assert [r["filename"] for r in response.json()["results"]] == ["report0.csv", "report1.csv"]
+
+    jobs = db.query(IngestionJob).order_by(IngestionJob.id).all()
+    assert [job.file_hash for job in jobs] == [hashlib.sha256(content).hexdigest() for _, (_, content) in files]
+    assert sorted(os.listdir(storage)) == sorted(os.path.basename(job.storage_path) for job in jobs)
+
+def test_file_over_per_file_limit(client, db, storage):
+    response, _ = _upload(client, 1000, MB + 1)
+    assert response.status_code == 413
+    assert response.json()["detail"] == "report1.csv exceeds the 1 MB per-file limit"
+    assert db.query(IngestionJob).count() == 0
+    assert os.listdir(storage) == []
+
+def test_upload_over_per_request_limit(client, db, storage):
+    # Each file is within its own limit; the third one takes the upload past 2 MB
+    response, _ = _upload(client, 800 * 1024, 800 * 1024, 800 * 1024)
+    assert response.status_code == 413
+    assert response.json()["detail"] == "report2.csv exceeds the 2 MB per-upload limit"
+    assert db.query(IngestionJob).count() == 0
+    assert os.listdir(storage) == []
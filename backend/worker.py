@@ -0,0 +1,5 @@
+from app.workers.ingestion_worker import main
+
+if __name__ == "__main__":
+    # Attendance ingestion worker: run alongside the API (see app/workers/ingestion_worker.py)
+    main()
@@ -1,8 +1,8 @@
 import { Component, OnInit, OnDestroy } from '@angular/core';
 import { CommonModule } from '@angular/common';
-import { AttendanceService } from '../../services/attendance.service';
+import { AttendanceFilters, AttendancePage, AttendanceService } from '../../services/attendance.service';
 import { FormsModule } from '@angular/forms';
-import { Subscription } from 'rxjs';
+import { Subscription, forkJoin } from 'rxjs';
 import { AuthService } from '../../services/auth.service';
 import { NotificationService } from '../../services/notification.service';
 import { LeaveService } from '../../services/leave.service';
@@ -23,8 +23,10 @@ export class AnalyticsComponent implements OnInit, OnDestroy {
   
   employeeStats: any = null;
   attendanceHistory: any[] = [];
+  nextCursor: string | null = null;
+  loadingMore = false;
+  private historyFilters: AttendanceFilters = {};
   
-  private rawData: any[] = [];
   private subs = new Subscription();
 
   holidays: any[] = [];
@@ -42,56 +44,14 @@ export class AnalyticsComponent implements OnInit, OnDestroy {
     const role = this.authService.currentUser?.role;
     this.canViewAll = role === 'SUPER_ADMIN' || role === 'HR' || role === 'CEO';
 
-    // Fetch holidays first or in parallel
-    this.leaveService.getHolidays().subscribe(data => {
-        this.holidays = data;
-        // Trigger sync if data already exists, otherwise wait for subscription
-        if (this.attendanceService.typeAData.length > 0) this.syncData();
-    });
-
-    this.attendanceService.fetchAttendance();
-    this.subs.add(this.attendanceService.typeAData$.subscribe(() => this.syncData()));
-    this.subs.add(this.attendanceService.typeBData$.subscribe(() => this.syncData()));
+    // Holidays hide absences in the history, like the backend counts
+    this.subs.add(this.leaveService.getHolidays().subscribe(data => this.holidays = data));
   }
 
   ngOnDestroy() {
     this.subs.unsubscribe();
   }
 
-  syncData() {
-    const dataA = this.attendanceService.typeAData;
-    const dataB = this.attendanceService.typeBData;
-    const mergeMap = new Map();
-    
-    [...dataA, ...dataB].forEach(rec => {
-      const key = `${rec.EmpID}_${rec.Date}`;
-      if (!mergeMap.has(key)) {
-        mergeMap.set(key, { ...rec });
-      } else {
-        const existing = mergeMap.get(key);
-        existing.In_Duration = existing.In_Duration || rec.In_Duration;
-        existing.Out_Duration = existing.Out_Duration || rec.Out_Duration;
-        existing.Total_Duration = existing.Total_Duration || rec.Total_Duration;
-        if (rec.Attendance === 'Present') existing.Attendance = 'Present';
-      }
-    });
-    this.rawData = Array.from(mergeMap.values()).filter((rec: any) => {
-      const dateStr = String(rec.Date).split('T')[0];
-      const date = new Date(rec.Date);
-      
-      const isSunday = date.getDay() === 0;
-      const isHoliday = this.holidays.some(h => h.date === dateStr);
-
-      if ((isSunday || isHoliday) && rec.Attendance !== 'Present') {
-        return false; // Hide absent on Sunday or Holiday
-      }
-      return true;
-    });
-    if (this.searchPerformed) {
-       this.performSearch(); // Refresh results if data updates
-    }
-  }
-
   performSearch() {
     const hasTerm = this.searchTerm.trim();
     const hasDateRange = this.startDate && this.endDate;
@@ -116,47 +76,81 @@ export class AnalyticsComponent implements OnInit, OnDestroy {
     this.loading = true;
     this.searchPerformed = true;
 
-    const term = this.searchTerm.toLowerCase();
-    let filtered = this.rawData;
-
+    // IDs start with RBIS, anything else is part of a name
+    const filters: AttendanceFilters = {};
     if (hasTerm) {
-        filtered = filtered.filter(r => 
-            (r.EmpID && r.EmpID.toLowerCase() === term) || 
-            (r.Employee_Name && r.Employee_Name.toLowerCase().includes(term))
-        );
+        if (hasTerm.toLowerCase().startsWith('rbis')) {
+            filters.emp_id = hasTerm;
+        } else {
+            filters.name = hasTerm;
+        }
     }
 
     if (this.startDate && this.endDate) {
-      filtered = filtered.filter(r => {
-        const d = String(r.Date).split('T')[0];
-        return d >= this.startDate && d <= this.endDate;
-      });
+      filters.start_date = this.startDate;
+      filters.end_date = this.endDate;
     }
 
-    this.attendanceHistory = filtered.sort((a, b) => b.Date.localeCompare(a.Date));
-    
-    if (filtered.length > 0) {
-      const present = filtered.filter(r => r.Attendance === 'Present').length;
-      const absent = filtered.filter(r => r.Attendance === 'Absent').length;
-      const leave = filtered.filter(r => r.Attendance === 'On Leave').length;
-      
-      const isSingleEmp = this.searchTerm.trim() && filtered.every(r => r.EmpID === filtered[0].EmpID);
-      
-      this.employeeStats = {
-        total: filtered.length,
-        present,
-        absent,
-        leave,
-        name: isSingleEmp 
-          ? (filtered.find(r => r.Employee_Name)?.Employee_Name || filtered[0].EmpID)
-          : 'Organization Summary',
-        id: isSingleEmp ? filtered[0].EmpID : 'Multiple Employees'
-      };
-    } else {
-      this.employeeStats = null;
-    }
+    // Stats cover the whole range; the history is fetched a page at a time
+    this.historyFilters = filters;
+    forkJoin({
+      dashboard: this.attendanceService.getDashboard(filters),
+      page: this.attendanceService.listAttendancePage(filters)
+    }).subscribe({
+      next: ({ dashboard, page }) => {
+        this.attendanceHistory = [];
+        this.appendHistory(page);
+
+        const summary = dashboard.summary;
+        if (summary.days > 0) {
+          const employee = hasTerm ? dashboard.employee : null;
+
+          this.employeeStats = {
+            total: summary.present + summary.absent + summary.on_leave,
+            present: summary.present,
+            absent: summary.absent,
+            leave: summary.on_leave,
+            name: employee ? (employee.name || employee.emp_id) : 'Organization Summary',
+            id: employee ? employee.emp_id : 'Multiple Employees'
+          };
+        } else {
+          this.employeeStats = null;
+        }
+        this.loading = false;
+      },
+      error: (err) => {
+        console.error('Error fetching attendance', err);
+        this.loading = false;
+      }
+    });
+  }
+
+  loadMore() {
+    if (!this.nextCursor || this.loadingMore) return;
+    this.loadingMore = true;
+    this.attendanceService.listAttendancePage(this.historyFilters, this.nextCursor).subscribe({
+      next: (page) => {
+        this.appendHistory(page);
+        this.loadingMore = false;
+      },
+      error: (err) => {
+        console.error('Error fetching attendance', err);
+        this.loadingMore = false;
+      }
+    });
+  }
+
+  // Records arrive newest first
+  private appendHistory(page: AttendancePage) {
+    const records = page.records.filter(r => r.Attendance === 'Present' || !this.isOffDay(String(r.Date).split('T')[0]));
+    this.attendanceHistory = this.attendanceHistory.concat(records);
+    this.nextCursor = page.nextCursor;
+  }
 
-    this.loading = false;
+  private isOffDay(dateStr: string): boolean {
+    const isSunday = new Date(dateStr).getDay() === 0;
+    const isHoliday = this.holidays.some(h => h.date === dateStr);
+    return isSunday || isHoliday;
   }
 
   clearSearch() {
@@ -165,6 +159,7 @@ export class AnalyticsComponent implements OnInit, OnDestroy {
     this.endDate = '';
     this.searchPerformed = false;
     this.attendanceHistory = [];
+    this.nextCursor = null;
     this.employeeStats = null;
   }
 }
@@ -1,6 +1,6 @@
 import { Component, OnInit, OnDestroy } from '@angular/core';
 import { CommonModule } from '@angular/common';
-import { AttendanceService } from '../../services/attendance.service';
+import { AttendanceFilters, AttendanceService } from '../../services/attendance.service';
 import { BaseChartDirective } from 'ng2-charts';
 import { ChartConfiguration, ChartOptions, Chart, registerables } from 'chart.js';
 import { FormsModule } from '@angular/forms';
@@ -30,14 +30,13 @@ export class DashboardComponent implements OnInit, OnDestroy {
     showDrillDown = false;
     drillDownTitle = '';
     drillDownList: any[] = [];
+    drillDownCursor: string | null = null;
+    loadingDrillDown = false;
+    private drillDownFilters: AttendanceFilters & { status?: string } = {};
     hideTimings = false;
 
-    // Raw Data Storage
-    private rawData: any[] = [];
-    private filteredData: any[] = [];
-
-    availableDates: string[] = [];
-    availableEmps: string[] = [];
+    // Last date of the current dashboard response
+    private latestDate: string | null = null;
 
     // Selected Filters
     fromDate: string = '';
@@ -140,17 +139,10 @@ export class DashboardComponent implements OnInit, OnDestroy {
             this.selectedEmp = user.emp_id;
         }
 
-        // Fetch Holidays
-        this.leaveService.getHolidays().subscribe(data => {
-            this.holidays = data;
-             if (this.attendanceService.typeAData.length > 0) this.syncData();
-        });
-
-        this.attendanceService.fetchAttendance();
+        // Fetch Holidays (drill-down lists hide absences on holidays, like the backend counts)
+        this.leaveService.getHolidays().subscribe(data => this.holidays = data);
 
-        this.subs.add(this.attendanceService.typeAData$.subscribe(() => this.syncData()));
-        this.subs.add(this.attendanceService.typeBData$.subscribe(() => this.syncData()));
-        this.subs.add(this.attendanceService.hasData$.subscribe(has => this.hasData = has));
+        this.applyFilters();
 
         this.subs.add(this.authService.currentUser$.subscribe(u => {
             if (u) {
@@ -166,59 +158,10 @@ export class DashboardComponent implements OnInit, OnDestroy {
         }));
     }
 
-    syncData() {
-        const dataA = this.attendanceService.typeAData;
-        const dataB = this.attendanceService.typeBData;
-        
-        const mergeMap = new Map();
-        [...dataA, ...dataB].forEach(rec => {
-            const key = `${rec.EmpID}_${rec.Date}`;
-            if (!mergeMap.has(key)) {
-                mergeMap.set(key, { ...rec });
-            } else {
-                const existing = mergeMap.get(key);
-                existing.In_Duration = existing.In_Duration || rec.In_Duration;
-                existing.Out_Duration = existing.Out_Duration || rec.Out_Duration;
-                if (rec.Attendance === 'Present') existing.Attendance = 'Present';
-            }
-        });
-
-        this.rawData = Array.from(mergeMap.values()).filter((rec: any) => {
-            const dateStr = String(rec.Date).split('T')[0];
-            const date = new Date(rec.Date);
-            
-            const isSunday = date.getDay() === 0;
-            const isHoliday = this.holidays.some(h => h.date === dateStr);
-
-            if ((isSunday || isHoliday) && rec.Attendance !== 'Present') {
-                return false; 
-            }
-            return true;
-        });
-        this.updateFilterOptions();
-        this.applyFilters();
-    }
-
     ngOnDestroy() {
         this.subs.unsubscribe();
     }
 
-    updateFilterOptions() {
-        const now = new Date();
-        const y = now.getFullYear();
-        const m = String(now.getMonth() + 1).padStart(2, '0');
-        const d = String(now.getDate()).padStart(2, '0');
-        const todayStr = `${y}-${m}-${d}`;
-        
-        this.availableDates = [...new Set(this.rawData.map(d => String(d.Date).split('T')[0]))]
-            .filter(d => d && d !== "null" && d <= todayStr)
-            .sort();
-            
-        this.availableEmps = [...new Set(this.rawData.map(d => String(d['EmpID'])))]
-            .filter(id => id && id !== "null" && id !== "undefined")
-            .sort();
-    }
-
     resetFilters() {
         this.fromDate = '';
         this.toDate = '';
@@ -236,131 +179,104 @@ export class DashboardComponent implements OnInit, OnDestroy {
     }
 
     applyFilters() {
-        // Validation: If no filters, show organization-wide for latest date (handled in calculateStats)
-        let filtered = [...this.rawData];
+        const filters = this.currentFilters();
+        // Unfiltered view (an employee's own records) decides whether there is any data
+        const isDefaultView = !this.fromDate && !this.searchTerm.trim() && (!this.canViewAll || !this.selectedEmp);
+
+        this.loading = true;
+        this.attendanceService.getDashboard(filters).subscribe({
+            next: (res) => {
+                this.loading = false;
+                if (isDefaultView) {
+                    this.hasData = res.days.length > 0;
+                }
+                this.latestDate = res.latest ? res.latest.date : null;
+
+                // Visibility and Metadata
+                const isIndividualSearch = !!this.selectedEmp || !!(this.searchTerm.trim() && res.employee);
+                this.showStatsCards = !!(this.fromDate && !this.toDate) || isIndividualSearch;
+
+                if (isIndividualSearch && res.employee) {
+                    this.activeEmployee = {
+                        EmpID: res.employee.emp_id,
+                        Name: res.employee.name || 'Unknown Employee'
+                    };
+                } else {
+                    this.activeEmployee = null;
+                }
 
-        // 1. Date Range Filtering
+                this.calculateStats(res);
+                this.processChartData(res.days);
+            },
+            error: (err) => {
+                this.loading = false;
+                console.error('Error fetching dashboard', err);
+            }
+        });
+    }
+
+    private currentFilters(): AttendanceFilters {
+        const filters: AttendanceFilters = {};
+
+        // 1. Date Range
         if (this.fromDate) {
-            const start = this.fromDate;
-            const end = this.toDate || this.fromDate; // If "To" is blank, use "From" for single day
-            filtered = filtered.filter(d => {
-                const dateStr = String(d.Date).split('T')[0];
-                return dateStr >= start && dateStr <= end;
-            });
+            filters.start_date = this.fromDate;
+            filters.end_date = this.toDate || this.fromDate; // If "To" is blank, use "From" for single day
         } else {
             // Default: Only past/present dates
-            const todayStr = new Date().toISOString().split('T')[0];
-            filtered = filtered.filter(d => String(d.Date).split('T')[0] <= todayStr);
-        }
-        
-        // 2. Employee Filtering
-        if (this.selectedEmp) {
-            filtered = filtered.filter(d => String(d['EmpID']) === this.selectedEmp);
-        } else if (this.searchTerm.trim()) {
-            const term = this.searchTerm.trim().toLowerCase();
-            filtered = filtered.filter(r => {
-                const empIdMatch = (r.EmpID && r.EmpID.toLowerCase() === term);
-                const nameMatch = r.Employee_Name && r.Employee_Name.toLowerCase().includes(term);
-                return empIdMatch || nameMatch;
-            });
+            filters.end_date = new Date().toISOString().split('T')[0];
         }
 
-        this.filteredData = filtered;
-        
-        // 3. Visibility and Metadata
-        const isIndividualSearch = this.selectedEmp || (this.searchTerm.trim() && filtered.length > 0 && this.isExactMatch(filtered));
-        this.showStatsCards = !!(this.fromDate && !this.toDate) || !!isIndividualSearch;
-        
-        if (isIndividualSearch) {
-            const firstWithInfo = filtered.find(r => r.Employee_Name);
-            if (firstWithInfo) {
-                this.activeEmployee = {
-                    EmpID: firstWithInfo.EmpID,
-                    Name: firstWithInfo.Employee_Name
-                };
-            } else if (filtered.length > 0) {
-                this.activeEmployee = { EmpID: filtered[0].EmpID, Name: 'Unknown Employee' };
+        // 2. Employee (IDs start with RBIS, anything else is part of a name)
+        const term = this.searchTerm.trim();
+        if (this.selectedEmp) {
+            filters.emp_id = this.selectedEmp;
+        } else if (term) {
+            if (term.toLowerCase().startsWith('rbis')) {
+                filters.emp_id = term;
+            } else {
+                filters.name = term;
             }
-        } else {
-            this.activeEmployee = null;
         }
-
-        this.calculateStats(filtered);
-        this.processChartData(filtered);
+        return filters;
     }
 
-    private calculateStats(data: any[]) {
-        if (!data || data.length === 0) {
+    private calculateStats(res: any) {
+        if (!res.days.length) {
             this.stats = { present: 0, absent: 0, onLeave: 0, avgHours: 0, label: 'No Data' };
             return;
         }
 
-        const dates = [...new Set(data.map(d => String(d.Date).split('T')[0]))].sort();
-        
-        if (this.fromDate || this.selectedEmp || this.searchTerm) {
-            // Filtered view
-            const present = data.filter(d => d.Attendance === 'Present').length;
-            const absent = data.filter(d => d.Attendance === 'Absent').length;
-            const onLeave = data.filter(d => d.Attendance === 'On Leave').length;
-            
-            const hours = data.filter(d => d.Attendance === 'Present').map(r => this.parseDuration(r.Total_Duration || r.In_Duration));
-            let avgH = hours.length > 0 ? hours.reduce((a, b) => a + b, 0) / hours.length : 0;
-            if (avgH === 0 && present > 0) avgH = 8.0;
-
-            this.stats = {
-                present,
-                absent,
-                onLeave,
-                avgHours: avgH,
-                label: this.fromDate && !this.toDate ? this.fromDate : 'Filtered'
-            };
-        } else {
-            // Default: Show latest date summary
-            const latestDate = dates[dates.length - 1];
-            const latestRecords = data.filter(d => String(d.Date).split('T')[0] === latestDate);
-            
-            const present = latestRecords.filter(d => d.Attendance === 'Present').length;
-            const absent = latestRecords.filter(d => d.Attendance === 'Absent').length;
-            const onLeave = latestRecords.filter(d => d.Attendance === 'On Leave').length;
-            
-            const hours = latestRecords.filter(d => d.Attendance === 'Present').map(r => this.parseDuration(r.Total_Duration || r.In_Duration));
-            let avgH = hours.length > 0 ? hours.reduce((a, b) => a + b, 0) / hours.length : 0;
-            if (avgH === 0 && present > 0) avgH = 8.0;
-
-            this.stats = {
-                present,
-                absent,
-                onLeave,
-                avgHours: avgH,
-                label: 'Latest'
-            };
-        }
+        // Filtered view covers the whole range, default view the latest date
+        const isFiltered = this.fromDate || this.selectedEmp || this.searchTerm;
+        const totals = isFiltered ? res.summary : res.latest;
+        this.stats = {
+            present: totals.present,
+            absent: totals.absent,
+            onLeave: totals.on_leave,
+            avgHours: this.displayHours(totals.avg_hours, totals.present),
+            label: isFiltered ? (this.fromDate && !this.toDate ? this.fromDate : 'Filtered') : 'Latest'
+        };
     }
 
-    private processChartData(data: any[]) {
-        if (!data || data.length === 0) {
+    private processChartData(days: any[]) {
+        if (!days || days.length === 0) {
             this.barData = { labels: [], datasets: [] };
             this.lineData = { labels: [], datasets: [] };
             this.pieData = { labels: [], datasets: [] };
             return;
         }
 
-        const labels = [...new Set(data.map(d => String(d.Date).split('T')[0]))].sort();
+        const labels = days.map(d => d.date);
         this.showTrendChart = labels.length > 1;
 
-        const dailyStats = labels.map(date => {
-            const dayRecords = data.filter(d => String(d.Date).split('T')[0] === date);
-            const present = dayRecords.filter(d => d.Attendance === 'Present').length;
-            const absent = dayRecords.filter(d => d.Attendance === 'Absent').length;
-            const onLeave = dayRecords.filter(d => d.Attendance === 'On Leave').length;
-
-            const presentRecords = dayRecords.filter(d => d.Attendance === 'Present');
-            const hours = presentRecords.map(r => this.parseDuration(r.Total_Duration || r.In_Duration));
-            let avgH = hours.length > 0 ? hours.reduce((a, b) => a + b, 0) / hours.length : 0;
-            if (avgH === 0 && present > 0) avgH = 8.0;
-
-            return { date, present, absent, onLeave, avgH };
-        });
+        const dailyStats = days.map(d => ({
+            date: d.date,
+            present: d.present,
+            absent: d.absent,
+            onLeave: d.on_leave,
+            avgH: this.displayHours(d.avg_hours, d.present)
+        }));
 
         this.dailyChartStats = dailyStats;
 
@@ -413,53 +329,66 @@ export class DashboardComponent implements OnInit, OnDestroy {
         };
     }
 
-    private isExactMatch(data: any[]): boolean {
-        if (data.length === 0) return false;
-        const firstId = data[0].EmpID;
-        return data.every((r: any) => r.EmpID === firstId);
-    }
-
     viewStatusDetails(status: string) {
         // Allowed for everyone (individual or admin)
         
-        let targetData = this.filteredData;
+        const filters = this.currentFilters();
         if (!this.fromDate && !this.activeEmployee && !this.selectedEmp) {
-            const dates = [...new Set(this.filteredData.map(d => String(d.Date).split('T')[0]))].sort();
-            const latestDate = dates[dates.length - 1];
-            targetData = this.filteredData.filter(d => String(d.Date).split('T')[0] === latestDate);
+            if (!this.latestDate) return;
+            filters.start_date = this.latestDate;
+            filters.end_date = this.latestDate;
         }
 
         this.drillDownTitle = `${status} List`;
         this.hideTimings = status === 'Absent' || status === 'On Leave';
-        this.drillDownList = targetData
-            .filter((d: any) => d.Attendance === status)
-            .map((d: any) => ({
-                Date: String(d.Date).split('T')[0],
-                EmpID: d.EmpID,
-                Name: d.Employee_Name || '--',
-                status: d.Attendance,
-                in: d.First_In,
-                out: d.Last_Out,
-                duration: d.Total_Duration
-            }));
-        this.showDrillDown = true;
+        this.drillDownFilters = { ...filters, status };
+        this.drillDownList = [];
+        this.drillDownCursor = null;
+        this.loadDrillDownPage(() => this.showDrillDown = true);
+    }
+
+    // Records arrive a page at a time, newest first
+    loadDrillDownPage(onLoaded?: () => void) {
+        if (this.loadingDrillDown) return;
+        this.loadingDrillDown = true;
+        this.attendanceService.listAttendancePage(this.drillDownFilters, this.drillDownCursor || undefined).subscribe({
+            next: (page) => {
+                this.drillDownList = this.drillDownList.concat(page.records
+                    .filter((d: any) => d.Attendance === 'Present' || !this.isOffDay(String(d.Date).split('T')[0]))
+                    .map((d: any) => ({
+                        Date: String(d.Date).split('T')[0],
+                        EmpID: d.EmpID,
+                        Name: d.Employee_Name || '--',
+                        status: d.Attendance,
+                        in: d.First_In,
+                        out: d.Last_Out,
+                        duration: d.Total_Duration
+                    })));
+                this.drillDownCursor = page.nextCursor;
+                this.loadingDrillDown = false;
+                if (onLoaded) onLoaded();
+            },
+            error: (err) => {
+                console.error('Error fetching attendance', err);
+                this.loadingDrillDown = false;
+            }
+        });
+    }
+
+    private isOffDay(dateStr: string): boolean {
+        const isSunday = new Date(dateStr).getDay() === 0;
+        const isHoliday = this.holidays.some(h => h.date === dateStr);
+        return isSunday || isHoliday;
     }
 
     closeDrillDown() {
         this.showDrillDown = false;
         this.drillDownList = [];
+        this.drillDownCursor = null;
     }
 
-    private parseDuration(d: any): number {
-        if (!d) return 0;
-        const s = String(d).trim();
-        if (s === '' || s === '0' || s.toLowerCase() === 'nan' || s === '00:00') return 0;
-        try {
-            if (s.includes(':')) {
-                const parts = s.split(':').map(Number);
-                if (parts.length >= 2) return parts[0] + (parts[1] / 60);
-            }
-            return isNaN(Number(s)) ? 0 : Number(s);
-        } catch { return 0; }
+    // Present days without any recorded duration count as a full day
+    private displayHours(avgHours: number, present: number): number {
+        return avgHours === 0 && present > 0 ? 8.0 : avgHours;
     }
 }
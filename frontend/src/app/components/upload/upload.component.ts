@@ -1,5 +1,7 @@
-import { Component } from '@angular/core';
+import { Component, OnDestroy } from '@angular/core';
 import { CommonModule } from '@angular/common';
+import { Subscription, timer } from 'rxjs';
+import { switchMap, takeWhile } from 'rxjs/operators';
 import { AttendanceService } from '../../services/attendance.service';
 import { NotificationService } from '../../services/notification.service';
 import { AuthService } from '../../services/auth.service';
@@ -11,10 +13,11 @@ import { AuthService } from '../../services/auth.service';
     templateUrl: './upload.component.html',
     styleUrl: './upload.component.css'
 })
-export class UploadComponent {
+export class UploadComponent implements OnDestroy {
     uploading = false;
     isDragging = false;
     results: any[] = [];
+    private jobPolls: Subscription[] = [];
 
     constructor(
         private attendanceService: AttendanceService,
@@ -59,8 +62,8 @@ export class UploadComponent {
             next: (res) => {
                 this.uploading = false;
                 this.results = res.results;
-                this.attendanceService.fetchAttendance();
-                this.notificationService.showAlert("Files processed successfully", 'success');
+                this.results.forEach(result => this.pollJob(result));
+                this.notificationService.showAlert("Files queued for processing", 'success');
             },
             error: (err) => {
                 this.uploading = false;
@@ -69,4 +72,37 @@ export class UploadComponent {
             }
         });
     }
+
+    private pollJob(result: any) {
+        const poll = timer(0, 2000).pipe(
+            switchMap(() => this.attendanceService.getUploadJob(result.job_id)),
+            takeWhile(job => job.status === 'QUEUED' || job.status === 'RUNNING', true)
+        ).subscribe({
+            next: (job) => {
+                result.type = job.detected_type;
+                if (job.status === 'SUCCEEDED') {
+                    result.status = 'success';
+                    result.message = `Processed ${job.records} records (Saved: ${job.saved}, Updated: ${job.updated}, Unchanged: ${job.unchanged ?? 0})`;
+                    this.attendanceService.fetchAttendance();
+                } else if (job.status === 'FAILED') {
+                    result.status = 'error';
+                    result.message = job.error || 'Processing failed';
+                } else if (job.status === 'CANCELLED') {
+                    result.status = 'error';
+                    result.message = `Cancelled after ${job.checkpoint?.rows ?? 0} of ${job.records ?? '?'} records`;
+                } else {
+                    result.message = job.status === 'RUNNING' ? 'Processing...' : 'Queued for processing';
+                }
+            },
+            error: () => {
+                result.status = 'error';
+                result.message = 'Could not fetch processing status';
+            }
+        });
+        this.jobPolls.push(poll);
+    }
+
+    ngOnDestroy() {
+        this.jobPolls.forEach(poll => poll.unsubscribe());
+    }
 }
@@ -1,6 +1,19 @@
 import { Injectable } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
 import { Observable, Subject, BehaviorSubject } from 'rxjs';
+import { map } from 'rxjs/operators';
+
+export interface AttendanceFilters {
+  start_date?: string;
+  end_date?: string;
+  emp_id?: string;
+  name?: string;
+}
+
+export interface AttendancePage {
+  records: any[];
+  nextCursor: string | null;
+}
 
 @Injectable({
   providedIn: 'root'
@@ -29,10 +42,14 @@ export class AttendanceService {
     return this.http.post(`${this.apiUrl}/upload/${type}`, formData);
   }
 
-  uploadFiles(files: File[]): Observable<any> {
+  uploadFiles(files: File[], force: boolean = false): Observable<any> {
     const formData = new FormData();
     files.forEach(file => formData.append('files', file));
-    return this.http.post(`${this.apiUrl}/attendance/upload/files`, formData);
+    return this.http.post(`${this.apiUrl}/attendance/upload/files`, formData, { params: { force } });
+  }
+
+  getUploadJob(jobId: number): Observable<any> {
+    return this.http.get<any>(`${this.apiUrl}/attendance/upload/jobs/${jobId}`);
   }
 
   getRecords(): Observable<any[]> {
@@ -64,7 +81,7 @@ export class AttendanceService {
   }
 
   fetchAttendance(): void {
-    this.http.get<any[]>(`${this.apiUrl}/attendance/`).subscribe({
+    this.http.get<any[]>(`${this.apiUrl}/attendance/`, { params: { all: true } }).subscribe({
       next: (data) => {
         // Distribute data based on source or type
         // For now, we'll put all into typeA if it has In_Duration, otherwise typeB
@@ -72,33 +89,8 @@ export class AttendanceService {
         const typeB = data.filter(d => !d.in_duration || !d.in_duration.includes(':'));
         
         // Map backend fields to frontend expected fields (Shared for both)
-        const mappedA = typeA.map(d => ({
-          id: d.id,
-          Date: d.date,
-          EmpID: d.emp_id,
-          In_Duration: d.in_duration,
-          Out_Duration: d.out_duration,
-          Total_Duration: d.total_duration,
-          First_In: d.first_in,
-          Last_Out: d.last_out,
-          Punch_Records: d.punch_records,
-          Attendance: d.attendance_status,
-          Employee_Name: d.employee_name
-        }));
-
-        const mappedB = typeB.map(d => ({
-          id: d.id,
-          Date: d.date,
-          EmpID: d.emp_id,
-          In_Duration: d.in_duration,
-          Out_Duration: d.out_duration,
-          Total_Duration: d.total_duration,
-          First_In: d.first_in,
-          Last_Out: d.last_out,
-          Punch_Records: d.punch_records,
-          Attendance: d.attendance_status,
-          Employee_Name: d.employee_name
-        }));
+        const mappedA = typeA.map(d => this.toRecord(d));
+        const mappedB = typeB.map(d => this.toRecord(d));
 
         this.typeADataSubject.next(mappedA);
         this.typeBDataSubject.next(mappedB);
@@ -108,6 +100,45 @@ export class AttendanceService {
     });
   }
 
+  // Daily counts, average hours and headline stats computed by the backend
+  getDashboard(filters: AttendanceFilters): Observable<any> {
+    return this.http.get<any>(`${this.apiUrl}/attendance/dashboard`, { params: this.toParams(filters) });
+  }
+
+  // One page of filtered records, newest first; pass nextCursor back for the following page
+  listAttendancePage(filters: AttendanceFilters & { status?: string }, cursor?: string, limit = 200): Observable<AttendancePage> {
+    return this.http.get<any>(`${this.apiUrl}/attendance/`, {
+      params: this.toParams({ ...filters, cursor, limit })
+    }).pipe(
+      map(res => ({ records: res.items.map((d: any) => this.toRecord(d)), nextCursor: res.next_cursor }))
+    );
+  }
+
+  // Map backend fields to frontend expected fields
+  private toRecord(d: any) {
+    return {
+      id: d.id,
+      Date: d.date,
+      EmpID: d.emp_id,
+      In_Duration: d.in_duration,
+      Out_Duration: d.out_duration,
+      Total_Duration: d.total_duration,
+      First_In: d.first_in,
+      Last_Out: d.last_out,
+      Punch_Records: d.punch_records,
+      Attendance: d.attendance_status,
+      Employee_Name: d.employee_name
+    };
+  }
+
+  private toParams(filters: { [key: string]: any }) {
+    const params: { [key: string]: string | number } = {};
+    Object.keys(filters)
+      .filter(key => filters[key] !== undefined && filters[key] !== null && filters[key] !== '')
+      .forEach(key => params[key] = filters[key]);
+    return params;
+  }
+
   setAttendanceData(type: 'typeA' | 'typeB', data: any[]) {
     if (type === 'typeA') {
       this.typeADataSubject.next(data);